@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from typing import Optional
+
+BOOK_QUERY_PARAMS = ("status", "user_id", "title_prefix", "sort")
+
+BOOLEAN_VALUES = {"true": True, "1": True, "false": False, "0": False}
+
+
+@dataclass(slots=True, kw_only=True)
+class BookQuery:
+    status: Optional[bool] = None
+    user_id: Optional[int] = None
+    title_prefix: Optional[str] = None
+    # sort=id (padrão) ou sort=-id
+    descending: bool = False
+
+
+def parse_book_query(params: dict[str, str]) -> BookQuery:
+    query = BookQuery()
+    if "status" in params:
+        status = BOOLEAN_VALUES.get(params["status"].lower())
+        if status is None:
+            raise ValueError("O parâmetro 'status' deve ser true ou false")
+        query.status = status
+    if "user_id" in params:
+        if not params["user_id"].isdigit() or int(params["user_id"]) <= 0:
+            raise ValueError("O parâmetro 'user_id' deve ser um número inteiro positivo")
+        query.user_id = int(params["user_id"])
+    if "title_prefix" in params:
+        query.title_prefix = params["title_prefix"]
+    if "sort" in params:
+        if params["sort"] not in ("id", "-id"):
+            raise ValueError("O parâmetro 'sort' deve ser id ou -id")
+        query.descending = params["sort"] == "-id"
+    return query
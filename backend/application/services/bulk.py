@@ -0,0 +1,24 @@
+from typing import Any
+
+MAX_BATCH_SIZE = 1000
+
+
+def validate_batch(items: Any) -> list[Any]:
+    if not isinstance(items, list):
+        raise ValueError("O corpo da requisição deve ser uma lista")
+    if not 1 <= len(items) <= MAX_BATCH_SIZE:
+        raise ValueError(f"O lote deve ter entre 1 e {MAX_BATCH_SIZE} itens")
+    return items
+
+
+def is_record_id(value: Any) -> bool:
+    # bool é subclasse de int: true/false no JSON não podem virar os ids 1 e 0
+    return type(value) is int  # pylint: disable = C0123
+
+
+def bulk_errors(
+    errors: list[dict[str, Any]], failed: list[tuple[int, str]], positions: list[int]
+) -> list[dict[str, Any]]:
+    # failed usa posições da lista enviada ao repositório; positions as traduz para índices da requisição
+    errors = errors + [{"index": positions[position], "error": message} for position, message in failed]
+    return sorted(errors, key=lambda error: error["index"])
@@ -0,0 +1,98 @@
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Iterable, List, Optional
+
+from pydantic import BaseModel, TypeAdapter, ValidationError  # pylint: disable = E0401  # type: ignore
+
+from backend.domain.entities.book import Book, BookModel
+from backend.domain.entities.user import User, UserModel
+
+# Os validadores dos modelos (mode="before") comparam o valor bruto: um tipo errado ("x" <= 0,
+# len(5)) escapa como TypeError em vez de ValidationError
+INVALID_DATA_ERRORS = (ValidationError, TypeError, ValueError)
+
+# Registros brutos validados por chamada em validate_many: o carregamento incremental segura um
+# bloco de dicionários por vez, não a coleção inteira ao lado dos modelos
+VALIDATE_CHUNK = 1024
+
+
+# Ponto único de conversão de um registro: dados brutos (JSON ou requisição) ou entidade
+# -> modelo validado -> dicionário de resposta. Lotes são validados em uma única chamada ao
+# núcleo do pydantic por bloco, e modelos já validados viram dicionários direto pelos campos, sem
+# passar de volta pela entidade e por asdict.
+@dataclass(slots=True, kw_only=True)
+class ModelCodec:
+    model: type[BaseModel]
+    # Sem entidade, só os caminhos entre dados brutos e modelos são usados
+    entity: Optional[type] = None
+    _fields: tuple[str, ...] = field(init=False)
+    _batch: TypeAdapter = field(init=False)
+
+    def __post_init__(self):
+        self._fields = tuple(self.model.model_fields if self.entity is None else (f.name for f in fields(self.entity)))
+        self._batch = TypeAdapter(List[self.model])  # type: ignore
+
+    def validate(self, data: dict[str, Any]) -> Any:
+        return self.model.model_validate(data)
+
+    def validate_many(self, rows: Iterable[dict[str, Any]]) -> List[Any]:
+        models: List[Any] = []
+        rows = iter(rows)
+        while chunk := list(islice(rows, VALIDATE_CHUNK)):
+            models.extend(self._batch.validate_python(chunk))
+        return models
+
+    def from_entity(self, entity: Any) -> Any:
+        # Entidades usam slots: getattr campo a campo é mais barato que asdict
+        return self.model(**{name: getattr(entity, name) for name in self._fields})
+
+    def from_entities(self, entities: List[Any]) -> tuple[dict[int, Any], List[tuple[int, Exception]]]:
+        # Caminho rápido: o lote inteiro de uma vez. Se algo falhar, valida um a um para saber
+        # quais posições são inválidas, cada uma com o erro do seu próprio registro.
+        try:
+            return dict(enumerate(self._batch.validate_python(entities, from_attributes=True))), []
+        except INVALID_DATA_ERRORS:
+            pass
+        models: dict[int, Any] = {}
+        errors: List[tuple[int, Exception]] = []
+        for position, entity in enumerate(entities):
+            try:
+                models[position] = self.from_entity(entity)
+            except INVALID_DATA_ERRORS as error:
+                errors.append((position, error))
+        return models, errors
+
+    def merge(self, item: Any, changes: dict[str, Any]) -> Any:
+        # PATCH: os campos recebidos sobre uma cópia, e o registro inteiro é revalidado. O id nunca
+        # muda: é por ele que o registro está nos índices e na ordem dos ids
+        unknown = [key for key in changes if key not in self.model.model_fields]
+        if unknown:
+            raise ValueError(f'"{self.model.__name__}" object has no field "{unknown[0]}"')
+        try:
+            return self.model.model_validate({**item.__dict__, **changes, "id": item.id})
+        except TypeError as error:
+            raise ValueError(str(error)) from error
+
+    def check(self, entity: Any) -> Any:
+        # Valida a entidade e devolve uma nova com os valores normalizados pelo modelo
+        return self.entity(**self.from_entity(entity).__dict__)  # type: ignore
+
+    def to_dict(self, item: Any) -> dict[str, Any]:
+        # Os campos de um modelo validado já são tipos simples: uma cópia rasa basta
+        return dict(item.__dict__)
+
+    def to_dicts(self, items: Iterable[Any]) -> List[dict[str, Any]]:
+        return [dict(item.__dict__) for item in items]
+
+
+BOOK_CODEC = ModelCodec(model=BookModel, entity=Book)
+USER_CODEC = ModelCodec(model=UserModel, entity=User)
+
+
+@lru_cache(maxsize=None)
+def codec_for(model: type[BaseModel]) -> ModelCodec:
+    for codec in (BOOK_CODEC, USER_CODEC):
+        if codec.model is model:
+            return codec
+    return ModelCodec(model=model)
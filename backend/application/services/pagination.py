@@ -0,0 +1,15 @@
+from typing import Any, Optional
+
+MAX_PAGE_SIZE = 1000
+
+
+def validate_page(limit: int, after: int) -> None:
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"O parâmetro 'limit' deve estar entre 1 e {MAX_PAGE_SIZE}")
+    if after < 0:
+        raise ValueError("O parâmetro 'after' não pode ser negativo")
+
+
+def page(items: list[dict[str, Any]], next_after: Optional[int]) -> dict[str, Any]:
+    # next_after é o cursor da próxima página (o id do último item) ou None na última
+    return {"items": items, "next_after": next_after}
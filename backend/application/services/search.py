@@ -0,0 +1,27 @@
+import re
+import unicodedata
+from typing import Optional
+
+DEFAULT_SEARCH_RESULTS = 20
+MAX_SEARCH_RESULTS = 100
+
+TOKEN = re.compile(r"\w+")
+
+
+def fold_text(text: str) -> str:
+    # "Admirável" -> "admiravel": sem acentos e sem diferença entre maiúsculas e minúsculas
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN.findall(fold_text(text))
+
+
+def validate_search(text: Optional[str], limit: int) -> None:
+    if not text or not tokenize(text):
+        raise ValueError("O parâmetro 'q' é obrigatório")
+    if not 1 <= limit <= MAX_SEARCH_RESULTS:
+        raise ValueError(f"O parâmetro 'limit' deve estar entre 1 e {MAX_SEARCH_RESULTS}")
@@ -0,0 +1,32 @@
+from typing import Any, Iterable
+
+# Faixas do histograma de idades: 0-9, 10-19, ...
+AGE_BUCKET_SIZE = 10
+
+
+def age_bucket(age: int) -> int:
+    return max(age, 0) // AGE_BUCKET_SIZE * AGE_BUCKET_SIZE
+
+
+def book_stats(total: int, read: int, per_user: Iterable[tuple[int, int, int]]) -> dict[str, Any]:
+    # per_user: (user_id, total, lidos), em ordem de user_id
+    return {
+        "total": total,
+        "read": read,
+        "unread": total - read,
+        "read_ratio": read / total if total else 0.0,
+        "per_user": [
+            {"user_id": user_id, "total": books, "read": books_read, "unread": books - books_read}
+            for user_id, books, books_read in per_user
+        ],
+    }
+
+
+def user_stats(total: int, ages: Iterable[tuple[int, int]]) -> dict[str, Any]:
+    # ages: (início da faixa, usuários), em ordem crescente
+    return {
+        "total": total,
+        "age_histogram": [
+            {"from": bucket, "to": bucket + AGE_BUCKET_SIZE - 1, "total": users} for bucket, users in ages
+        ],
+    }
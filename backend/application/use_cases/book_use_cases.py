@@ -1,20 +1,83 @@
-from dataclasses import asdict, dataclass
-from typing import Any, List
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Union
 
+from backend.application.services.book_query import parse_book_query
+from backend.application.services.bulk import bulk_errors, is_record_id, validate_batch
+from backend.application.services.pagination import validate_page
+from backend.application.services.search import validate_search
 from backend.domain.entities.book import Book
 from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
 
 
 @dataclass(slots=True, kw_only=True)
 class BookUseCases:
-    repository: BookRepository
+    repository: Union[BookRepository, SQLiteBookRepository]
 
     def create_book(self, book: Book) -> dict[str, Any]:
         return self.repository.add(book)
 
+    def create_books(self, books_data: List[dict[str, Any]]) -> dict[str, Any]:
+        books: List[Book] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, book_data in enumerate(validate_batch(books_data)):
+            try:
+                books.append(Book(id=0, **book_data))
+            except TypeError as error:
+                errors.append({"index": index, "error": str(error)})
+                continue
+            positions.append(index)
+        created, failed = self.repository.add_many(books)
+        return {"created": created, "errors": bulk_errors(errors, failed, positions)}
+
+    def update_books(self, updates: List[dict[str, Any]]) -> dict[str, Any]:
+        valid_updates: List[dict[str, Any]] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, book_data in enumerate(validate_batch(updates)):
+            if not isinstance(book_data, dict) or not is_record_id(book_data.get("id")):
+                errors.append({"index": index, "error": "O campo 'id' é obrigatório"})
+                continue
+            valid_updates.append(book_data)
+            positions.append(index)
+        updated, failed = self.repository.update_many(valid_updates)
+        return {"updated": updated, "errors": bulk_errors(errors, failed, positions)}
+
+    def delete_books(self, book_ids: List[int]) -> dict[str, Any]:
+        valid_ids: List[int] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, book_id in enumerate(validate_batch(book_ids)):
+            if not is_record_id(book_id):
+                errors.append({"index": index, "error": "O id deve ser um número inteiro"})
+                continue
+            valid_ids.append(book_id)
+            positions.append(index)
+        deleted, failed = self.repository.delete_many(valid_ids)
+        return {"deleted": deleted, "errors": bulk_errors(errors, failed, positions)}
+
     def list_books(self) -> List[dict[str, Any]]:
         return self.repository.get_all()
 
+    def iter_books(self) -> Iterator[dict[str, Any]]:
+        return self.repository.iter_all()
+
+    def list_books_page(self, limit: int, after: int) -> dict[str, Any]:
+        validate_page(limit, after)
+        return self.repository.get_page(limit, after)
+
+    def query_books(self, params: dict[str, str]) -> Iterator[dict[str, Any]]:
+        return self.repository.query(parse_book_query(params))
+
+    def query_books_page(self, params: dict[str, str], limit: int, after: int) -> dict[str, Any]:
+        validate_page(limit, after)
+        return self.repository.query_page(parse_book_query(params), limit, after)
+
+    def search_books(self, text: Optional[str], limit: int) -> List[dict[str, Any]]:
+        validate_search(text, limit)
+        return self.repository.search(text, limit)  # type: ignore
+
     def get_by_id(self, book_id: int) -> dict[str, Any]:
         return self.repository.get_by_id(book_id)
 
@@ -25,11 +88,8 @@ class BookUseCases:
         return self.repository.update(book_id, book_data)
 
     def toggle_book_status(self, book_id: int) -> dict[str, Any]:
-        book_dict = self.get_by_id(book_id)
-        book = Book(**book_dict)
-        book.status = not book.status
-        updated_book = self.update_book(book_id, asdict(book))
-        return updated_book
+        # Atômico no repositório: ler o livro aqui e gravá-lo inteiro perderia um PATCH concorrente
+        return self.repository.toggle_status(book_id)
 
     def delete_book(self, book_id: int) -> List[dict[str, Any]]:
         return self.repository.delete(book_id)
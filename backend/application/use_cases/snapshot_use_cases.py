@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from backend.infrastructure.repositories.snapshots import SnapshotStore
+
+
+@dataclass(slots=True, kw_only=True)
+class SnapshotUseCases:
+    store: SnapshotStore
+
+    def create_snapshot(self, name: Optional[str] = None) -> dict[str, Any]:
+        if name is not None and not isinstance(name, str):
+            raise ValueError("O campo 'name' deve ser um texto")
+        return self.store.create(name)
+
+    def list_snapshots(self) -> List[dict[str, Any]]:
+        return self.store.manifests()
+
+    def restore_snapshot(self, name: Any) -> dict[str, Any]:
+        if not name or not isinstance(name, str):
+            raise ValueError("O campo 'name' é obrigatório")
+        return self.store.restore(name)
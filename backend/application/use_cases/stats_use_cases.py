@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True, kw_only=True)
+class StatsUseCases:
+    user_repository: Any
+    book_repository: Any
+
+    def get_stats(self) -> dict[str, Any]:
+        # Os repositórios respondem com contadores mantidos a cada escrita: nada é percorrido aqui
+        return {"users": self.user_repository.stats(), "books": self.book_repository.stats()}
@@ -1,17 +1,19 @@
 from dataclasses import dataclass
-from typing import Any, List
+from typing import Any, Iterator, List, Union
 
+from backend.application.services.bulk import bulk_errors, is_record_id, validate_batch
+from backend.application.services.pagination import validate_page
 from backend.domain.entities.user import User
+from backend.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
 from backend.infrastructure.repositories.user_repository import UserRepository
 
 
 @dataclass(slots=True, kw_only=True)
 class UserUseCases:
-    repository: UserRepository
+    repository: Union[UserRepository, SQLiteUserRepository]
 
     def create_user(self, user: User) -> dict[str, Any]:
-        if self.repository.get_by_email(user.email):
-            raise ValueError("Email already registered")
+        # A unicidade do email é garantida pelo índice do repositório
         return self.repository.add(user)
 
     def login_user(self, email: str, password: str) -> dict[str, Any]:
@@ -20,9 +22,56 @@ class UserUseCases:
             raise ValueError("Invalid email or password")
         return user
 
+    def create_users(self, users_data: List[dict[str, Any]]) -> dict[str, Any]:
+        users: List[User] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, user_data in enumerate(validate_batch(users_data)):
+            try:
+                users.append(User(id=0, **user_data))
+            except TypeError as error:
+                errors.append({"index": index, "error": str(error)})
+                continue
+            positions.append(index)
+        created, failed = self.repository.add_many(users)
+        return {"created": created, "errors": bulk_errors(errors, failed, positions)}
+
+    def update_users(self, updates: List[dict[str, Any]]) -> dict[str, Any]:
+        valid_updates: List[dict[str, Any]] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, user_data in enumerate(validate_batch(updates)):
+            if not isinstance(user_data, dict) or not is_record_id(user_data.get("id")):
+                errors.append({"index": index, "error": "O campo 'id' é obrigatório"})
+                continue
+            valid_updates.append(user_data)
+            positions.append(index)
+        updated, failed = self.repository.update_many(valid_updates)
+        return {"updated": updated, "errors": bulk_errors(errors, failed, positions)}
+
+    def delete_users(self, user_ids: List[int]) -> dict[str, Any]:
+        valid_ids: List[int] = []
+        positions: List[int] = []
+        errors: List[dict[str, Any]] = []
+        for index, user_id in enumerate(validate_batch(user_ids)):
+            if not is_record_id(user_id):
+                errors.append({"index": index, "error": "O id deve ser um número inteiro"})
+                continue
+            valid_ids.append(user_id)
+            positions.append(index)
+        deleted, failed = self.repository.delete_many(valid_ids)
+        return {"deleted": deleted, "errors": bulk_errors(errors, failed, positions)}
+
     def list_users(self) -> List[dict[str, Any]]:
         return self.repository.get_all()
 
+    def iter_users(self) -> Iterator[dict[str, Any]]:
+        return self.repository.iter_all()
+
+    def list_users_page(self, limit: int, after: int) -> dict[str, Any]:
+        validate_page(limit, after)
+        return self.repository.get_page(limit, after)
+
     def get_by_id(self, user_id: int) -> dict[str, Any]:
         return self.repository.get_by_id(user_id)
 
@@ -0,0 +1,62 @@
+import argparse
+import time
+from dataclasses import asdict
+from typing import Any, Callable
+
+from backend.application.services.codec import BOOK_CODEC
+from backend.domain.entities.book import Book, BookModel
+
+
+# Caminhos antigos, reproduzidos aqui para comparação: um modelo por linha ao carregar,
+# Book -> BookModel campo a campo ao gravar e BookModel -> Book -> asdict a cada resposta
+def legacy_load(rows: list[dict[str, Any]]) -> list[BookModel]:
+    return [BookModel(**row) for row in rows]
+
+
+def legacy_validate(books: list[Book]) -> list[BookModel]:
+    return [BookModel(id=book.id, title=book.title, user_id=book.user_id, status=book.status) for book in books]
+
+
+def legacy_dump(models: list[BookModel]) -> list[dict[str, Any]]:
+    return [
+        asdict(Book(id=model.id, title=model.title, user_id=model.user_id, status=model.status)) for model in models
+    ]
+
+
+def measure(func: Callable[[Any], Any], data: list[Any], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best / len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo por registro das conversões de livros, antes e depois do codec")
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [
+        {"id": i, "title": f"Livro {i}", "user_id": i % 1000 + 1, "status": i % 2 == 0}
+        for i in range(1, args.records + 1)
+    ]
+    books = [Book(**row) for row in rows]
+    models = BOOK_CODEC.validate_many(rows)
+    cases = [
+        ("load (raw -> model)", legacy_load, BOOK_CODEC.validate_many, rows),
+        ("validate (entity -> model)", legacy_validate, lambda items: BOOK_CODEC.from_entities(items), books),
+        ("dump (model -> dict)", legacy_dump, BOOK_CODEC.to_dicts, models),
+    ]
+    for name, before, after, data in cases:
+        before_cost = measure(before, data, args.rounds)
+        after_cost = measure(after, data, args.rounds)
+        print(
+            f"{name:<28} before {before_cost * 1e6:6.2f} us/rec   after {after_cost * 1e6:6.2f} us/rec"
+            f"   {before_cost / after_cost:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
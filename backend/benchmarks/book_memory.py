@@ -0,0 +1,83 @@
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from backend.application.services.book_query import BookQuery
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.storage.file_storage import FileStorage
+
+TITLE_WORDS = ["Admirável", "Mundo", "Novo", "Duna", "Fundação", "Solaris", "Neuromancer", "Messias", "Império", "Sol"]
+
+
+def build_records(size: int, users: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "title": f"{TITLE_WORDS[i % 10]} {TITLE_WORDS[i // 10 % 10]} {i}",
+            "user_id": i % users + 1,
+            "status": i % 3 == 0,
+        }
+        for i in range(1, size + 1)
+    ]
+
+
+def resident(repository_class: type, path: Path) -> tuple[Any, int]:
+    # Memória alocada (tracemalloc) que continua viva depois da carga: registros + índices
+    gc.collect()
+    tracemalloc.start()
+    repository = repository_class(str(path))
+    repository.search("duna", 1)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return repository, size
+
+
+def best_of(function: Any, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(repository_class: type, path: Path, queries: dict[str, BookQuery], records: int, rounds: int):
+    repository, size = resident(repository_class, path)
+    print(f"{repository_class.__name__:<24} resident {size / 1024 / 1024:8.1f} MiB   {size / records:6.0f} B/book")
+    for name, query in queries.items():
+        if query.user_id is not None:
+            cost = best_of(lambda: list(repository.query(query)), rounds)  # pylint: disable = W0640
+        else:
+            cost = best_of(lambda: repository.query_page(query, 100), rounds)  # pylint: disable = W0640
+        print(f"  {name:<24} {cost * 1000:8.2f} ms")
+    cost = best_of(lambda: sum(1 for _ in repository.iter_all()), 1)
+    print(f"  {'iter_all':<24} {cost * 1000:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória residente e consultas: livros como modelos ou em colunas")
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "books.json"
+        FileStorage(path=path, encode=dict).replace(build_records(args.records, args.users))
+        queries = {
+            "unread of user": BookQuery(user_id=7, status=False),
+            "all unread (page 100)": BookQuery(status=False),
+            "title prefix (page 100)": BookQuery(title_prefix="Duna"),
+        }
+        for repository_class in (BookRepository, ColumnarBookRepository):
+            report(repository_class, path, queries, args.records, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
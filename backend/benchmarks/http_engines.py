@@ -0,0 +1,147 @@
+import argparse
+import http.client
+import logging
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from backend.infrastructure.storage.file_storage import FileStorage
+from backend.main.config.config import (
+    configure_book_dependencies,
+    configure_stats_dependencies,
+    configure_user_dependencies,
+)
+from backend.main.routes.index import register_routes
+from backend.main.server.engines import SERVER_ENGINES, create_server
+from backend.main.server.server import RequestHandler
+
+# Mistura de leituras do dashboard: página de livros, livro por id e estatísticas
+WORKLOAD = ["/books?limit=20", "/books/{id}", "/books?limit=20&status=false", "/stats"]
+
+
+def serve(engine: str, port: int, data_dir: str, workers: int):
+    # Os motores registram cada requisição (logging e o log de acesso do http.server no stderr);
+    # aqui só o custo do motor interessa
+    logging.disable(logging.CRITICAL)
+    sys.stderr = open(os.devnull, "w", encoding="utf-8")  # pylint: disable = R1732
+    user_controller = configure_user_dependencies(str(Path(data_dir) / "users.json"))
+    book_controller = configure_book_dependencies(str(Path(data_dir) / "books.json"))
+    register_routes(
+        user_controller, book_controller, None, configure_stats_dependencies(user_controller, book_controller)
+    )
+    create_server(("127.0.0.1", port), RequestHandler, engine=engine, workers=workers).serve_forever()
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_until_listening(port: int):
+    for _ in range(200):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Server did not start on port {port}")
+
+
+def client(port: int, books: int, deadline: float, latencies: list[float], errors: list[int], offset: int, close: bool):
+    # Conexão persistente: o http.client reconecta sozinho quando o servidor responde com Connection: close.
+    # Com close=True toda requisição pede Connection: close e paga um handshake TCP novo
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    headers = {"Connection": "close"} if close else {}
+    step = offset
+    while time.perf_counter() < deadline:
+        path = WORKLOAD[step % len(WORKLOAD)].format(id=step * 7919 % books + 1)
+        step += 1
+        start = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(0)
+            connection.close()
+            continue
+        if response.status != 200:
+            # 503 do motor "pool" com a fila cheia: rejeição rápida, não conta como atendida
+            errors.append(response.status)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def measure(engine: str, args: Any, data_dir: str, close: bool) -> dict[str, float]:
+    port = free_port()
+    process = multiprocessing.Process(target=serve, args=(engine, port, data_dir, args.workers), daemon=True)
+    process.start()
+    try:
+        wait_until_listening(port)
+        # Conexões abertas e ociosas, como abas do dashboard paradas
+        idle = [socket.create_connection(("127.0.0.1", port)) for _ in range(args.idle)]
+        latencies: list[float] = []
+        errors: list[int] = []
+        deadline = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=client, args=(port, args.books, deadline, latencies, errors, number, close))
+            for number in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for connection in idle:
+            connection.close()
+    finally:
+        process.terminate()
+        process.join()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else float("nan")
+    return {"rps": len(latencies) / args.duration, "p99": p99, "errors": len(errors)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requisições/s e latência p99 por motor de servidor HTTP")
+    parser.add_argument("--engines", nargs="+", default=list(SERVER_ENGINES), choices=SERVER_ENGINES)
+    parser.add_argument("--books", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--idle", type=int, default=0, help="conexões ociosas mantidas abertas durante a carga")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument(
+        "--connection",
+        nargs="+",
+        default=["keep-alive", "close"],
+        choices=["keep-alive", "close"],
+        help="reaproveitar a conexão ou abrir uma por requisição",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        FileStorage(path=Path(data_dir) / "books.json", encode=dict).replace(
+            [
+                {"id": i, "title": f"Livro {i}", "user_id": i % 100 + 1, "status": i % 3 == 0}
+                for i in range(1, args.books + 1)
+            ]
+        )
+        print(f"{args.clients} clients, {args.idle} idle connections, {args.duration:.0f}s per engine")
+        for engine in args.engines:
+            for mode in args.connection:
+                result = measure(engine, args, data_dir, mode == "close")
+                print(
+                    f"  {engine:<10} {mode:<10} {result['rps']:8.0f} req/s   p99 {result['p99'] * 1000:7.2f} ms"
+                    f"   errors {result['errors']:.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from backend.infrastructure.repositories.book_repository import BookRepository
+
+
+def build_database(path: Path, size: int):
+    with open(path, "w") as f:  # pylint: disable = W1514, C0103
+        json.dump(
+            [
+                {"id": i, "title": f"Livro {i}", "user_id": i % 1000 + 1, "status": i % 2 == 0}
+                for i in range(1, size + 1)
+            ],
+            f,
+        )
+
+
+def bench_get_by_id(repository: BookRepository, size: int, lookups: int) -> float:
+    ids = [random.randint(1, size) for _ in range(lookups)]
+    start = time.perf_counter()
+    for book_id in ids:
+        repository.get_by_id(book_id)
+    return (time.perf_counter() - start) / lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de get_by_id do BookRepository por tamanho da base")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in args.sizes:
+            path = Path(temp_dir) / f"books_{size}.json"
+            build_database(path, size)
+            repository = BookRepository(db_path=str(path))
+            repository.load_data()
+            latency = bench_get_by_id(repository, size, args.lookups)
+            print(f"{size:>10} books: get_by_id {latency * 1_000_000:8.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.storage.file_storage import FileStorage
+from backend.infrastructure.storage.serializers import SERIALIZERS
+
+
+def build_records(size: int, distinct_titles: int) -> list[dict[str, Any]]:
+    return [
+        {"id": i, "title": f"Livro {i % distinct_titles}", "user_id": i % 1000 + 1, "status": i % 2 == 0}
+        for i in range(1, size + 1)
+    ]
+
+
+def timed(function: Any) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de gravação/leitura e tamanho do snapshot por formato")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--distinct-titles", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in args.sizes:
+            records = build_records(size, args.distinct_titles)
+            for serializer in SERIALIZERS:
+                path = Path(temp_dir) / f"books_{size}.{serializer}"
+                storage = FileStorage(path=path, encode=dict, serializer=serializer)
+                save = timed(lambda: storage.replace(records))  # pylint: disable = W0640
+                decode = timed(lambda: list(storage.read()))  # pylint: disable = W0640
+                # Leitura completa pelo repositório: decodificação + construção dos modelos pydantic
+                load = timed(BookRepository(db_path=str(path), serializer=serializer).load_data)
+                print(
+                    f"{size:>9} books {serializer:>6}: save {save:7.3f}s  decode {decode:7.3f}s  "
+                    f"load_data {load:7.3f}s  size {path.stat().st_size / 1024 / 1024:8.2f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
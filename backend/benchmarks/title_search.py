@@ -0,0 +1,63 @@
+import argparse
+import random
+import time
+from itertools import accumulate
+
+from backend.infrastructure.repositories.title_index import TitleIndex
+
+WORDS = [
+    "admirável", "mundo", "novo", "duna", "fundação", "memórias", "póstumas", "brás", "cubas", "cortiço",
+    "senhora", "iracema", "grande", "sertão", "veredas", "vidas", "secas", "capitães", "areia", "hora",
+]  # fmt: skip
+
+
+def build_vocabulary(size: int) -> tuple[list[str], list[float]]:
+    # Frequência das palavras segue a lei de Zipf, como nos títulos de um acervo real
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = WORDS + ["".join(random.choices(letters, k=random.randint(4, 10))) for _ in range(size)]
+    return words, list(accumulate(1 / rank for rank in range(1, len(words) + 1)))
+
+
+def build_titles(size: int, words: list[str], weights: list[float]) -> list[str]:
+    return [" ".join(random.choices(words, cum_weights=weights, k=random.randint(1, 5))) for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência da busca por prefixo no índice de títulos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--vocabulary", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(42)
+    words, weights = build_vocabulary(args.vocabulary)
+    for size in args.sizes:
+        titles = build_titles(size, words, weights)
+        index = TitleIndex()
+        start = time.perf_counter()
+        for book_id, title in enumerate(titles, 1):
+            index.add(book_id, title)
+        index.search("aquecimento", args.limit)
+        build = time.perf_counter() - start
+
+        for terms in (1, 2):
+            latencies = []
+            for title in random.choices(titles, k=args.queries):
+                # O que alguém digita: as primeiras palavras do título, a última pela metade
+                typed = title.split()[:terms]
+                typed[-1] = typed[-1][: max(3, len(typed[-1]) // 2)]
+                query = " ".join(typed)
+                start = time.perf_counter()
+                index.search(query, args.limit)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            print(
+                f"{size:>9} books (index built in {build:5.2f}s), {terms} term(s): "
+                f"p50 {latencies[len(latencies) // 2] * 1_000_000:9.1f} us  "
+                f"p99 {latencies[int(len(latencies) * 0.99)] * 1_000_000:9.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,181 @@
+import bisect
 import logging
-from dataclasses import asdict
-from typing import Any, List
+from typing import Any, Callable, Iterator, List, Optional, Sequence
 
 from pydantic import ValidationError  # pylint: disable = E0401  # type: ignore
 
-from backend.application.services.book_schema import book_to_pydantic, pydantic_to_book
+from backend.application.services.book_query import BookQuery
+from backend.application.services.codec import BOOK_CODEC
+from backend.application.services.pagination import page
+from backend.application.services.stats import book_stats
 from backend.domain.entities.book import Book, BookModel
+from backend.infrastructure.repositories.counters import GroupCounts
 from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.repositories.title_index import TitleIndex
 
 # Criar um logger
 logger = logging.getLogger("book_repository")
 
+# Um índice só compensa se restringir os candidatos a uma fração da coleção: os ids dele
+# precisam ser ordenados, enquanto a varredura já percorre _sorted_ids em ordem
+INDEX_SELECTIVITY = 8
+
+
+def discard_from_index(index: dict[Any, set[int]], key: Any, book_id: int):
+    book_ids = index.get(key)
+    if book_ids is not None:
+        book_ids.discard(book_id)
+        if not book_ids:
+            del index[key]
+
 
 class BookRepository(JSONRepository):
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, **options: Any):
         logger.debug(f"Initializing BookRepository with db_path: {db_path}")
-        super().__init__(db_path=db_path, model=BookModel)
-
-    def _get_next_id(self):
-        data = self.load_data()
-        if not data:
-            return 1
-        max_id = max(user.id for user in data)
-        next_id = max_id + 1
-        logger.debug(f"Next ID calculated: {next_id}")
-        return next_id
+        self._user_index: dict[int, set[int]] = {}
+        self._status_index: dict[bool, set[int]] = {}
+        self._title_index = TitleIndex()
+        # user_id -> (livros, lidos), para GET /stats
+        self._counts = GroupCounts(width=2)
+        super().__init__(db_path=db_path, model=BookModel, **options)
+
+    def _reset_indexes(self):
+        self._user_index = {}
+        self._status_index = {}
+        self._title_index = TitleIndex()
+        self._counts = GroupCounts(width=2)
+
+    def _index(self, item: BookModel):
+        self._user_index.setdefault(item.user_id, set()).add(item.id)
+        self._status_index.setdefault(item.status, set()).add(item.id)
+        self._title_index.add(item.id, item.title)
+        self._counts.add(item.user_id, (1, item.status))
+
+    def _unindex(self, item: BookModel):
+        discard_from_index(self._user_index, item.user_id, item.id)
+        discard_from_index(self._status_index, item.status, item.id)
+        self._title_index.remove(item.id, item.title)
+        self._counts.remove(item.user_id, (1, item.status))
+
+    def stats(self) -> dict[str, Any]:
+        with self._reading():
+            total, read = self._counts.totals
+            per_user = self._counts.rows()
+        return book_stats(total, read, per_user)
 
     def add(self, item: Book) -> dict[str, Any]:
         try:
             logger.debug(f"Adding book: {item}")
             if item.id == 0:
                 item.id = self._get_next_id()
-            data = self.load_data()
-            data.append(item)
-            data = list(map(book_to_pydantic, data))
-            self.save_data(data)
-            logger.info(f"book added: {asdict(item)}")
-            return asdict(item)
+            model = BOOK_CODEC.from_entity(item)
+            self.insert(model)
+            book = BOOK_CODEC.to_dict(model)
+            logger.info(f"book added: {book}")
+            return book
         except ValidationError as error:
             logger.error(f"Validation error: {error}")
             raise ValueError(f"Invalid book data: {error}")  # pylint: disable = W0707
 
+    def add_many(self, items: List[Book]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Adding {len(items)} books")
+        models, invalid = BOOK_CODEC.from_entities(items)
+        errors = [(position, f"Invalid book data: {error}") for position, error in invalid]
+        applied, failed = self._insert_many(models)
+        created = [BOOK_CODEC.to_dict(models[position]) for position in applied]
+        logger.info(f"{len(created)} books added")
+        return created, sorted(errors + failed)
+
     def get_all(self) -> List[dict[str, Any]]:
-        data = self.load_data()
-        data = list(map(pydantic_to_book, data))
-        data = [asdict(book) for book in data]
-        return data
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[dict[str, Any]]:
+        # Só a cópia da coleção acontece sob o lock; as linhas são montadas durante a iteração
+        with self._reading() as records:
+            rows = records.freeze()
+        yield from rows
+
+    def get_page(self, limit: int, after: int = 0) -> dict[str, Any]:
+        items, next_after = self.page_data(limit, after)
+        return page(items, next_after)
+
+    def query(self, query: BookQuery) -> Iterator[dict[str, Any]]:
+        items, _ = self._select(query)
+        return iter(items)
+
+    def query_page(self, query: BookQuery, limit: int, after: int = 0) -> dict[str, Any]:
+        items, next_after = self._select(query, limit, after)
+        return page(items, next_after)
+
+    def search(self, text: str, limit: int) -> List[dict[str, Any]]:
+        logger.debug(f"Searching books: {text}")
+        with self._reading() as records:
+            ranked = self._title_index.search(text, limit)
+            return list(records.rows(ranked))
+
+    def _plan(self, query: BookQuery) -> tuple[str, Optional[Sequence[int]]]:
+        # Entre os índices de igualdade aplicáveis, o de menos candidatos; sem nenhum, varredura por id
+        indexes = []
+        if query.user_id is not None:
+            indexes.append(("user_id", self._user_index.get(query.user_id, set())))
+        if query.status is not None:
+            indexes.append(("status", self._status_index.get(query.status, set())))
+        if indexes:
+            name, book_ids = min(indexes, key=lambda index: len(index[1]))
+            if len(book_ids) * INDEX_SELECTIVITY <= len(self._sorted_ids):
+                return name, sorted(book_ids)
+        return "scan", None
+
+    def _matcher(self, records: Any, query: BookQuery) -> Callable[[int], bool]:
+        def matches(book_id: int) -> bool:
+            item = records[book_id]
+            return (
+                (query.user_id is None or item.user_id == query.user_id)
+                and (query.status is None or item.status == query.status)
+                and (query.title_prefix is None or item.title.startswith(query.title_prefix))
+            )
+
+        return matches
+
+    def _select(
+        self, query: BookQuery, limit: Optional[int] = None, after: int = 0
+    ) -> tuple[List[dict[str, Any]], Optional[int]]:
+        with self._reading() as records:
+            plan, book_ids = self._plan(query)
+            logger.debug(f"Book query {query} planned as: {plan}")
+            ordered = self._sorted_ids if book_ids is None else book_ids
+            if query.descending:
+                end = bisect.bisect_left(ordered, after) if after else len(ordered)
+                positions = range(end - 1, -1, -1)
+            else:
+                positions = range(bisect.bisect_right(ordered, after), len(ordered))
+            matches = self._matcher(records, query)
+            selected: List[int] = []
+            for position in positions:
+                if matches(ordered[position]):
+                    selected.append(ordered[position])
+                    if limit is not None and len(selected) > limit:
+                        break
+            if limit is not None and len(selected) > limit:
+                return list(records.rows(selected[:limit])), selected[limit - 1]
+            return list(records.rows(selected)), None
 
     def get_by_id(self, book_id: int) -> dict[str, Any]:
         logger.debug(f"Fetching book by ID: {book_id}")
-        data = self.load_data()
-        data = list(map(pydantic_to_book, data))
-        for item in data:
-            if item.id == book_id:
-                logger.info(f"Book found: {asdict(item)}")
-                return asdict(item)
+        item = self.find(book_id)
+        if item is not None:
+            book = BOOK_CODEC.to_dict(item)
+            logger.info(f"Book found: {book}")
+            return book
         logger.warning(f"Book not found: {book_id}")
         raise ValueError("Book not found")
 
     def get_by_user_id(self, user_id: int) -> list[dict[str, Any]]:
         logger.debug(f"Fetching books by user ID: {user_id}")
-        data = self.load_data()
-        data = list(map(pydantic_to_book, data))
-        books = []
-        for item in data:
-            if item.user_id == user_id:
-                logger.info(f"Book found: {asdict(item)}")
-                books.append(asdict(item))
+        with self._reading() as records:
+            books = list(records.rows(sorted(self._user_index.get(user_id, ()))))
+        for book in books:
+            logger.info(f"Book found: {book}")
         if books:  # pylint: disable = R1705
             return books
         else:
@@ -75,28 +184,46 @@ class BookRepository(JSONRepository):
 
     def update(self, book_id: int, updated_book_data: dict[str, Any]) -> dict[str, Any]:
         logger.debug(f"Updating book: {updated_book_data}")
-        data = self.load_data()
+        item = self.modify(book_id, updated_book_data)
+        if item is not None:
+            book = BOOK_CODEC.to_dict(item)
+            logger.info(f"Book updated: {book}")
+            return book
 
-        for idx, item in enumerate(data):  # pylint: disable = W0612  # type: ignore
-            if item.id == book_id:
-                for key, value in updated_book_data.items():
-                    setattr(item, key, value)
-
-                self.save_data(data)
+        logger.warning(f"Book not found for update: {book_id}")
+        raise ValueError("Book not found")
 
-                logger.info(f"Book updated: {item.model_dump()}")
-                return item.model_dump()
+    def toggle_status(self, book_id: int) -> dict[str, Any]:
+        logger.debug(f"Toggling status of book: {book_id}")
+        item = self.modify(book_id, lambda book: {"status": not book.status})
+        if item is not None:
+            book = BOOK_CODEC.to_dict(item)
+            logger.info(f"Book status toggled: {book}")
+            return book
 
         logger.warning(f"Book not found for update: {book_id}")
         raise ValueError("Book not found")
 
+    def update_many(self, updates: List[dict[str, Any]]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Updating {len(updates)} books")
+        updated_books = {
+            position: (data.get("id", 0), {key: value for key, value in data.items() if key != "id"})
+            for position, data in enumerate(updates)
+        }
+        modified, errors = self._modify_many(updated_books, "Book not found")
+        updated = BOOK_CODEC.to_dicts(modified.values())
+        logger.info(f"{len(updated)} books updated")
+        return updated, errors
+
+    def delete_many(self, book_ids: List[int]) -> tuple[List[int], List[tuple[int, str]]]:
+        logger.debug(f"Deleting books by ID: {book_ids}")
+        applied, failed = self._remove_many(dict(enumerate(book_ids)))
+        errors = [(position, "Book not found") for position, _ in failed]
+        return [book_ids[position] for position in applied], errors
+
     def delete(self, book_id: int) -> List[dict[str, Any]]:
         logger.debug(f"Deleting book by ID: {book_id}")
-        data = self.load_data()
-        for idx, item in enumerate(data):
-            if item.id == book_id:
-                del data[idx]
-                self.save_data(data)
-                return self.get_all()
+        if self.remove(book_id) is not None:
+            return self.get_all()
         logger.warning(f"Book not found for deletion: {book_id}")
         raise ValueError("Book not found")
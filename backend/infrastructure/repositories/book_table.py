@@ -0,0 +1,310 @@
+import bisect
+from array import array
+from functools import partial
+from itertools import compress
+from operator import and_, lt
+from typing import Any, Callable, Iterable, Iterator, MutableMapping, Optional
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.storage.file_storage import FrozenRows
+
+# Cada byte de um bitmap vira 8 bytes 0/1, um por linha: o resultado serve de seletor para
+# itertools.compress, e a varredura inteira fica em C
+BYTEMAPS = [bytes((value >> bit) & 1 for bit in range(8)) for value in range(256)]
+
+# A tabela é reescrita quando as linhas removidas passam das vivas, ou o texto sem uso passa
+# da metade do pool de títulos (abaixo destes mínimos não vale a pena)
+COMPACT_MIN_ROWS = 1024
+COMPACT_MIN_BYTES = 1 << 20
+
+
+def expand(bitmap: bytes) -> bytes:
+    return b"".join(map(BYTEMAPS.__getitem__, bitmap))
+
+
+def get_bit(bitmap: bytearray, row: int) -> bool:
+    return bool(bitmap[row >> 3] >> (row & 7) & 1)
+
+
+def set_bit(bitmap: bytearray, row: int, value: bool):
+    if value:
+        bitmap[row >> 3] |= 1 << (row & 7)
+    else:
+        bitmap[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+
+# Livros em colunas: ids e user_ids em array('q'), status em bitmap e os títulos (UTF-8) em um
+# único bytearray, com início e tamanho por linha. Linhas só são anexadas, na ordem de
+# inserção; remoções apagam o bit de "viva". Um índice ordenado (ids, linhas) resolve id -> linha
+# por busca binária. Modelos e dicionários só são montados na saída.
+class BookTable(MutableMapping):
+    def __init__(self, items: Iterable[BookModel] = ()):
+        self._ids = array("q")
+        self._user_ids = array("q")
+        self._title_starts = array("q")
+        self._title_sizes = array("I")
+        self._pool = bytearray()
+        self._status = bytearray()
+        self._alive = bytearray()
+        self._order_ids = array("q")
+        self._order_rows = array("q")
+        self._live = 0
+        self._read = 0
+        self._garbage = 0
+        for item in items:
+            self._append(item.id, item.user_id, item.title.encode("utf-8"), item.status)
+        self._build_index()
+
+    def _append(self, book_id: int, user_id: int, title: bytes, status: bool) -> int:
+        row = len(self._ids)
+        if not row & 7:
+            self._alive.append(0)
+            self._status.append(0)
+        self._ids.append(book_id)
+        self._user_ids.append(user_id)
+        self._title_starts.append(len(self._pool))
+        self._title_sizes.append(len(title))
+        self._pool += title
+        set_bit(self._alive, row, True)
+        if status:
+            set_bit(self._status, row, True)
+            self._read += 1
+        self._live += 1
+        return row
+
+    def _build_index(self):
+        ids = self._ids
+        # Caso comum: o arquivo foi gravado na ordem de inserção e os ids já são crescentes
+        if all(map(lt, ids, ids[1:])):
+            self._order_ids = ids[:]
+            self._order_rows = array("q", range(len(ids)))
+            return
+        self._order_ids, self._order_rows = array("q"), array("q")
+        for row in sorted(range(len(ids)), key=ids.__getitem__):
+            if self._order_ids and self._order_ids[-1] == ids[row]:
+                # Id repetido: vale a última ocorrência, como em um dicionário
+                self._kill(self._order_rows[-1])
+                self._order_rows[-1] = row
+                continue
+            self._order_ids.append(ids[row])
+            self._order_rows.append(row)
+
+    def _kill(self, row: int):
+        set_bit(self._alive, row, False)
+        self._live -= 1
+        self._read -= get_bit(self._status, row)
+        self._garbage += self._title_sizes[row]
+
+    def _position(self, book_id: int) -> int:
+        position = bisect.bisect_left(self._order_ids, book_id)
+        if position < len(self._order_ids) and self._order_ids[position] == book_id:
+            return position
+        return -1
+
+    def _row(self, book_id: int) -> int:
+        position = self._position(book_id)
+        if position < 0:
+            raise KeyError(book_id)
+        return self._order_rows[position]
+
+    def _title_bytes(self, row: int) -> bytes:
+        start = self._title_starts[row]
+        end = start + self._title_sizes[row]
+        return self._pool[start:end]
+
+    def _title(self, row: int) -> str:
+        return self._title_bytes(row).decode("utf-8")
+
+    def _live_rows(self) -> Iterator[int]:
+        return compress(range(len(self._ids)), expand(self._alive))
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, book_id: Any) -> bool:
+        return self._position(book_id) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        return compress(self._ids, expand(self._alive))
+
+    def __getitem__(self, book_id: int) -> BookModel:
+        row = self._row(book_id)
+        return BookModel.model_construct(
+            id=book_id, title=self._title(row), user_id=self._user_ids[row], status=get_bit(self._status, row)
+        )
+
+    def __setitem__(self, book_id: int, item: BookModel):
+        position = self._position(book_id)
+        if position < 0:
+            row = self._append(book_id, item.user_id, item.title.encode("utf-8"), item.status)
+            if not self._order_ids or book_id > self._order_ids[-1]:
+                self._order_ids.append(book_id)
+                self._order_rows.append(row)
+            else:
+                position = bisect.bisect_left(self._order_ids, book_id)
+                self._order_ids.insert(position, book_id)
+                self._order_rows.insert(position, row)
+            return
+        row = self._order_rows[position]
+        self._user_ids[row] = item.user_id
+        if get_bit(self._status, row) != item.status:
+            set_bit(self._status, row, item.status)
+            self._read += 1 if item.status else -1
+        title = item.title.encode("utf-8")
+        start, size = self._title_starts[row], self._title_sizes[row]
+        if len(title) <= size:
+            # Cabe no lugar do anterior; a sobra fica sem uso até a próxima compactação
+            end = start + len(title)
+            self._pool[start:end] = title
+        else:
+            self._title_starts[row] = len(self._pool)
+            self._pool += title
+            size += len(title)
+        self._garbage += size - len(title)
+        self._title_sizes[row] = len(title)
+        self._maybe_compact()
+
+    def __delitem__(self, book_id: int):
+        position = self._position(book_id)
+        if position < 0:
+            raise KeyError(book_id)
+        row = self._order_rows[position]
+        del self._order_ids[position]
+        del self._order_rows[position]
+        self._kill(row)
+        self._maybe_compact()
+
+    def values(self) -> Iterator[BookModel]:  # type: ignore
+        return map(self.__getitem__, iter(self))
+
+    def _maybe_compact(self):
+        dead = len(self._ids) - self._live
+        if dead > max(COMPACT_MIN_ROWS, self._live) or self._garbage > max(COMPACT_MIN_BYTES, len(self._pool) // 2):
+            self._compact()
+
+    def _compact(self):
+        table = BookTable()
+        moved = array("q", [-1]) * len(self._ids)
+        for row in self._live_rows():
+            moved[row] = table._append(
+                self._ids[row], self._user_ids[row], self._title_bytes(row), get_bit(self._status, row)
+            )
+        table._order_ids = self._order_ids
+        table._order_rows = array("q", map(moved.__getitem__, self._order_rows))
+        vars(self).update(vars(table))
+
+    # Consultas usadas pelo repositório colunar: nenhuma materializa o registro
+    def sorted_ids(self) -> array:
+        return self._order_ids[:]
+
+    def count(self, status: bool) -> int:
+        return self._read if status else self._live - self._read
+
+    def matcher(
+        self, user_id: Optional[int] = None, status: Optional[bool] = None, title_prefix: Optional[bytes] = None
+    ) -> Callable[[int], bool]:
+        # Filtro por id lido direto das colunas; as referências ficam em variáveis locais porque
+        # a função roda uma vez por candidato
+        order_ids, order_rows, user_ids, status_bits = self._order_ids, self._order_rows, self._user_ids, self._status
+        starts, sizes, pool = self._title_starts, self._title_sizes, self._pool
+        size = len(order_ids)
+        hint = -1
+
+        def matches(book_id: int) -> bool:
+            nonlocal hint
+            # Os candidatos chegam em ordem de id (crescente ou decrescente): numa varredura o
+            # próximo é vizinho do anterior no índice, sem busca binária
+            position = hint + 1
+            if position >= size or order_ids[position] != book_id:
+                if hint < 0:
+                    position = bisect.bisect_left(order_ids, book_id)
+                elif book_id > order_ids[hint]:
+                    position = bisect.bisect_left(order_ids, book_id, hint + 1)
+                elif hint > 0 and order_ids[hint - 1] == book_id:
+                    position = hint - 1
+                else:
+                    position = bisect.bisect_left(order_ids, book_id, 0, hint)
+            hint = position
+            row = order_rows[position]
+            if user_id is not None and user_ids[row] != user_id:
+                return False
+            if status is not None and bool(status_bits[row >> 3] >> (row & 7) & 1) != status:
+                return False
+            # O prefixo em UTF-8 casa com os bytes do título exatamente quando casa com o texto
+            return title_prefix is None or pool.startswith(title_prefix, starts[row], starts[row] + sizes[row])
+
+        return matches
+
+    def ids_where(self, user_id: Optional[int] = None, status: Optional[bool] = None) -> list[int]:
+        # Ids das linhas vivas que passam nos filtros, na ordem de inserção: os bitmaps são
+        # combinados como inteiros e o user_id é comparado coluna abaixo, tudo em C
+        mask = int.from_bytes(self._alive, "little")
+        if status is not None:
+            bits = int.from_bytes(self._status, "little")
+            mask &= bits if status else ~bits
+        selectors: Iterable[Any] = expand(mask.to_bytes(len(self._alive), "little"))
+        if user_id is not None:
+            selectors = map(and_, selectors, map(user_id.__eq__, self._user_ids))
+        return list(compress(self._ids, selectors))
+
+    def index_rows(self) -> Iterator[tuple[int, int, str, bool]]:
+        # (id, user_id, título, status) em ordem de id, para montar os índices secundários
+        rows = self._order_rows
+        return zip(
+            self._order_ids,
+            map(self._user_ids.__getitem__, rows),
+            map(self._title, rows),
+            map(partial(get_bit, self._status), rows),
+        )
+
+    def rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[dict[str, Any]]:
+        if ids is not None:
+            return self._rows(map(self._row, ids))
+        return self._scan()
+
+    def _rows(self, rows: Iterable[int]) -> Iterator[dict[str, Any]]:
+        ids, user_ids, starts, sizes, pool, status = (
+            self._ids,
+            self._user_ids,
+            self._title_starts,
+            self._title_sizes,
+            self._pool,
+            self._status,
+        )
+        for row in rows:
+            start = starts[row]
+            end = start + sizes[row]
+            yield {
+                "id": ids[row],
+                "title": pool[start:end].decode("utf-8"),
+                "user_id": user_ids[row],
+                "status": bool(status[row >> 3] >> (row & 7) & 1),
+            }
+
+    def _scan(self) -> Iterator[dict[str, Any]]:
+        # Tabela inteira: as colunas andam juntas pelo zip, sem indexar linha a linha
+        pool = self._pool
+        columns = zip(
+            self._ids, self._user_ids, self._title_starts, self._title_sizes, expand(self._status), expand(self._alive)
+        )
+        for book_id, user_id, start, size, status, alive in columns:
+            if alive:
+                end = start + size
+                yield {
+                    "id": book_id,
+                    "title": pool[start:end].decode("utf-8"),
+                    "user_id": user_id,
+                    "status": status == 1,
+                }
+
+    def freeze(self) -> FrozenRows:
+        # Cópia das colunas (memcpy, sem um objeto por registro); o índice não é necessário
+        copy = BookTable.__new__(BookTable)
+        copy._ids = self._ids[:]
+        copy._user_ids = self._user_ids[:]
+        copy._title_starts = self._title_starts[:]
+        copy._title_sizes = self._title_sizes[:]
+        copy._pool = bytes(self._pool)  # type: ignore
+        copy._status = bytes(self._status)  # type: ignore
+        copy._alive = bytes(self._alive)  # type: ignore
+        return FrozenRows(self._live, copy.rows)
@@ -0,0 +1,82 @@
+import bisect
+import logging
+from array import array
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from backend.application.services.book_query import BookQuery
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories.book_repository import INDEX_SELECTIVITY, BookRepository
+from backend.infrastructure.repositories.book_table import BookTable
+from backend.infrastructure.repositories.counters import GroupCounts
+from backend.infrastructure.repositories.title_index import TitleIndex
+
+# Criar um logger
+logger = logging.getLogger("columnar_book_repository")
+
+EMPTY_IDS = array("q")
+
+
+# BookRepository sobre uma BookTable: os livros ficam em colunas, e não um modelo por registro.
+# O índice por usuário guarda arrays ordenados, o de status deixa de existir (o bitmap da
+# tabela cumpre o papel) e os filtros das consultas leem as colunas direto.
+class ColumnarBookRepository(BookRepository):
+    def __init__(self, db_path: str, **options: Any):
+        logger.debug(f"Initializing ColumnarBookRepository with db_path: {db_path}")
+        super().__init__(db_path, **options)
+
+    def _set_records(self, data: Iterable[BookModel]):
+        records = BookTable(data)
+        self._records = records  # type: ignore
+        self._sorted_ids = records.sorted_ids()
+        self._reset_indexes()
+        # Em ordem de id: cada array do índice por usuário já nasce ordenado
+        for book_id, user_id, title, status in records.index_rows():
+            self._user_index.setdefault(user_id, array("q")).append(book_id)  # type: ignore
+            self._title_index.add(book_id, title)
+            self._counts.add(user_id, (1, status))
+
+    def _reset_indexes(self):
+        self._user_index = {}
+        self._title_index = TitleIndex(compact=True)
+        self._counts = GroupCounts(width=2)
+
+    def _index(self, item: BookModel):
+        book_ids = self._user_index.setdefault(item.user_id, array("q"))
+        if not book_ids or item.id > book_ids[-1]:
+            book_ids.append(item.id)
+        else:
+            bisect.insort(book_ids, item.id)
+        self._title_index.add(item.id, item.title)
+        self._counts.add(item.user_id, (1, item.status))
+
+    def _unindex(self, item: BookModel):
+        book_ids = self._user_index.get(item.user_id)
+        if book_ids is not None:
+            position = bisect.bisect_left(book_ids, item.id)
+            if position < len(book_ids) and book_ids[position] == item.id:
+                del book_ids[position]
+            if not book_ids:
+                del self._user_index[item.user_id]
+        self._title_index.remove(item.id, item.title)
+        self._counts.remove(item.user_id, (1, item.status))
+
+    def _plan(self, query: BookQuery) -> tuple[str, Optional[Sequence[int]]]:
+        records: BookTable = self._records  # type: ignore
+        estimates = []
+        if query.user_id is not None:
+            book_ids = self._user_index.get(query.user_id, EMPTY_IDS)
+            # Sem filtro de status o array do usuário é exatamente o resultado, já ordenado
+            if query.status is None or len(book_ids) * INDEX_SELECTIVITY <= len(self._sorted_ids):
+                return "user_id", book_ids
+            estimates.append(len(book_ids))
+        if query.status is not None:
+            estimates.append(records.count(query.status))
+        if estimates and min(estimates) * INDEX_SELECTIVITY <= len(self._sorted_ids):
+            # Poucos resultados: varrer as colunas em C sai mais barato que conferir id a id. Os ids
+            # voltam na ordem de inserção, quase sempre já crescente.
+            return "columns", sorted(records.ids_where(user_id=query.user_id, status=query.status))
+        return "scan", None
+
+    def _matcher(self, records: Any, query: BookQuery) -> Callable[[int], bool]:
+        title_prefix = None if query.title_prefix is None else query.title_prefix.encode("utf-8")
+        return records.matcher(user_id=query.user_id, status=query.status, title_prefix=title_prefix)
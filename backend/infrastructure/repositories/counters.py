@@ -0,0 +1,32 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+
+# Contagens agrupadas por chave, mantidas pelos ganchos _index/_unindex dos repositórios a cada
+# inserção, atualização e remoção: GET /stats lê os totais prontos, sem percorrer a coleção.
+# Cada registro soma um vetor de "width" valores ao grupo da sua chave e ao total geral; o
+# primeiro valor é a quantidade de registros e um grupo que chega a zero é descartado.
+@dataclass
+class GroupCounts:
+    width: int
+    totals: list[int] = field(init=False)
+    groups: dict[Any, list[int]] = field(init=False, default_factory=dict)
+
+    def __post_init__(self):
+        self.totals = [0] * self.width
+
+    def add(self, key: Any, values: tuple[int, ...], sign: int = 1):
+        counts = self.groups.get(key)
+        if counts is None:
+            counts = self.groups[key] = [0] * self.width
+        for position, value in enumerate(values):
+            counts[position] += sign * value
+            self.totals[position] += sign * value
+        if not counts[0]:
+            del self.groups[key]
+
+    def remove(self, key: Any, values: tuple[int, ...]):
+        self.add(key, values, -1)
+
+    def rows(self) -> list[tuple[Any, ...]]:
+        return sorted((key, *counts) for key, counts in self.groups.items())
@@ -1,49 +1,342 @@
-import json
+import bisect
 import logging
-import shutil
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+from backend.application.services.codec import ModelCodec, codec_for
+from backend.infrastructure.storage.commit_pipeline import CommitPipeline, DurabilityPolicy
+from backend.infrastructure.storage.file_storage import Change, FileStorage, FrozenRows, freeze_records
+from backend.infrastructure.storage.id_allocator import IdAllocator
+from backend.infrastructure.storage.journal_storage import JournalStorage
+from backend.infrastructure.storage.locks import ReadWriteLock
 
 # Criar um logger
 logger = logging.getLogger("json_repository")
 
+STORAGE_ENGINES: dict[str, type[FileStorage]] = {"file": FileStorage, "journal": JournalStorage}
+
+
+# Contêiner padrão dos registros: id -> modelo, na ordem de inserção. As linhas de saída são
+# cópias rasas dos campos, como em ModelCodec.to_dict; subclasses podem trocar o contêiner
+# (ver BookTable) desde que ofereçam rows() e freeze()
+class RecordMap(dict):
+    def rows(self, ids: Optional[Iterable[int]] = None) -> Iterator[dict[str, Any]]:
+        items = self.values() if ids is None else map(self.__getitem__, ids)
+        return (dict(item.__dict__) for item in items)
+
+    def freeze(self) -> FrozenRows:
+        # Os modelos nunca são alterados no lugar (_stage_modify cria outro): basta copiar as referências
+        items = list(self.values())
+        return FrozenRows(len(items), lambda: (dict(item.__dict__) for item in items))
+
 
 @dataclass
 class JSONRepository:
     db_path: str
     model: type
+    storage: str = "file"
+    durability: str = "none"
+    commit_window_ms: float = 0
+    serializer: str = "json"
     _path: Path = field(init=False)
+    _codec: ModelCodec = field(init=False)
+    _storage: FileStorage = field(init=False)
+    _pipeline: CommitPipeline = field(init=False)
+    _ids: IdAllocator = field(init=False)
+    # Leituras concorrentes; mutações da memória e dos índices (e recargas) são exclusivas
+    _lock: ReadWriteLock = field(init=False, default_factory=ReadWriteLock)
+    # Índice de chave primária: id -> registro, na ordem de inserção
+    _records: Optional[RecordMap] = field(init=False, default=None)
+    # Ids em ordem crescente, para paginação por cursor
+    _sorted_ids: Any = field(init=False, default_factory=list)
 
     def __post_init__(self):
         self._path = Path(self.db_path)
-        logger.debug(f"Initializing JSONRepository with path: {self._path}")
+        self._codec = codec_for(self.model)
+        logger.debug(f"Initializing JSONRepository with path: {self._path}, storage: {self.storage}")
+        if self.storage not in STORAGE_ENGINES:
+            raise ValueError(f"Unknown storage engine: {self.storage}")
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        if not self._path.exists():
-            self._initialize_db()
+        self._storage = STORAGE_ENGINES[self.storage](path=self._path, serializer=self.serializer)
+        self._storage.initialize()
+        self._pipeline = CommitPipeline(
+            storage=self._storage,
+            policy=DurabilityPolicy.parse(self.durability),
+            window_ms=self.commit_window_ms,
+            # O líder grava os registros com o lock de leitura: nenhuma mutação acontece no meio
+            guard=self._lock.read,
+            on_error=self._drop_cache,
+        )
+        self._ids = IdAllocator(path=self._path.with_name(f"{self._path.name}.seq"), seed=self._seed_next_id)
+
+    def _is_stale(self) -> bool:
+        return self._records is None or self._storage.changed()
+
+    def invalidate_cache(self):
+        with self._lock.write():
+            self._drop_cache()
+
+    def _drop_cache(self):
+        # Com o lock de escrita ou, numa gravação que falhou, com o de leitura que o líder segura:
+        # em ambos nenhuma mutação está em andamento
+        self._records = None
+        self._storage.forget()
+
+    def _get_records(self) -> RecordMap:
+        if not self._is_stale():
+            logger.debug(f"Loading data from cache: {self._path}")
+            return self._records  # type: ignore
+        with self._lock.write():
+            # Outra thread pode ter recarregado enquanto esperávamos o lock
+            if self._is_stale() and not self._catch_up():
+                self._set_records(self.decode(self._storage.read()))
+                self._ids.advance(self._seed_next_id())
+            return self._records  # type: ignore
+
+    def _catch_up(self) -> bool:
+        # Outro processo (ex.: um worker do pre-fork) gravou: aplica só as mudanças dele, com os
+        # mesmos passos de uma escrita local, em vez de decodificar a coleção inteira de novo
+        if self._records is None:
+            return False
+        entries = self._storage.read_tail()
+        if entries is None:
+            return False
+        try:
+            for entry in entries:
+                if entry["op"] == "put":
+                    item = self.decode([entry["record"]])[0]
+                    if item.id in self._records:
+                        self._stage_replace(item)
+                    else:
+                        self._stage_insert(item)
+                elif entry["op"] == "delete" and entry["id"] in self._records:
+                    self._stage_remove(entry["id"])
+        except ValueError as error:
+            logger.warning(f"Reloading {self._path} after a failed catch-up: {error}")
+            return False
+        logger.debug(f"Applied {len(entries)} journal entries from other processes to: {self._path}")
+        return True
 
-    def _initialize_db(self):
-        logger.debug(f"Creating new database file at: {self._path}")
-        with open(self._path, "w") as f:  # pylint: disable = W1514, C0103
-            json.dump([], f)
-        logger.info(f"Database initialized at: {self._path}")
+    # Não chame _get_records segurando o lock de leitura: uma recarga precisa do lock de escrita
+    @contextmanager
+    def _reading(self) -> Iterator[RecordMap]:
+        while True:
+            self._get_records()
+            with self._lock.read():
+                if self._records is not None:
+                    yield self._records
+                    return
+
+    def decode(self, rows: Iterable[dict[str, Any]]) -> list[Any]:
+        # Validada em blocos à medida que o armazenamento lê: só os modelos ficam para a coleção
+        return self._codec.validate_many(rows)
+
+    def _seed_next_id(self) -> int:
+        return max(self._records or (), default=0) + 1
+
+    def _get_next_id(self) -> int:
+        return self.reserve_ids(1).start
+
+    def reserve_ids(self, count: int) -> range:
+        # Carrega os registros antes: sem arquivo de sequência, ela parte do maior id existente
+        self._get_records()
+        ids = self._ids.reserve(count)
+        logger.debug(f"Next ID calculated: {ids.start}")
+        return ids
+
+    def _set_records(self, data: Iterable[Any]):
+        self._records = RecordMap((item.id, item) for item in data)
+        self._sorted_ids = sorted(self._records)
+        self._reset_indexes()
+        for item in self._records.values():
+            self._index(item)
+
+    # Ganchos para índices secundários mantidos pelas subclasses
+    def _reset_indexes(self):
+        pass
+
+    def _index(self, item: Any):
+        pass
+
+    def _unindex(self, item: Any):
+        pass
+
+    def _check_constraints(self, item: Any, previous: Optional[Any]):
+        pass
 
     def load_data(self):
-        logger.debug(f"Loading data from: {self._path}")
-        with open(self._path, "r") as f:  # pylint: disable = W1514, C0103
-            data = json.load(f)
-            # logger.info(f'Data loaded: {data}')
-            return [self.model(**item) for item in data]
+        with self._reading() as records:
+            return list(records.values())
+
+    def iter_data(self) -> Iterator[Any]:
+        # Copia só as referências: uma escrita concorrente não invalida a iteração
+        yield from self.load_data()
 
     def save_data(self, data: Any):
-        logger.debug(f"Saving data to: {self._path}")
-        temp_file = NamedTemporaryFile("w", delete=False, dir=self._path.parent)  # pylint: disable = R1732
-        try:
-            json.dump([item.model_dump() for item in data], temp_file)
-            temp_file.flush()
-            shutil.move(temp_file.name, self._path)
-            logger.info(f"Data successfully saved to: {self._path}")
-        finally:
-            temp_file.close()
-            logger.debug(f"Temporary file closed: {temp_file.name}")
+        data = list(data)
+        # Disco e memória trocados na mesma seção exclusiva: nenhuma escrita entra entre os dois
+        with self._pipeline.exclusive(self._lock.write):
+            try:
+                self._pipeline.replace(data)
+            except Exception:
+                self._drop_cache()
+                raise
+            self._set_records(data)
+
+    @contextmanager
+    def frozen(self) -> Iterator[tuple[FrozenRows, int]]:
+        # Imagem consistente da coleção: o contêiner se copia sob o lock de leitura (referências ou
+        # colunas) e as linhas são geradas depois; as escritas esperam só pelo yield
+        with self._reading() as records:
+            yield freeze_records(records), self._ids.peek()
+
+    def restore(self, items: Iterable[Any], next_id: int):
+        self.save_data(items)
+        # A sequência nunca volta: ids entregues depois do snapshot não são reaproveitados
+        self._ids.advance(max(next_id, self._seed_next_id()))
+
+    def page_data(self, limit: int, after: int = 0) -> tuple[list[dict[str, Any]], Optional[int]]:
+        with self._reading() as records:
+            start = bisect.bisect_right(self._sorted_ids, after)
+            end = start + limit
+            page_ids = self._sorted_ids[start:end]
+            next_after = page_ids[-1] if end < len(self._sorted_ids) else None
+            return list(records.rows(page_ids)), next_after
+
+    def find(self, record_id: int) -> Optional[Any]:
+        with self._reading() as records:
+            return records.get(record_id)
+
+    # O commit acontece fora do lock de escrita: o líder do lote precisa do lock de leitura para
+    # gravar, e assim outras escritas podem entrar no mesmo lote enquanto esta espera.
+    def insert(self, item: Any):
+        with self._lock.write():
+            ticket = self._submit([self._stage_insert(item)])
+        self._commit(ticket)
+
+    def replace(self, item: Any):
+        with self._lock.write():
+            ticket = self._submit([self._stage_replace(item)])
+        self._commit(ticket)
+
+    def modify(self, record_id: int, fields: Union[dict[str, Any], Callable[[Any], dict[str, Any]]]) -> Optional[Any]:
+        # Ler, copiar e substituir sob o mesmo lock: duas atualizações do mesmo registro não se perdem.
+        # fields pode ser uma função do registro atual (ex.: inverter o status), avaliada sob o lock
+        with self._lock.write():
+            item = self._get_records().get(record_id)
+            if item is None:
+                return None
+            change = self._stage_modify(record_id, fields(item) if callable(fields) else fields)
+            ticket = self._submit([change])
+        self._commit(ticket)
+        return change[1]
+
+    def remove(self, record_id: int) -> Optional[Any]:
+        with self._lock.write():
+            item = self._get_records().get(record_id)
+            if item is None:
+                return None
+            ticket = self._submit([self._stage_remove(record_id)])
+        self._commit(ticket)
+        return item
+
+    # Lotes: cada entrada é indexada pela sua posição na requisição. Entradas inválidas viram
+    # erros (posição, mensagem) sem impedir as demais, e o lote todo é gravado em um único commit.
+    def _insert_many(self, items: dict[int, Any]) -> tuple[list[int], list[tuple[int, str]]]:
+        pending = [item for item in items.values() if item.id == 0]
+        if pending:
+            for item, new_id in zip(pending, self.reserve_ids(len(pending))):
+                item.id = new_id
+        return self._apply_many({position: (self._stage_insert, item) for position, item in items.items()})
+
+    def _modify_many(
+        self, updates: dict[int, tuple[int, dict[str, Any]]], missing: str
+    ) -> tuple[dict[int, Any], list[tuple[int, str]]]:
+        modified: dict[int, Any] = {}
+
+        def stage(position: int) -> Change:
+            record_id, fields = updates[position]
+            if record_id not in self._get_records():
+                raise ValueError(missing)
+            change = self._stage_modify(record_id, fields)
+            modified[position] = change[1]
+            return change
+
+        # Várias atualizações do mesmo registro no lote são aplicadas em sequência
+        applied, errors = self._apply_many({position: (stage, position) for position in updates})
+        return {position: modified[position] for position in applied}, errors
+
+    def _remove_many(self, record_ids: dict[int, int]) -> tuple[list[int], list[tuple[int, str]]]:
+        return self._apply_many({position: (self._stage_remove, item) for position, item in record_ids.items()})
+
+    def _apply_many(
+        self, operations: dict[int, tuple[Callable[[Any], Change], Any]]
+    ) -> tuple[list[int], list[tuple[int, str]]]:
+        applied: list[int] = []
+        errors: list[tuple[int, str]] = []
+        changes: list[Change] = []
+        with self._lock.write():
+            for position, (stage, value) in operations.items():
+                try:
+                    changes.append(stage(value))
+                except ValueError as error:
+                    errors.append((position, str(error)))
+                    continue
+                except Exception:
+                    # As entradas anteriores já estão na memória sem lote: o cache deixa de valer
+                    self._drop_cache()
+                    raise
+                applied.append(position)
+            ticket = self._submit(changes)
+        self._commit(ticket)
+        return applied, errors
+
+    # As operações _stage_* alteram só a memória e os índices, sempre com o lock de escrita, e
+    # as mudanças entram num lote (_submit) antes de o lock ser solto
+    def _stage_insert(self, item: Any) -> Change:
+        records = self._get_records()
+        if item.id in records:
+            raise ValueError(f"Duplicate id: {item.id}")
+        self._check_constraints(item, None)
+        records[item.id] = item
+        if not self._sorted_ids or item.id > self._sorted_ids[-1]:
+            self._sorted_ids.append(item.id)
+        else:
+            bisect.insort(self._sorted_ids, item.id)
+        self._index(item)
+        return "put", item
+
+    def _stage_replace(self, item: Any) -> Change:
+        records = self._get_records()
+        previous = records.get(item.id)
+        if previous is None:
+            raise ValueError(f"Record not found: {item.id}")
+        self._check_constraints(item, previous)
+        self._unindex(previous)
+        records[item.id] = item
+        self._index(item)
+        return "put", item
+
+    def _stage_modify(self, record_id: int, fields: dict[str, Any]) -> Change:
+        return self._stage_replace(self._codec.merge(self._get_records()[record_id], fields))
+
+    def _stage_remove(self, record_id: int) -> Change:
+        item = self._get_records().pop(record_id, None)
+        if item is None:
+            raise ValueError(f"Record not found: {record_id}")
+        del self._sorted_ids[bisect.bisect_left(self._sorted_ids, record_id)]
+        self._unindex(item)
+        return "delete", record_id
+
+    # O lote é escolhido ainda com o lock de escrita (ver CommitPipeline) e a espera pela
+    # gravação acontece depois de soltá-lo
+    def _submit(self, changes: list[Change]) -> Optional[Any]:
+        return self._pipeline.submit(self._records, changes) if changes else None  # type: ignore
+
+    def _commit(self, ticket: Optional[Any]):
+        # Se a gravação falhar o líder já descartou o cache (on_error): o armazenamento volta a
+        # ser a fonte da verdade
+        if ticket is not None:
+            self._pipeline.complete(*ticket)
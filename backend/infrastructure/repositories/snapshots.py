@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import re
+import shutil
+import sqlite3
+from contextlib import ExitStack, closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.repositories.sqlite_repository import (
+    SQLiteRepository,
+    advance_sequences,
+    read_sequences,
+)
+from backend.infrastructure.storage.file_storage import FileStorage, FrozenRows, fsync_path
+from backend.infrastructure.storage.id_allocator import IdAllocator
+from backend.infrastructure.storage.locks import FileLock
+from backend.infrastructure.storage.serializers import load_snapshot
+
+# Criar um logger
+logger = logging.getLogger("snapshots")
+
+MANIFEST_NAME = "manifest.json"
+# Nomes gerados por create(): só letras, dígitos, "-", "_" e "."; nada de caminhos
+SNAPSHOT_NAME = re.compile(r"^[0-9A-Za-z_-][0-9A-Za-z_.-]*$")
+
+Repository = Union[JSONRepository, SQLiteRepository]
+
+
+def read_manifest(snapshot_dir: Path) -> dict[str, Any]:
+    with open(snapshot_dir / MANIFEST_NAME, encoding="utf-8") as f:  # pylint: disable = C0103
+        return json.load(f)
+
+
+def install_snapshot(snapshot_dir: Path, targets: dict[str, Path]):
+    # Restauração offline (CLI e warm start): copia os arquivos do snapshot para o lugar das coleções.
+    # Mais rápido que restaurar pelo repositório, porque nada é decodificado.
+    manifest = read_manifest(snapshot_dir)
+    installed: set[Path] = set()
+    for name, target in targets.items():
+        entry = manifest["collections"].get(name)
+        if entry is None:
+            raise ValueError(f"Collection not in snapshot: {name}")
+        target = Path(target)
+        if target in installed:
+            continue
+        installed.add(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if entry["engine"] == "sqlite":
+            sequences = _database_sequences(target)
+            _install_file(snapshot_dir / entry["file"], target)
+            # Os arquivos -wal/-shm pertencem ao banco antigo
+            for suffix in ("-wal", "-shm"):
+                target.with_name(f"{target.name}{suffix}").unlink(missing_ok=True)
+            with closing(sqlite3.connect(target)) as connection:
+                advance_sequences(connection, sequences)
+            continue
+        with FileLock(target.with_name(f"{target.name}.lock")):
+            _install_file(snapshot_dir / entry["file"], target)
+            # O journal registra mutações sobre o arquivo antigo e não pode ser reaplicado
+            for suffix in (".journal.old", ".journal"):
+                target.with_name(f"{target.name}{suffix}").unlink(missing_ok=True)
+        IdAllocator(path=target.with_name(f"{target.name}.seq")).advance(entry["next_id"])
+    logger.info(f"Snapshot installed from: {snapshot_dir}")
+
+
+def _database_sequences(path: Path) -> dict[str, int]:
+    # AUTOINCREMENT do banco que será substituído (lido antes, com o WAL ainda aplicado)
+    if not path.exists():
+        return {}
+    with closing(sqlite3.connect(path)) as connection:
+        return read_sequences(connection)
+
+
+def _install_file(source: Path, target: Path):
+    temp_path = target.with_name(f".{target.name}.restore")
+    shutil.copyfile(source, temp_path)
+    with open(temp_path, "rb") as f:  # pylint: disable = C0103
+        os.fsync(f.fileno())
+    os.replace(temp_path, target)
+    fsync_path(target.parent)
+
+
+# Snapshots ficam em <directory>/<nome>/, com um arquivo por coleção e um manifest.json.
+# O diretório é escrito como .<nome>.tmp e renomeado no final: um snapshot visível está completo.
+@dataclass
+class SnapshotStore:
+    directory: Path
+    repositories: dict[str, Repository]
+
+    def create(self, name: Optional[str] = None) -> dict[str, Any]:
+        name = name or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        final_dir = self._path(name)
+        if final_dir.exists():
+            raise ValueError(f"Snapshot already exists: {name}")
+        temp_dir = self.directory / f".{name}.tmp"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir(parents=True)
+        try:
+            collections = self._write_collections(temp_dir)
+            manifest = {
+                "name": name,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "collections": collections,
+            }
+            with open(temp_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:  # pylint: disable = C0103
+                json.dump(manifest, f)
+                f.flush()
+                os.fsync(f.fileno())
+            fsync_path(temp_dir)
+            os.rename(temp_dir, final_dir)
+            fsync_path(self.directory)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        logger.info(f"Snapshot created: {final_dir}")
+        return manifest
+
+    def manifests(self) -> list[dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        manifests = []
+        for path in sorted(self.directory.iterdir()):
+            if path.name.startswith(".") or not (path / MANIFEST_NAME).exists():
+                continue
+            manifests.append(read_manifest(path))
+        return manifests
+
+    def get(self, name: str) -> dict[str, Any]:
+        path = self._path(name)
+        if not (path / MANIFEST_NAME).exists():
+            raise ValueError(f"Snapshot not found: {name}")
+        return read_manifest(path)
+
+    def restore(self, name: str) -> dict[str, Any]:
+        # Restauração online: os repositórios trocam o conteúdo em memória e em disco, sem reiniciar
+        manifest = self.get(name)
+        path = self._path(name)
+        missing = [collection for collection in self.repositories if collection not in manifest["collections"]]
+        if missing:
+            raise ValueError(f"Collection not in snapshot: {', '.join(missing)}")
+        # Todas as coleções são lidas e validadas antes de qualquer uma ser substituída
+        loaded: dict[str, list[Any]] = {}
+        for collection, repository in self.repositories.items():
+            entry = manifest["collections"][collection]
+            if isinstance(repository, JSONRepository):
+                with open(path / entry["file"], "rb") as f:  # pylint: disable = C0103
+                    loaded[collection] = repository.decode(load_snapshot(f))
+        restored: set[Path] = set()
+        for collection, repository in self.repositories.items():
+            entry = manifest["collections"][collection]
+            if isinstance(repository, JSONRepository):
+                repository.restore(loaded[collection], entry["next_id"])
+            elif repository.path not in restored:
+                repository.restore(path / entry["file"])
+                restored.add(repository.path)
+        logger.info(f"Snapshot restored: {name}")
+        return manifest
+
+    def _path(self, name: str) -> Path:
+        if not isinstance(name, str) or not SNAPSHOT_NAME.match(name):
+            raise ValueError(f"Invalid snapshot name: {name}")
+        return self.directory / name
+
+    def _write_collections(self, temp_dir: Path) -> dict[str, Any]:
+        collections: dict[str, Any] = {}
+        frozen: dict[str, tuple[JSONRepository, FrozenRows, int]] = {}
+        # Os locks de leitura de todas as coleções JSON são segurados juntos (sempre na mesma ordem)
+        # só pelo tempo de copiar as coleções: a imagem é do mesmo instante e a gravação em disco
+        # acontece depois, sem bloquear as escritas
+        with ExitStack() as stack:
+            for collection in sorted(self.repositories):
+                repository = self.repositories[collection]
+                if isinstance(repository, JSONRepository):
+                    items, next_id = stack.enter_context(repository.frozen())
+                    frozen[collection] = (repository, items, next_id)
+        for collection, (repository, items, next_id) in frozen.items():
+            file_name = f"{collection}.json"
+            FileStorage(path=temp_dir / file_name, serializer=repository.serializer).replace(items, sync=True)
+            collections[collection] = {"engine": "json", "file": file_name, "records": len(items), "next_id": next_id}
+        backups: dict[Path, str] = {}
+        for collection, repository in self.repositories.items():
+            if not isinstance(repository, SQLiteRepository):
+                continue
+            # Coleções no mesmo banco compartilham um único backup, consistente entre as tabelas
+            if repository.path not in backups:
+                backups[repository.path] = repository.path.name
+                repository.backup(temp_dir / repository.path.name)
+            collections[collection] = {"engine": "sqlite", "file": backups[repository.path]}
+        for lock_file in temp_dir.glob("*.lock"):
+            lock_file.unlink()
+        return collections
@@ -0,0 +1,289 @@
+import logging
+import sqlite3
+from typing import Any, Iterator, List, Optional
+
+from pydantic import ValidationError  # pylint: disable = E0401  # type: ignore
+
+from backend.application.services.book_query import BookQuery
+from backend.application.services.codec import BOOK_CODEC
+from backend.application.services.pagination import page
+from backend.application.services.search import tokenize
+from backend.application.services.stats import book_stats
+from backend.domain.entities.book import Book
+from backend.infrastructure.repositories.sqlite_repository import SQLiteRepository
+
+# Criar um logger
+logger = logging.getLogger("sqlite_book_repository")
+
+BOOK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    status INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS books_user_id ON books (user_id);
+CREATE INDEX IF NOT EXISTS books_status ON books (status);
+"""
+
+# Índice de texto (FTS5) sobre os títulos, mantido pelos triggers; remove_diacritics ignora acentos
+BOOK_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE books_fts USING fts5 (
+    title, content = 'books', content_rowid = 'id', tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER books_fts_insert AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER books_fts_delete AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER books_fts_update AFTER UPDATE OF title ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO books_fts (rowid, title) VALUES (new.id, new.title);
+END;
+"""
+
+# Contagens por usuário (livros, lidos) para GET /stats, mantidas pelos triggers a cada escrita
+BOOK_STATS_SCHEMA = """
+CREATE TABLE book_stats (
+    user_id INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL,
+    read INTEGER NOT NULL
+);
+CREATE TRIGGER book_stats_insert AFTER INSERT ON books BEGIN
+    INSERT INTO book_stats (user_id, total, read) VALUES (new.user_id, 1, new.status != 0)
+    ON CONFLICT (user_id) DO UPDATE SET total = total + 1, read = read + excluded.read;
+END;
+CREATE TRIGGER book_stats_delete AFTER DELETE ON books BEGIN
+    UPDATE book_stats SET total = total - 1, read = read - (old.status != 0) WHERE user_id = old.user_id;
+    DELETE FROM book_stats WHERE user_id = old.user_id AND total = 0;
+END;
+CREATE TRIGGER book_stats_update AFTER UPDATE OF user_id, status ON books BEGIN
+    UPDATE book_stats SET total = total - 1, read = read - (old.status != 0) WHERE user_id = old.user_id;
+    DELETE FROM book_stats WHERE user_id = old.user_id AND total = 0;
+    INSERT INTO book_stats (user_id, total, read) VALUES (new.user_id, 1, new.status != 0)
+    ON CONFLICT (user_id) DO UPDATE SET total = total + 1, read = read + excluded.read;
+END;
+"""
+
+SELECT_BOOKS = "SELECT id, title, user_id, status FROM books"
+
+
+def row_to_book(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["id"], "title": row["title"], "user_id": row["user_id"], "status": bool(row["status"])}
+
+
+def book_query_sql(query: BookQuery, after: int = 0) -> tuple[str, list[Any]]:
+    # A escolha do índice fica com o planejador do SQLite
+    clauses: list[str] = []
+    params: list[Any] = []
+    if query.status is not None:
+        clauses.append("status = ?")
+        params.append(int(query.status))
+    if query.user_id is not None:
+        clauses.append("user_id = ?")
+        params.append(query.user_id)
+    if query.title_prefix is not None:
+        # substr em vez de LIKE: o prefixo é comparado sem curingas e com maiúsculas/minúsculas
+        clauses.append("substr(title, 1, ?) = ?")
+        params.extend((len(query.title_prefix), query.title_prefix))
+    if after:
+        clauses.append("id < ?" if query.descending else "id > ?")
+        params.append(after)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"{SELECT_BOOKS}{where} ORDER BY id{' DESC' if query.descending else ''}", params
+
+
+class SQLiteBookRepository(SQLiteRepository):
+    def __init__(self, dsn: str):
+        logger.debug(f"Initializing SQLiteBookRepository with dsn: {dsn}")
+        super().__init__(dsn=dsn, schema=BOOK_SCHEMA)
+        with self._connection() as connection:
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'books_fts'").fetchone() is None:
+                connection.executescript(BOOK_SEARCH_SCHEMA)
+                # Indexa os livros que já existiam antes da busca
+                connection.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'book_stats'").fetchone() is None:
+                connection.executescript(BOOK_STATS_SCHEMA)
+                connection.execute(
+                    "INSERT INTO book_stats (user_id, total, read) "
+                    "SELECT user_id, COUNT(*), SUM(status != 0) FROM books GROUP BY user_id"
+                )
+
+    def add(self, item: Book) -> dict[str, Any]:
+        try:
+            logger.debug(f"Adding book: {item}")
+            model = BOOK_CODEC.from_entity(item)
+            with self._connection() as connection:
+                cursor = connection.execute(
+                    "INSERT INTO books (id, title, user_id, status) VALUES (?, ?, ?, ?)",
+                    (model.id or None, model.title, model.user_id, model.status),
+                )
+            item.id = cursor.lastrowid  # type: ignore
+            book = {**BOOK_CODEC.to_dict(model), "id": item.id}
+            logger.info(f"book added: {book}")
+            return book
+        except ValidationError as error:
+            logger.error(f"Validation error: {error}")
+            raise ValueError(f"Invalid book data: {error}")  # pylint: disable = W0707
+
+    def get_all(self) -> List[dict[str, Any]]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[dict[str, Any]]:
+        for row in self._iter_rows(f"{SELECT_BOOKS} ORDER BY id"):
+            yield row_to_book(row)
+
+    def get_page(self, limit: int, after: int = 0) -> dict[str, Any]:
+        rows = self._fetch_all(f"{SELECT_BOOKS} WHERE id > ? ORDER BY id LIMIT ?", (after, limit + 1))
+        items = [row_to_book(row) for row in rows[:limit]]
+        return page(items, items[-1]["id"] if len(rows) > limit else None)
+
+    def query(self, query: BookQuery) -> Iterator[dict[str, Any]]:
+        sql, params = book_query_sql(query)
+        return (row_to_book(row) for row in self._iter_rows(sql, tuple(params)))
+
+    def query_page(self, query: BookQuery, limit: int, after: int = 0) -> dict[str, Any]:
+        sql, params = book_query_sql(query, after)
+        rows = self._fetch_all(f"{sql} LIMIT ?", (*params, limit + 1))
+        items = [row_to_book(row) for row in rows[:limit]]
+        next_after: Optional[int] = items[-1]["id"] if len(rows) > limit else None
+        return page(items, next_after)
+
+    def search(self, text: str, limit: int) -> List[dict[str, Any]]:
+        logger.debug(f"Searching books: {text}")
+        # Todo termo é um prefixo ("admir"*), e todos precisam casar
+        match = " ".join(f'"{term}"*' for term in tokenize(text))
+        rows = self._fetch_all(
+            "SELECT books.id, books.title, books.user_id, books.status FROM books_fts "
+            "JOIN books ON books.id = books_fts.rowid WHERE books_fts MATCH ? ORDER BY rank, books.id LIMIT ?",
+            (match, limit),
+        )
+        return [row_to_book(row) for row in rows]
+
+    def stats(self) -> dict[str, Any]:
+        # Uma consulta só: os totais saem das mesmas linhas, no mesmo instante
+        per_user = [
+            tuple(row) for row in self._fetch_all("SELECT user_id, total, read FROM book_stats ORDER BY user_id")
+        ]
+        return book_stats(sum(row[1] for row in per_user), sum(row[2] for row in per_user), per_user)
+
+    def get_by_id(self, book_id: int) -> dict[str, Any]:
+        logger.debug(f"Fetching book by ID: {book_id}")
+        row = self._fetch_one(f"{SELECT_BOOKS} WHERE id = ?", (book_id,))
+        if row is not None:
+            book = row_to_book(row)
+            logger.info(f"Book found: {book}")
+            return book
+        logger.warning(f"Book not found: {book_id}")
+        raise ValueError("Book not found")
+
+    def get_by_user_id(self, user_id: int) -> list[dict[str, Any]]:
+        logger.debug(f"Fetching books by user ID: {user_id}")
+        books = [
+            row_to_book(row) for row in self._fetch_all(f"{SELECT_BOOKS} WHERE user_id = ? ORDER BY id", (user_id,))
+        ]
+        if books:  # pylint: disable = R1705
+            return books
+        else:
+            logger.warning(f"No books found for user ID: {user_id}")
+            raise ValueError("No books found for the given user ID")
+
+    def update(self, book_id: int, updated_book_data: dict[str, Any]) -> dict[str, Any]:
+        logger.debug(f"Updating book: {updated_book_data}")
+        with self._write_transaction() as connection:
+            book = self._update_row(connection, book_id, updated_book_data)
+        if book is not None:
+            logger.info(f"Book updated: {book}")
+            return book
+
+        logger.warning(f"Book not found for update: {book_id}")
+        raise ValueError("Book not found")
+
+    def toggle_status(self, book_id: int) -> dict[str, Any]:
+        logger.debug(f"Toggling status of book: {book_id}")
+        with self._write_transaction() as connection:
+            # Uma única instrução: o status invertido é o do momento da escrita
+            connection.execute("UPDATE books SET status = NOT status WHERE id = ?", (book_id,))
+            row = connection.execute(f"{SELECT_BOOKS} WHERE id = ?", (book_id,)).fetchone()
+        if row is not None:
+            book = row_to_book(row)
+            logger.info(f"Book status toggled: {book}")
+            return book
+
+        logger.warning(f"Book not found for update: {book_id}")
+        raise ValueError("Book not found")
+
+    def _update_row(
+        self, connection: sqlite3.Connection, book_id: int, updated_book_data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        row = connection.execute(f"{SELECT_BOOKS} WHERE id = ?", (book_id,)).fetchone()
+        if row is None:
+            return None
+        item = BOOK_CODEC.merge(BOOK_CODEC.validate(row_to_book(row)), updated_book_data)
+        connection.execute(
+            "UPDATE books SET title = ?, user_id = ?, status = ? WHERE id = ?",
+            (item.title, item.user_id, item.status, item.id),
+        )
+        return BOOK_CODEC.to_dict(item)
+
+    def add_many(self, items: List[Book]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Adding {len(items)} books")
+        created: List[dict[str, Any]] = []
+        models, invalid = BOOK_CODEC.from_entities(items)
+        errors = [(position, f"Invalid book data: {error}") for position, error in invalid]
+        with self._connection() as connection:
+            for position, model in models.items():
+                # Uma linha que viola a tabela (ex.: id explícito já usado) falha sozinha: o SQLite
+                # desfaz só o comando, com os triggers, e o resto do lote segue
+                try:
+                    cursor = connection.execute(
+                        "INSERT INTO books (id, title, user_id, status) VALUES (?, ?, ?, ?)",
+                        (model.id or None, model.title, model.user_id, model.status),
+                    )
+                except sqlite3.IntegrityError as error:
+                    errors.append((position, f"Invalid book data: {error}"))
+                    continue
+                created.append({**BOOK_CODEC.to_dict(model), "id": cursor.lastrowid})
+        logger.info(f"{len(created)} books added")
+        return created, sorted(errors)
+
+    def update_many(self, updates: List[dict[str, Any]]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Updating {len(updates)} books")
+        updated: List[dict[str, Any]] = []
+        errors: List[tuple[int, str]] = []
+        with self._write_transaction() as connection:
+            for position, updated_book_data in enumerate(updates):
+                fields = dict(updated_book_data)
+                try:
+                    book = self._update_row(connection, fields.pop("id", 0), fields)
+                except ValueError as error:
+                    errors.append((position, str(error)))
+                    continue
+                if book is None:
+                    errors.append((position, "Book not found"))
+                else:
+                    updated.append(book)
+        logger.info(f"{len(updated)} books updated")
+        return updated, errors
+
+    def delete_many(self, book_ids: List[int]) -> tuple[List[int], List[tuple[int, str]]]:
+        logger.debug(f"Deleting books by ID: {book_ids}")
+        deleted: List[int] = []
+        errors: List[tuple[int, str]] = []
+        with self._connection() as connection:
+            for position, book_id in enumerate(book_ids):
+                if connection.execute("DELETE FROM books WHERE id = ?", (book_id,)).rowcount:
+                    deleted.append(book_id)
+                else:
+                    errors.append((position, "Book not found"))
+        return deleted, errors
+
+    def delete(self, book_id: int) -> List[dict[str, Any]]:
+        logger.debug(f"Deleting book by ID: {book_id}")
+        with self._connection() as connection:
+            deleted = connection.execute("DELETE FROM books WHERE id = ?", (book_id,)).rowcount
+        if deleted:
+            return self.get_all()
+        logger.warning(f"Book not found for deletion: {book_id}")
+        raise ValueError("Book not found")
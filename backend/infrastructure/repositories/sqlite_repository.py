@@ -0,0 +1,129 @@
+import logging
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+# Criar um logger
+logger = logging.getLogger("sqlite_repository")
+
+SQLITE_SCHEME = "sqlite:///"
+
+
+def is_sqlite_url(url: str) -> bool:
+    return str(url).startswith(SQLITE_SCHEME)
+
+
+def sqlite_path(url: str) -> Path:
+    # sqlite:///database/saiph.db -> database/saiph.db, sqlite:////var/saiph.db -> /var/saiph.db
+    return Path(url.removeprefix(SQLITE_SCHEME))
+
+
+def read_sequences(connection: sqlite3.Connection) -> dict[str, int]:
+    return dict(connection.execute("SELECT name, seq FROM sqlite_sequence").fetchall())
+
+
+def advance_sequences(connection: sqlite3.Connection, sequences: dict[str, int]):
+    # Como na coleção JSON, o AUTOINCREMENT não volta: ids entregues depois do snapshot não se repetem
+    with connection:
+        for name, seq in sequences.items():
+            cursor = connection.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, name))
+            if cursor.rowcount == 0:
+                connection.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, seq))
+
+
+# Conexão de uma thread, guardada no threading.local. Quando a thread termina o local é
+# descartado, o holder é coletado e o finalize fecha a conexão: o motor "threading" cria uma
+# thread por conexão HTTP, e sem isso cada uma deixaria uma conexão (e seus descritores) aberta
+class ConnectionHolder:
+    __slots__ = ("connection", "close", "__weakref__")
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.close = weakref.finalize(self, connection.close)
+
+
+@dataclass
+class SQLiteRepository:
+    dsn: str
+    schema: str = ""
+    _path: Path = field(init=False)
+    # Pool com uma conexão por thread: conexões sqlite3 não podem ser compartilhadas entre threads
+    _local: threading.local = field(init=False, default_factory=threading.local)
+    # Só referências fracas: o pool não segura a conexão de uma thread que já terminou
+    _holders: weakref.WeakSet = field(init=False, default_factory=weakref.WeakSet)
+    _pool_lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self):
+        self._path = sqlite_path(self.dsn)
+        logger.debug(f"Initializing SQLiteRepository with path: {self._path}")
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(self.schema)
+
+    def _connection(self) -> sqlite3.Connection:
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            # check_same_thread=False para que close() e o finalize (que pode rodar em outra
+            # thread) possam fechar a conexão
+            connection = sqlite3.connect(self._path, timeout=30, cached_statements=256, check_same_thread=False)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            holder = self._local.holder = ConnectionHolder(connection)
+            with self._pool_lock:
+                self._holders.add(holder)
+            logger.debug(f"Opened SQLite connection to: {self._path}")
+        return holder.connection
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE pega o lock de escrita do banco antes das leituras: um ler-mesclar-gravar
+        # (PATCH) não se intercala com outro, e nenhum sobrescreve o campo que o outro mudou
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        with connection:
+            yield connection
+
+    def _fetch_one(self, query: str, params: tuple[Any, ...] = ()) -> sqlite3.Row | None:
+        return self._connection().execute(query, params).fetchone()
+
+    def _fetch_all(self, query: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        return self._connection().execute(query, params).fetchall()
+
+    def _iter_rows(self, query: str, params: tuple[Any, ...] = (), batch_size: int = 500) -> Iterator[sqlite3.Row]:
+        cursor = self._connection().execute(query, params)
+        while rows := cursor.fetchmany(batch_size):
+            yield from rows
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def backup(self, target: Path):
+        # A API de backup copia o banco página a página em uma transação de leitura: as escritas
+        # continuam (WAL) e a cópia representa um único instante de todas as tabelas do arquivo
+        with sqlite3.connect(target) as destination:
+            self._connection().backup(destination)
+        destination.close()
+        logger.info(f"Database backed up to: {target}")
+
+    def restore(self, source: Path):
+        connection = self._connection()
+        sequences = read_sequences(connection)
+        with sqlite3.connect(source) as origin:
+            origin.backup(connection)
+        origin.close()
+        advance_sequences(connection, sequences)
+        logger.info(f"Database restored from: {source}")
+
+    def close(self):
+        with self._pool_lock:
+            holders = list(self._holders)
+            self._holders.clear()
+        for holder in holders:
+            holder.close()
+        self._local = threading.local()
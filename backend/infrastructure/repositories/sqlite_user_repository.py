@@ -0,0 +1,233 @@
+import logging
+import sqlite3
+from typing import Any, Iterator, List
+
+from pydantic import ValidationError  # pylint: disable = E0401  # type: ignore
+
+from backend.application.services.codec import USER_CODEC
+from backend.application.services.pagination import page
+from backend.application.services.stats import AGE_BUCKET_SIZE, user_stats
+from backend.domain.entities.user import User
+from backend.infrastructure.repositories.sqlite_repository import SQLiteRepository
+from backend.infrastructure.repositories.user_repository import normalize_email
+
+# Criar um logger
+logger = logging.getLogger("sqlite_user_repository")
+
+USER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    email_key TEXT NOT NULL,
+    password TEXT NOT NULL,
+    age INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS users_email_key ON users (email_key);
+"""
+
+
+def age_bucket_sql(column: str) -> str:
+    # O mesmo que age_bucket(): a divisão entre inteiros do SQLite trunca, e a idade nunca é negativa aqui
+    return f"max({column}, 0) / {AGE_BUCKET_SIZE} * {AGE_BUCKET_SIZE}"
+
+
+# Usuários por faixa de idade para GET /stats, mantidos pelos triggers a cada escrita
+USER_STATS_SCHEMA = f"""
+CREATE TABLE user_age_stats (
+    bucket INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL
+);
+CREATE TRIGGER user_age_stats_insert AFTER INSERT ON users BEGIN
+    INSERT INTO user_age_stats (bucket, total) VALUES ({age_bucket_sql("new.age")}, 1)
+    ON CONFLICT (bucket) DO UPDATE SET total = total + 1;
+END;
+CREATE TRIGGER user_age_stats_delete AFTER DELETE ON users BEGIN
+    UPDATE user_age_stats SET total = total - 1 WHERE bucket = {age_bucket_sql("old.age")};
+    DELETE FROM user_age_stats WHERE total = 0;
+END;
+CREATE TRIGGER user_age_stats_update AFTER UPDATE OF age ON users BEGIN
+    UPDATE user_age_stats SET total = total - 1 WHERE bucket = {age_bucket_sql("old.age")};
+    DELETE FROM user_age_stats WHERE total = 0;
+    INSERT INTO user_age_stats (bucket, total) VALUES ({age_bucket_sql("new.age")}, 1)
+    ON CONFLICT (bucket) DO UPDATE SET total = total + 1;
+END;
+"""
+
+SELECT_USERS = "SELECT id, name, email, password, age FROM users"
+
+
+def row_to_user(row: sqlite3.Row) -> dict[str, Any]:
+    return {"id": row["id"], "name": row["name"], "email": row["email"], "password": row["password"], "age": row["age"]}
+
+
+class SQLiteUserRepository(SQLiteRepository):
+    def __init__(self, dsn: str):
+        logger.debug(f"Initializing SQLiteUserRepository with dsn: {dsn}")
+        super().__init__(dsn=dsn, schema=USER_SCHEMA)
+        with self._connection() as connection:
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'user_age_stats'").fetchone() is None:
+                connection.executescript(USER_STATS_SCHEMA)
+                connection.execute(
+                    "INSERT INTO user_age_stats (bucket, total) "
+                    f"SELECT {age_bucket_sql('age')} AS bucket, COUNT(*) FROM users GROUP BY bucket"
+                )
+
+    def add(self, item: User) -> dict[str, Any]:
+        try:
+            logger.debug(f"Adding user: {item}")
+            model = USER_CODEC.from_entity(item)
+            with self._connection() as connection:
+                cursor = connection.execute(
+                    "INSERT INTO users (id, name, email, email_key, password, age) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        model.id or None,
+                        model.name,
+                        model.email,
+                        normalize_email(model.email),
+                        model.password,
+                        model.age,
+                    ),
+                )
+            item.id = cursor.lastrowid  # type: ignore
+            user = {**USER_CODEC.to_dict(model), "id": item.id}
+            logger.info(f"User added: {user}")
+            return user
+        except ValidationError as error:
+            logger.error(f"Validation error: {error}")
+            raise ValueError(f"Invalid user data: {error}")  # pylint: disable = W0707
+        except sqlite3.IntegrityError:
+            logger.warning(f"Email already registered: {item.email}")
+            raise ValueError("Email already registered")  # pylint: disable = W0707
+
+    def get_all(self) -> List[dict[str, Any]]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[dict[str, Any]]:
+        for row in self._iter_rows(f"{SELECT_USERS} ORDER BY id"):
+            yield row_to_user(row)
+
+    def get_page(self, limit: int, after: int = 0) -> dict[str, Any]:
+        rows = self._fetch_all(f"{SELECT_USERS} WHERE id > ? ORDER BY id LIMIT ?", (after, limit + 1))
+        items = [row_to_user(row) for row in rows[:limit]]
+        return page(items, items[-1]["id"] if len(rows) > limit else None)
+
+    def stats(self) -> dict[str, Any]:
+        ages = [tuple(row) for row in self._fetch_all("SELECT bucket, total FROM user_age_stats ORDER BY bucket")]
+        return user_stats(sum(row[1] for row in ages), ages)
+
+    def get_by_id(self, user_id: int) -> dict[str, Any]:
+        logger.debug(f"Fetching user by ID: {user_id}")
+        row = self._fetch_one(f"{SELECT_USERS} WHERE id = ?", (user_id,))
+        if row is not None:
+            user = row_to_user(row)
+            logger.info(f"User found: {user}")
+            return user
+        logger.warning(f"User not found: {user_id}")
+        raise ValueError("User not found")
+
+    def get_by_email(self, email: str):
+        row = self._fetch_one(f"{SELECT_USERS} WHERE email_key = ?", (normalize_email(email),))
+        if row is None:
+            return None
+        return row_to_user(row)
+
+    def validate_user(self, email: str, password: str):
+        user_data = self.get_by_email(email)
+        if user_data and user_data["password"] == password:
+            return user_data
+        return None
+
+    def update(self, user_id: int, updated_user_data: dict[str, Any]) -> dict[str, Any]:
+        logger.debug(f"Updating user: {updated_user_data}")
+        with self._write_transaction() as connection:
+            user = self._update_row(connection, user_id, updated_user_data)
+        if user is not None:
+            logger.info(f"User updated: {user}")
+            return user
+
+        logger.warning(f"User not found for update: {user_id}")
+        raise ValueError("User not found")
+
+    def _update_row(
+        self, connection: sqlite3.Connection, user_id: int, updated_user_data: dict[str, Any]
+    ) -> dict[str, Any] | None:
+        row = connection.execute(f"{SELECT_USERS} WHERE id = ?", (user_id,)).fetchone()
+        if row is None:
+            return None
+        item = USER_CODEC.merge(USER_CODEC.validate(row_to_user(row)), updated_user_data)
+        try:
+            connection.execute(
+                "UPDATE users SET name = ?, email = ?, email_key = ?, password = ?, age = ? WHERE id = ?",
+                (item.name, item.email, normalize_email(item.email), item.password, item.age, item.id),
+            )
+        except sqlite3.IntegrityError:
+            logger.warning(f"Email already registered: {item.email}")
+            raise ValueError("Email already registered")  # pylint: disable = W0707
+        return USER_CODEC.to_dict(item)
+
+    def add_many(self, items: List[User]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Adding {len(items)} users")
+        created: List[dict[str, Any]] = []
+        models, invalid = USER_CODEC.from_entities(items)
+        errors = [(position, f"Invalid user data: {error}") for position, error in invalid]
+        with self._connection() as connection:
+            for position, model in models.items():
+                try:
+                    cursor = connection.execute(
+                        "INSERT INTO users (id, name, email, email_key, password, age) VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            model.id or None,
+                            model.name,
+                            model.email,
+                            normalize_email(model.email),
+                            model.password,
+                            model.age,
+                        ),
+                    )
+                except sqlite3.IntegrityError:
+                    errors.append((position, "Email already registered"))
+                    continue
+                created.append({**USER_CODEC.to_dict(model), "id": cursor.lastrowid})
+        logger.info(f"{len(created)} users added")
+        return created, sorted(errors)
+
+    def update_many(self, updates: List[dict[str, Any]]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Updating {len(updates)} users")
+        updated: List[dict[str, Any]] = []
+        errors: List[tuple[int, str]] = []
+        with self._write_transaction() as connection:
+            for position, updated_user_data in enumerate(updates):
+                fields = dict(updated_user_data)
+                try:
+                    user = self._update_row(connection, fields.pop("id", 0), fields)
+                except ValueError as error:
+                    errors.append((position, str(error)))
+                    continue
+                if user is None:
+                    errors.append((position, "User not found"))
+                else:
+                    updated.append(user)
+        logger.info(f"{len(updated)} users updated")
+        return updated, errors
+
+    def delete_many(self, user_ids: List[int]) -> tuple[List[int], List[tuple[int, str]]]:
+        logger.debug(f"Deleting users by ID: {user_ids}")
+        deleted: List[int] = []
+        errors: List[tuple[int, str]] = []
+        with self._connection() as connection:
+            for position, user_id in enumerate(user_ids):
+                if connection.execute("DELETE FROM users WHERE id = ?", (user_id,)).rowcount:
+                    deleted.append(user_id)
+                else:
+                    errors.append((position, "User not found"))
+        return deleted, errors
+
+    def delete(self, user_id: int) -> List[dict[str, Any]]:
+        logger.debug(f"Deleting user by ID: {user_id}")
+        with self._connection() as connection:
+            deleted = connection.execute("DELETE FROM users WHERE id = ?", (user_id,)).rowcount
+        if deleted:
+            return self.get_all()
+        logger.warning(f"User not found for deletion: {user_id}")
+        raise ValueError("User not found")
@@ -0,0 +1,141 @@
+import bisect
+import heapq
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+from backend.application.services.search import tokenize
+
+# Cada entrada de uma lista de postings é (tamanho do título << ID_BITS) | id: ordenar os
+# inteiros ordena por título mais curto e depois por id, que é a ordem do ranking
+ID_BITS = 40
+ID_MASK = (1 << ID_BITS) - 1
+
+# Candidatos do termo mais seletivo conferidos um a um antes de partir para a interseção de conjuntos
+STREAM_LIMIT = 1024
+
+
+def posting(book_id: int, title: str) -> int:
+    return (len(title) << ID_BITS) | book_id
+
+
+# Índice invertido: token (sem acento, minúsculo) -> postings dos livros cujo título o contém.
+# Os tokens também ficam em uma lista ordenada, onde os que começam com um prefixo são vizinhos.
+@dataclass
+class TitleIndex:
+    # Postings em array('q'): 8 bytes por entrada em vez de um int do Python e sua referência
+    compact: bool = False
+    _postings: dict[str, Any] = field(default_factory=dict)
+    _vocabulary: list[str] = field(default_factory=list)
+    # Durante a carga completa as listas só recebem append; ordenar tudo uma vez no primeiro
+    # uso sai mais barato que inserir um a um
+    _loading: bool = True
+
+    def add(self, book_id: int, title: str):
+        entry = posting(book_id, title)
+        for token in set(tokenize(title)):
+            entries = self._postings.get(token)
+            if entries is None:
+                entries = self._postings[token] = array("q") if self.compact else []
+                if not self._loading:
+                    bisect.insort(self._vocabulary, token)
+            if self._loading or not entries or entry > entries[-1]:
+                entries.append(entry)
+            else:
+                bisect.insort(entries, entry)
+
+    def remove(self, book_id: int, title: str):
+        self._seal()
+        entry = posting(book_id, title)
+        for token in set(tokenize(title)):
+            entries = self._postings.get(token)
+            if entries is None:
+                continue
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+            if not entries:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def search(self, text: str, limit: int) -> list[int]:
+        # Todo termo é um prefixo e todos precisam casar. Ranking: mais termos casando com uma
+        # palavra inteira do título, depois títulos mais curtos, depois id.
+        self._seal()
+        terms = list(dict.fromkeys(tokenize(text)))
+        expansions = {term: self._expand(term) for term in terms}
+        if not terms or not all(expansions.values()):
+            return []
+        sizes = {term: sum(len(self._postings[token]) for token in expansions[term]) for term in terms}
+        driver, *others = sorted(terms, key=sizes.__getitem__)
+        # Primeiro percorre os candidatos do termo mais seletivo, já na ordem (tamanho, id),
+        # conferindo os demais termos por busca binária nas listas deles
+        entries = heapq.merge(*(self._postings[token] for token in expansions[driver]))
+        ranked = self._rank(entries, terms, others, expansions, limit, STREAM_LIMIT if others else None)
+        if ranked is None:
+            # Termos comuns que raramente aparecem juntos: intersectar os conjuntos sai mais barato
+            matched = set().union(*(self._postings[token] for token in expansions[driver]))
+            for term in others:
+                matched.intersection_update(set().union(*(self._postings[token] for token in expansions[term])))
+            ranked = self._rank(iter(sorted(matched)), terms, [], expansions, limit, None)
+        return ranked  # type: ignore
+
+    def _rank(
+        self,
+        entries: Iterator[int],
+        terms: list[str],
+        others: list[str],
+        expansions: dict[str, list[str]],
+        limit: int,
+        budget: Optional[int],
+    ) -> Optional[list[int]]:
+        # Nenhum candidato pode ter mais palavras inteiras que os termos que existem como token
+        whole_words = [term for term in terms if term in self._postings]
+        ranked: list[tuple[int, int]] = []
+        complete = 0
+        previous = None
+        for examined, entry in enumerate(entries):
+            if budget is not None and examined >= budget:
+                return None
+            if entry == previous:
+                continue
+            previous = entry
+            if not all(self._contains(expansions[term], entry) for term in others):
+                continue
+            exact = sum(self._contains([term], entry) for term in whole_words)
+            ranked.append((-exact, entry))
+            if exact == len(whole_words):
+                # Os próximos não têm mais palavras inteiras e vêm depois na ordem (tamanho, id)
+                complete += 1
+                if complete == limit:
+                    break
+        return [entry & ID_MASK for _, entry in heapq.nsmallest(limit, ranked)]
+
+    def _contains(self, tokens: list[str], entry: int) -> bool:
+        for token in tokens:
+            entries = self._postings[token]
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                return True
+        return False
+
+    def _seal(self):
+        if not self._loading:
+            return
+        # Buscas concorrentes (lock de leitura) podem chegar aqui juntas: as listas ordenadas são
+        # montadas à parte e trocadas de uma vez, antes de _loading deixar de valer
+        if self.compact:
+            self._postings = {token: array("q", sorted(entries)) for token, entries in self._postings.items()}
+        else:
+            self._postings = {token: sorted(entries) for token, entries in self._postings.items()}
+        self._vocabulary = sorted(self._postings)
+        self._loading = False
+
+    def _expand(self, prefix: str) -> list[str]:
+        vocabulary = self._vocabulary
+        tokens = []
+        for position in range(bisect.bisect_left(vocabulary, prefix), len(vocabulary)):
+            if not vocabulary[position].startswith(prefix):
+                break
+            tokens.append(vocabulary[position])
+        return tokens
@@ -1,70 +1,107 @@
 import logging
-from dataclasses import asdict
-from typing import Any, List
+from typing import Any, Iterator, List, Optional
 
 from pydantic import ValidationError  # pylint: disable = E0401  # type: ignore
 
-from backend.application.services.user_schema import pydantic_to_user, user_to_pydantic
+from backend.application.services.codec import USER_CODEC
+from backend.application.services.pagination import page
+from backend.application.services.stats import age_bucket, user_stats
 from backend.domain.entities.user import User, UserModel
+from backend.infrastructure.repositories.counters import GroupCounts
 from backend.infrastructure.repositories.json_repository import JSONRepository
 
 # Criar um logger
 logger = logging.getLogger("user_repository")
 
 
+def normalize_email(email: str) -> str:
+    return email.strip().casefold()
+
+
 class UserRepository(JSONRepository):
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, **options: Any):
         logger.debug(f"Initializing UserRepository with db_path: {db_path}")
-        super().__init__(db_path=db_path, model=UserModel)
-
-    def _get_next_id(self):
-        data = self.load_data()
-        if not data:
-            return 1
-        max_id = max(user.id for user in data)
-        next_id = max_id + 1
-        logger.debug(f"Next ID calculated: {next_id}")
-        return next_id
+        self._email_index: dict[str, int] = {}
+        # Faixa de idade -> usuários, para GET /stats
+        self._counts = GroupCounts(width=1)
+        super().__init__(db_path=db_path, model=UserModel, **options)
+
+    def _reset_indexes(self):
+        self._email_index = {}
+        self._counts = GroupCounts(width=1)
+
+    def _index(self, item: UserModel):
+        self._email_index.setdefault(normalize_email(item.email), item.id)
+        self._counts.add(age_bucket(item.age), (1,))
+
+    def _unindex(self, item: UserModel):
+        email = normalize_email(item.email)
+        if self._email_index.get(email) == item.id:
+            del self._email_index[email]
+        self._counts.remove(age_bucket(item.age), (1,))
+
+    def stats(self) -> dict[str, Any]:
+        with self._reading():
+            (total,) = self._counts.totals
+            ages = self._counts.rows()
+        return user_stats(total, ages)
+
+    def _check_constraints(self, item: UserModel, previous: Optional[UserModel]):
+        owner = self._email_index.get(normalize_email(item.email))
+        if owner is not None and owner != item.id:
+            logger.warning(f"Email already registered: {item.email}")
+            raise ValueError("Email already registered")
 
     def add(self, item: User) -> dict[str, Any]:
         try:
             logger.debug(f"Adding user: {item}")
             if item.id == 0:
                 item.id = self._get_next_id()
-            data = self.load_data()
-            data.append(item)
-            data = list(map(user_to_pydantic, data))
-            self.save_data(data)
-            logger.info(f"User added: {asdict(item)}")
-            return asdict(item)
+            model = USER_CODEC.from_entity(item)
+            self.insert(model)
+            user = USER_CODEC.to_dict(model)
+            logger.info(f"User added: {user}")
+            return user
         except ValidationError as error:
             logger.error(f"Validation error: {error}")
             raise ValueError(f"Invalid user data: {error}")  # pylint: disable = W0707
 
+    def add_many(self, items: List[User]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Adding {len(items)} users")
+        models, invalid = USER_CODEC.from_entities(items)
+        errors = [(position, f"Invalid user data: {error}") for position, error in invalid]
+        applied, failed = self._insert_many(models)
+        created = [USER_CODEC.to_dict(models[position]) for position in applied]
+        logger.info(f"{len(created)} users added")
+        return created, sorted(errors + failed)
+
     def get_all(self) -> List[dict[str, Any]]:
-        data = self.load_data()
-        data = list(map(pydantic_to_user, data))
-        data = [asdict(user) for user in data]
-        return data
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[dict[str, Any]]:
+        for item in self.iter_data():
+            yield USER_CODEC.to_dict(item)
+
+    def get_page(self, limit: int, after: int = 0) -> dict[str, Any]:
+        items, next_after = self.page_data(limit, after)
+        return page(items, next_after)
 
     def get_by_id(self, user_id: int) -> dict[str, Any]:
         logger.debug(f"Fetching user by ID: {user_id}")
-        data = self.load_data()
-        data = list(map(pydantic_to_user, data))
-        for item in data:
-            if item.id == user_id:
-                logger.info(f"User found: {asdict(item)}")
-                return asdict(item)
+        item = self.find(user_id)
+        if item is not None:
+            user = USER_CODEC.to_dict(item)
+            logger.info(f"User found: {user}")
+            return user
         logger.warning(f"User not found: {user_id}")
         raise ValueError("User not found")
 
     def get_by_email(self, email: str):
-        data = self.load_data()
-        data = list(map(pydantic_to_user, data))
-        for item in data:
-            if item.email == email:
-                return asdict(item)
-        return None
+        with self._reading() as records:
+            item = records.get(self._email_index.get(normalize_email(email), 0))
+        if item is None:
+            return None
+        return USER_CODEC.to_dict(item)
 
     def validate_user(self, email: str, password: str):
         user_data = self.get_by_email(email)
@@ -74,28 +111,35 @@ class UserRepository(JSONRepository):
 
     def update(self, user_id: int, updated_user_data: dict[str, Any]) -> dict[str, Any]:
         logger.debug(f"Updating user: {updated_user_data}")
-        data = self.load_data()
-
-        for idx, item in enumerate(data):  # pylint: disable = W0612  # type: ignore
-            if item.id == user_id:
-                for key, value in updated_user_data.items():
-                    setattr(item, key, value)
-
-                self.save_data(data)
-
-                logger.info(f"User updated: {item.model_dump()}")
-                return item.model_dump()
+        item = self.modify(user_id, updated_user_data)
+        if item is not None:
+            user = USER_CODEC.to_dict(item)
+            logger.info(f"User updated: {user}")
+            return user
 
         logger.warning(f"User not found for update: {user_id}")
         raise ValueError("User not found")
 
+    def update_many(self, updates: List[dict[str, Any]]) -> tuple[List[dict[str, Any]], List[tuple[int, str]]]:
+        logger.debug(f"Updating {len(updates)} users")
+        updated_users = {
+            position: (data.get("id", 0), {key: value for key, value in data.items() if key != "id"})
+            for position, data in enumerate(updates)
+        }
+        modified, errors = self._modify_many(updated_users, "User not found")
+        updated = USER_CODEC.to_dicts(modified.values())
+        logger.info(f"{len(updated)} users updated")
+        return updated, errors
+
+    def delete_many(self, user_ids: List[int]) -> tuple[List[int], List[tuple[int, str]]]:
+        logger.debug(f"Deleting users by ID: {user_ids}")
+        applied, failed = self._remove_many(dict(enumerate(user_ids)))
+        errors = [(position, "User not found") for position, _ in failed]
+        return [user_ids[position] for position in applied], errors
+
     def delete(self, user_id: int) -> List[dict[str, Any]]:
         logger.debug(f"Deleting user by ID: {user_id}")
-        data = self.load_data()
-        for idx, item in enumerate(data):
-            if item.id == user_id:
-                del data[idx]
-                self.save_data(data)
-                return self.get_all()
+        if self.remove(user_id) is not None:
+            return self.get_all()
         logger.warning(f"User not found for deletion: {user_id}")
         raise ValueError("User not found")
@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, Iterator, Optional
+
+from backend.infrastructure.storage.file_storage import Change, FileStorage
+
+# Criar um logger
+logger = logging.getLogger("commit_pipeline")
+
+
+@dataclass(slots=True, kw_only=True)
+class DurabilityPolicy:
+    mode: str = "none"
+    interval_ms: int = 0
+
+    @classmethod
+    def parse(cls, value: str) -> "DurabilityPolicy":
+        # "none" | "always" | "interval=<ms>"
+        value = value.strip().lower()
+        if value in ("none", "always"):
+            return cls(mode=value)
+        if value.startswith("interval="):
+            interval_ms = int(value.split("=", 1)[1])
+            if interval_ms <= 0:
+                raise ValueError(f"Invalid fsync interval: {value}")
+            return cls(mode="interval", interval_ms=interval_ms)
+        raise ValueError(f"Invalid durability policy: {value}")
+
+
+@dataclass
+class _Batch:
+    records: dict[int, Any]
+    changes: list[Change] = field(default_factory=list)
+    done: threading.Event = field(default_factory=threading.Event)
+    error: Optional[BaseException] = None
+
+
+# Escritas que chegam enquanto outra está sendo gravada (ou dentro da janela) são agrupadas
+# em um único commit. O primeiro a chegar em um lote é o líder e faz a gravação; os demais
+# esperam o resultado. Os lotes são gravados um de cada vez, na ordem em que foram abertos.
+#
+# O líder grava a imagem inteira dos registros (o snapshot do FileStorage, a compactação do
+# journal), não só as mudanças do lote. Para essa imagem conter apenas estado commitado:
+# - quem altera os registros entra no lote (submit) antes de soltar o lock que o guard exclui;
+# - o líder fecha o lote só depois de obter o guard: tudo o que está nos registros pertence a
+#   ele ou a um lote já gravado;
+# - se a gravação falha, on_error roda ainda com o guard (o repositório descarta o cache), e
+#   ninguém altera os registros com as mudanças que não foram gravadas.
+@dataclass
+class CommitPipeline:
+    storage: FileStorage
+    policy: DurabilityPolicy = field(default_factory=DurabilityPolicy)
+    window_ms: float = 0
+    guard: Callable[[], ContextManager[Any]] = nullcontext
+    on_error: Optional[Callable[[], None]] = None
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+    _flush_lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+    _pending: Optional[_Batch] = field(init=False, default=None)
+    _dirty: threading.Event = field(init=False, default_factory=threading.Event)
+    _syncer: Optional[threading.Thread] = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.policy.mode == "interval":
+            self._syncer = threading.Thread(target=self._sync_periodically, daemon=True)
+            self._syncer.start()
+
+    def commit(self, records: dict[int, Any], changes: list[Change]):
+        self.complete(*self.submit(records, changes))
+
+    def submit(self, records: dict[int, Any], changes: list[Change]) -> tuple[_Batch, bool]:
+        # Chamado ainda com o lock que o guard exclui: a mudança entra no lote aberto antes de
+        # outra thread poder vê-la nos registros
+        with self._lock:
+            batch = self._pending
+            leader = batch is None
+            if batch is None:
+                batch = self._pending = _Batch(records=records)
+            batch.records = records
+            batch.changes.extend(changes)
+        return batch, leader
+
+    def complete(self, batch: _Batch, leader: bool):
+        if leader:
+            self._lead(batch)
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    @contextmanager
+    def exclusive(self, lock: Callable[[], ContextManager[Any]]) -> Iterator[None]:
+        # Para trocar a coleção inteira (restore): disco e memória na mesma seção, com a ordem de
+        # locks do _lead (flush_lock -> lock dos registros). O lote em aberto foi submetido antes:
+        # é gravado primeiro, senão o líder dele gravaria depois a imagem antiga dos registros
+        with self._flush_lock, lock():
+            with self._lock:
+                batch, self._pending = self._pending, None
+            if batch is not None:
+                self._write(batch)
+            yield
+
+    def replace(self, items: list[Any]):
+        # Só dentro de exclusive(): o lock dos registros já está seguro, o guard não é tomado de novo
+        self.storage.replace(items, sync=self.policy.mode == "always")
+        self._dirty.set()
+
+    def _lead(self, batch: _Batch):
+        if self.window_ms > 0:
+            time.sleep(self.window_ms / 1000)
+        with self._flush_lock:
+            if batch.done.is_set():
+                # Gravado por um exclusive() que chegou antes
+                return
+            try:
+                with self.guard():
+                    with self._lock:
+                        self._pending = None
+                    self._write(batch)
+            finally:
+                # Os seguidores nunca ficam esperando, mesmo que o guard falhe
+                batch.done.set()
+
+    def _write(self, batch: _Batch):
+        try:
+            self.storage.write(batch.records, batch.changes, sync=self.policy.mode == "always")
+            logger.debug(f"Group commit of {len(batch.changes)} changes to: {self.storage.path}")
+            self._dirty.set()
+        except BaseException as error:  # pylint: disable = W0718
+            if self.on_error is not None:
+                self.on_error()
+            batch.error = error
+        finally:
+            batch.done.set()
+
+    def _sync_periodically(self):
+        while True:
+            time.sleep(self.policy.interval_ms / 1000)
+            if not self._dirty.is_set():
+                continue
+            self._dirty.clear()
+            try:
+                with self._flush_lock:
+                    self.storage.sync()
+            except OSError as error:
+                logger.error(f"Periodic fsync failed for {self.storage.path}: {error}")
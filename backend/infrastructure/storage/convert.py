@@ -0,0 +1,32 @@
+import argparse
+from pathlib import Path
+
+from backend.infrastructure.storage.file_storage import FileStorage
+from backend.infrastructure.storage.journal_storage import JournalStorage
+from backend.infrastructure.storage.serializers import SERIALIZERS
+
+
+# Lê a coleção em qualquer formato (aplicando um journal pendente, se houver) e grava um
+# snapshot no formato pedido. Origem e destino podem ser o mesmo arquivo.
+def convert(source: Path, target: Path, serializer: str) -> int:
+    items = list(JournalStorage(path=source).read())
+    target.parent.mkdir(parents=True, exist_ok=True)
+    FileStorage(path=target, encode=dict, serializer=serializer).replace(items, sync=True)
+    return len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte uma coleção entre os formatos JSON e binário")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("target", type=Path)
+    parser.add_argument("--to", choices=sorted(SERIALIZERS), required=True)
+    args = parser.parse_args()
+    if not args.source.exists():
+        parser.error(f"{args.source} does not exist")
+
+    count = convert(args.source, args.target, args.to)
+    print(f"{count} records written to {args.target} ({args.to})")
+
+
+if __name__ == "__main__":
+    main()
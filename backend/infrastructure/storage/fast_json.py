@@ -0,0 +1,85 @@
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Union
+
+# Criar um logger
+logger = logging.getLogger("fast_json")
+
+JSON_BACKENDS = ("orjson", "msgspec", "json")
+
+
+# Codificação JSON usada pelo servidor e pelo armazenamento, sempre em bytes (UTF-8): orjson ou
+# msgspec quando instalados, senão a biblioteca padrão. SAIPH_JSON=orjson|msgspec|json força um.
+@dataclass(frozen=True)
+class JSONBackend:
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[Union[bytes, str]], Any]
+
+
+def stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj).encode("utf-8")
+
+
+def _load_orjson() -> JSONBackend:
+    import orjson  # pylint: disable = C0415, E0401  # type: ignore
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # Chaves não textuais ou inteiros acima de 64 bits: a biblioteca padrão aceita
+            return stdlib_dumps(obj)
+
+    return JSONBackend(name="orjson", dumps=dumps, loads=orjson.loads)
+
+
+def _load_msgspec() -> JSONBackend:
+    import msgspec  # pylint: disable = C0415, E0401  # type: ignore
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any) -> bytes:
+        try:
+            return encoder.encode(obj)
+        except (TypeError, OverflowError, msgspec.EncodeError):
+            return stdlib_dumps(obj)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as error:
+            # Como o json.JSONDecodeError: entrada inválida vira ValueError (400 no servidor)
+            raise ValueError(str(error)) from error
+
+    return JSONBackend(name="msgspec", dumps=dumps, loads=loads)
+
+
+def _load_stdlib() -> JSONBackend:
+    return JSONBackend(name="json", dumps=stdlib_dumps, loads=json.loads)
+
+
+LOADERS: dict[str, Callable[[], JSONBackend]] = {"orjson": _load_orjson, "msgspec": _load_msgspec, "json": _load_stdlib}
+
+
+def select_backend(name: str = "auto") -> JSONBackend:
+    if name != "auto":
+        if name not in LOADERS:
+            raise ValueError(f"Unknown JSON backend: {name}")
+        return LOADERS[name]()
+    for candidate in JSON_BACKENDS:
+        try:
+            return LOADERS[candidate]()
+        except ImportError:
+            continue
+    return _load_stdlib()
+
+
+JSON_BACKEND = select_backend(os.environ.get("SAIPH_JSON", "auto"))
+logger.debug(f"JSON backend: {JSON_BACKEND.name}")
+
+dumps = JSON_BACKEND.dumps
+loads = JSON_BACKEND.loads
@@ -0,0 +1,177 @@
+import logging
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional, Protocol, runtime_checkable
+
+from backend.infrastructure.storage.locks import FileLock
+from backend.infrastructure.storage.serializers import SERIALIZERS, Serializer, load_snapshot
+
+# Criar um logger
+logger = logging.getLogger("file_storage")
+
+# ("put", registro) ou ("delete", id)
+Change = tuple[str, Any]
+
+
+def file_stamp(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def model_dump(item: Any) -> dict[str, Any]:
+    # Os campos de um modelo pydantic validado já são tipos simples: o encoder JSON lê o
+    # __dict__ direto, sem o custo de model_dump (o dicionário não é alterado). Linhas que
+    # já chegam como dicionário (ver RowSource) passam direto.
+    if isinstance(item, dict):
+        return item
+    return item.__dict__
+
+
+# Cópia de uma coleção feita sob o lock: as linhas são geradas depois, fora dele
+@dataclass(frozen=True)
+class FrozenRows:
+    size: int
+    produce: Callable[[], Iterator[dict[str, Any]]]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return self.produce()
+
+
+# Coleções em memória que sabem se copiar (ex.: a tabela colunar de livros, que não guarda
+# um modelo por registro); um dict comum é copiado pelas referências dos valores
+@runtime_checkable
+class RowSource(Protocol):
+    def freeze(self) -> FrozenRows:
+        pass
+
+
+def freeze_records(records: Any) -> Any:
+    if isinstance(records, RowSource):
+        return records.freeze()
+    return list(records.values())
+
+
+def fsync_path(path: Path):
+    # Abrir um diretório com O_RDONLY e sincronizá-lo persiste as entradas criadas por rename
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Grava a coleção inteira em um arquivo JSON a cada escrita (arquivo temporário + move).
+# Leituras e escritas seguram um lock exclusivo no arquivo <coleção>.lock, compartilhado com
+# outros processos que usem a mesma coleção.
+@dataclass
+class FileStorage:
+    path: Path
+    encode: Callable[[Any], dict[str, Any]] = model_dump
+    # Formato usado nas gravações do snapshot: "json" ou "binary"
+    serializer: str = "json"
+    _serializer: Serializer = field(init=False)
+    _stamp: Optional[Hashable] = field(init=False, default=None)
+    _file_lock: FileLock = field(init=False)
+
+    def __post_init__(self):
+        if self.serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown serializer: {self.serializer}")
+        self._serializer = SERIALIZERS[self.serializer]
+        self._file_lock = FileLock(self.path.with_name(f"{self.path.name}.lock"))
+
+    def initialize(self):
+        if self.path.exists():
+            return
+        logger.debug(f"Creating new database file at: {self.path}")
+        with open(self.path, "wb") as f:  # pylint: disable = C0103
+            self._serializer.dump([], f)
+        logger.info(f"Database initialized at: {self.path}")
+
+    def stamp(self) -> Hashable:
+        # O arquivo é substituído via shutil.move a cada escrita, então o inode muda
+        # mesmo quando outro processo grava no mesmo instante e com o mesmo tamanho.
+        return file_stamp(self.path)
+
+    def changed(self) -> bool:
+        return self._stamp is None or self._stamp != self.stamp()
+
+    def forget(self):
+        self._stamp = None
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        with self._file_lock:
+            stamp = self.stamp()
+            yield from self._read_snapshot()
+            self._stamp = stamp
+
+    def read_tail(self) -> Optional[list[dict[str, Any]]]:
+        # Mudanças gravadas por outros processos desde a última leitura, quando o formato permite
+        # lê-las isoladamente (ver JournalStorage); None pede uma releitura completa
+        return None
+
+    def write(self, records: Any, changes: list[Change], sync: bool = False):
+        with self._file_lock:
+            if not self.changed():
+                self._write_snapshot(freeze_records(records), sync)
+                self._stamp = self.stamp()
+                return
+            # Outro processo gravou desde a nossa última leitura: aplica só as mudanças do lote
+            # sobre o que está em disco, e o cache do repositório será recarregado
+            logger.warning(f"Merging concurrent changes into: {self.path}")
+            merged = {item["id"]: item for item in self._read_snapshot()}
+            for op, value in changes:
+                if op == "put":
+                    merged[value.id] = self.encode(value)
+                elif op == "delete":
+                    merged.pop(value, None)
+            self._install_snapshot(self._dump_snapshot(merged.values(), sync, encoded=True), sync)
+            self.forget()
+
+    def replace(self, items: list[Any], sync: bool = False):
+        with self._file_lock:
+            self._write_snapshot(items, sync)
+            self._stamp = self.stamp()
+
+    def sync(self):
+        with self._file_lock:
+            fsync_path(self.path)
+            fsync_path(self.path.parent)
+
+    def _read_snapshot(self) -> Iterator[dict[str, Any]]:
+        logger.debug(f"Loading data from: {self.path}")
+        with open(self.path, "rb") as f:  # pylint: disable = C0103
+            yield from load_snapshot(f)
+
+    def _write_snapshot(self, items: Iterable[Any], sync: bool = False):
+        self._install_snapshot(self._dump_snapshot(items, sync), sync)
+
+    def _dump_snapshot(self, items: Iterable[Any], sync: bool = False, encoded: bool = False) -> str:
+        logger.debug(f"Saving data to: {self.path}")
+        temp_file = NamedTemporaryFile("wb", delete=False, dir=self.path.parent)  # pylint: disable = R1732
+        try:
+            self._serializer.dump(items if encoded else (self.encode(item) for item in items), temp_file)
+            temp_file.flush()
+            if sync:
+                os.fsync(temp_file.fileno())
+        except Exception:
+            os.unlink(temp_file.name)
+            raise
+        finally:
+            temp_file.close()
+            logger.debug(f"Temporary file closed: {temp_file.name}")
+        return temp_file.name
+
+    def _install_snapshot(self, temp_name: str, sync: bool = False):
+        shutil.move(temp_name, self.path)
+        if sync:
+            fsync_path(self.path.parent)
+        logger.info(f"Data successfully saved to: {self.path}")
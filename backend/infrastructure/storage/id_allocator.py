@@ -0,0 +1,66 @@
+import fcntl
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+# Criar um logger
+logger = logging.getLogger("id_allocator")
+
+
+# Sequência persistida em um arquivo ao lado da coleção (ex.: books.json.seq). O flock no
+# arquivo serializa processos diferentes e o lock interno serializa as threads do processo.
+@dataclass
+class IdAllocator:
+    path: Path
+    seed: Callable[[], int] = lambda: 1
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def next_id(self) -> int:
+        return self.reserve(1).start
+
+    def reserve(self, count: int) -> range:
+        if count < 1:
+            raise ValueError("At least one id must be reserved")
+        with self._lock, open(self.path, "a+") as f:  # pylint: disable = W1514, C0103
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                start = self._read(f)
+                self._write(f, start + count)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        logger.debug(f"Reserved ids {start}..{start + count - 1} from: {self.path}")
+        return range(start, start + count)
+
+    def peek(self) -> int:
+        with self._lock, open(self.path, "a+") as f:  # pylint: disable = W1514, C0103
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                return self._read(f)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def advance(self, minimum: int):
+        # Garante que ids já presentes nos dados (importados ou restaurados) nunca sejam entregues
+        with self._lock, open(self.path, "a+") as f:  # pylint: disable = W1514, C0103
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if self._read(f) < minimum:
+                    self._write(f, minimum)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read(self, f) -> int:  # type: ignore  # pylint: disable = C0103
+        f.seek(0)
+        content = f.read()
+        if not content:
+            return self.seed()
+        return json.loads(content)["next_id"]
+
+    def _write(self, f, next_id: int):  # type: ignore  # pylint: disable = C0103
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps({"next_id": next_id}))
+        f.flush()
@@ -0,0 +1,176 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Iterator, Optional
+
+from backend.infrastructure.storage.fast_json import dumps, loads
+from backend.infrastructure.storage.file_storage import Change, FileStorage, file_stamp, freeze_records, fsync_path
+
+# Criar um logger
+logger = logging.getLogger("journal_storage")
+
+
+# O arquivo JSON da coleção passa a ser um snapshot; cada mutação é anexada como uma linha
+# NDJSON no journal. Puts carregam o registro completo e deletes só o id, então reaplicar
+# o journal sobre um snapshot mais novo é idempotente.
+@dataclass
+class JournalStorage(FileStorage):
+    max_journal_bytes: int = 4 * 1024 * 1024
+    max_journal_ratio: float = 1.0
+    _journal_path: Path = field(init=False)
+    _rotated_path: Path = field(init=False)
+    _compactor: Optional[threading.Thread] = field(init=False, default=None)
+
+    def __post_init__(self):
+        super().__post_init__()
+        self._journal_path = self.path.with_name(f"{self.path.name}.journal")
+        self._rotated_path = self.path.with_name(f"{self.path.name}.journal.old")
+
+    def stamp(self) -> Hashable:
+        return file_stamp(self.path), file_stamp(self._rotated_path), file_stamp(self._journal_path)
+
+    def read(self) -> Iterator[dict[str, Any]]:
+        with self._file_lock:
+            stamp = self.stamp()
+            records = {item["id"]: item for item in self._read_snapshot()}
+            for path in (self._rotated_path, self._journal_path):
+                self._replay(path, records)
+            self._stamp = stamp
+        return iter(records.values())
+
+    def read_tail(self) -> Optional[list[dict[str, Any]]]:
+        # Se só o journal cresceu desde a última leitura (mesmo snapshot, mesma rotação), basta ler
+        # as linhas novas: o tamanho do journal registrado no carimbo é o que já foi aplicado
+        if self._stamp is None:
+            return None
+        snapshot, rotated, journal = self._stamp  # type: ignore
+        with self._file_lock:
+            stamp = self.stamp()
+            current = stamp[2]  # type: ignore
+            if stamp[:2] != (snapshot, rotated) or current is None:  # type: ignore
+                return None
+            if journal is not None and (current[2] != journal[2] or current[1] < journal[1]):
+                return None
+            with open(self._journal_path, "rb") as f:  # pylint: disable = C0103
+                f.seek(journal[1] if journal is not None else 0)
+                entries = self._parse(f, self._journal_path)
+            if any(entry["op"] == "clear" for entry in entries):
+                return None
+            self._stamp = stamp
+        return entries
+
+    def write(self, records: Any, changes: list[Change], sync: bool = False):
+        lines = b"".join(dumps(self._entry(change)) + b"\n" for change in changes)
+        with self._file_lock:
+            # Anexar é seguro mesmo que outro processo tenha gravado antes, mas aí os registros em
+            # memória estão desatualizados: não servem para compactar e o cache precisa ser recarregado
+            stale = self.changed()
+            with open(self._journal_path, "a+b") as f:  # pylint: disable = C0103
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        lines = b"\n" + lines
+                empty = f.tell() == 0
+                f.write(lines)
+                f.flush()
+                if sync:
+                    os.fsync(f.fileno())
+            if sync and empty:
+                fsync_path(self.path.parent)
+            if stale:
+                # O carimbo antigo fica: o repositório alcança o journal pelas linhas novas (read_tail),
+                # incluindo as deste lote, que reaplicadas não mudam nada
+                return
+            self._stamp = self.stamp()
+            if self._needs_compaction():
+                self._start_compaction(freeze_records(records))
+
+    def replace(self, items: list[Any], sync: bool = False):
+        changes = [("clear", None)] + [("put", item) for item in items]
+        self.write({item.id: item for item in items}, changes, sync)
+
+    def sync(self):
+        with self._file_lock:
+            if self._journal_path.exists():
+                fsync_path(self._journal_path)
+            fsync_path(self.path.parent)
+
+    def wait_for_compaction(self):
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _entry(self, change: Change) -> dict[str, Any]:
+        op, value = change
+        if op == "put":
+            return {"op": op, "record": self.encode(value)}
+        if op == "delete":
+            return {"op": op, "id": value}
+        return {"op": op}
+
+    def _replay(self, path: Path, records: dict[int, Any]):
+        if not path.exists():
+            return
+        with open(path, "rb") as f:  # pylint: disable = C0103
+            for entry in self._parse(f, path):
+                if entry["op"] == "put":
+                    records[entry["record"]["id"]] = entry["record"]
+                elif entry["op"] == "delete":
+                    records.pop(entry["id"], None)
+                elif entry["op"] == "clear":
+                    records.clear()
+
+    def _parse(self, lines: Iterable[bytes], path: Path) -> list[dict[str, Any]]:
+        entries = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                entries.append(loads(line))
+            except ValueError:
+                # Linha incompleta deixada por uma escrita interrompida, que nunca foi confirmada
+                logger.warning(f"Discarding torn journal entry in {path}")
+        return entries
+
+    def _needs_compaction(self) -> bool:
+        journal_size = self._journal_path.stat().st_size
+        if journal_size >= self.max_journal_bytes:
+            return True
+        snapshot_size = self.path.stat().st_size
+        return journal_size > max(snapshot_size, 4096) * self.max_journal_ratio
+
+    def _start_compaction(self, items: list[Any]):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        if self._rotated_path.exists():
+            # Sobrou de uma compactação interrompida: o estado atual já inclui os dois journals
+            self._compact(items, self._journal_path)
+            return
+        os.replace(self._journal_path, self._rotated_path)
+        self._stamp = self.stamp()
+        base = file_stamp(self.path), file_stamp(self._rotated_path)
+        self._compactor = threading.Thread(target=self._compact, args=(items, None, base), daemon=True)
+        self._compactor.start()
+
+    def _compact(self, items: list[Any], journal_path: Optional[Path] = None, base: Optional[Hashable] = None):
+        logger.debug(f"Compacting journal for: {self.path}")
+        # O snapshot precisa estar em disco antes de o journal rotacionado ser apagado
+        temp_name = self._dump_snapshot(items, sync=True)
+        with self._file_lock:
+            if base is not None and base != (file_stamp(self.path), file_stamp(self._rotated_path)):
+                # Outro processo compactou enquanto este snapshot era gerado: o dele é mais novo
+                os.unlink(temp_name)
+                logger.info(f"Discarding outdated compaction for: {self.path}")
+                return
+            stale = self.changed()
+            self._install_snapshot(temp_name, sync=True)
+            self._rotated_path.unlink(missing_ok=True)
+            if journal_path is not None:
+                journal_path.unlink(missing_ok=True)
+            if stale:
+                self.forget()
+            else:
+                self._stamp = self.stamp()
+        logger.info(f"Journal compacted for: {self.path}")
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Iterator, TextIO
+
+WHITESPACE = " \t\n\r"
+
+
+# Lê um array JSON do arquivo elemento por elemento, mantendo em memória só o trecho ainda
+# não decodificado (no máximo um elemento mais um bloco), em vez do arquivo inteiro.
+def iter_json_array(f: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:  # pylint: disable = C0103
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                raise ValueError("Unexpected end of JSON array")
+
+    if next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as error:
+            if fill():
+                continue
+            raise ValueError(f"Invalid JSON array: {error}")  # pylint: disable = W0707
+        if end == len(buffer) and fill():
+            # Um número no fim do bloco pode ter sido cortado: decodifica de novo com mais dados
+            continue
+        pos = end
+        yield item
+        separator = next_char()
+        pos += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Unexpected character in JSON array: {separator!r}")
@@ -0,0 +1,92 @@
+import fcntl
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterator, Optional
+
+
+# Vários leitores ao mesmo tempo ou um escritor exclusivo. Escritores têm preferência para não
+# ficarem sem vez sob leitura contínua. É reentrante: quem já lê pode ler de novo e quem escreve
+# pode ler ou escrever de novo; promover uma leitura a escrita não é permitido.
+@dataclass
+class ReadWriteLock:
+    _condition: threading.Condition = field(init=False, default_factory=threading.Condition)
+    _readers: dict[int, int] = field(init=False, default_factory=dict)
+    _writer: Optional[int] = field(init=False, default=None)
+    _writer_depth: int = field(init=False, default=0)
+    _waiting_writers: int = field(init=False, default=0)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me and me not in self._readers:
+                while self._writer is not None or self._waiting_writers:
+                    self._condition.wait()
+            self._readers[me] = self._readers.get(me, 0) + 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers[me] -= 1
+                if not self._readers[me]:
+                    del self._readers[me]
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer != me:
+                if me in self._readers:
+                    raise RuntimeError("Cannot upgrade a read lock to a write lock")
+                self._waiting_writers += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._waiting_writers -= 1
+                self._writer = me
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+# Lock exclusivo entre processos (flock em um arquivo ao lado da coleção). Dentro do processo é
+# reentrante e serializa as threads, já que o flock pertence ao descritor e não à thread.
+@dataclass
+class FileLock:
+    path: Path
+    _lock: threading.RLock = field(init=False, default_factory=threading.RLock)
+    _file: Optional[IO[Any]] = field(init=False, default=None)
+    _depth: int = field(init=False, default=0)
+
+    def __enter__(self) -> "FileLock":
+        self._lock.acquire()
+        if not self._depth:
+            try:
+                self._file = open(self.path, "a")  # pylint: disable = W1514, R1732
+                fcntl.flock(self._file, fcntl.LOCK_EX)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *args: Any):
+        self._depth -= 1
+        if not self._depth and self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._lock.release()
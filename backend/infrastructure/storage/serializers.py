@@ -0,0 +1,150 @@
+import io
+import os
+import struct
+from dataclasses import dataclass
+from itertools import accumulate, chain
+from typing import IO, Any, Iterable, Iterator, Union
+
+from backend.infrastructure.storage.fast_json import dumps, loads
+from backend.infrastructure.storage.json_stream import iter_json_array
+
+# Assinatura + versão do formato binário
+BINARY_MAGIC = b"SAIPHB\x00\x01"
+
+# Inteiros e booleanos têm largura fixa; strings viram o índice (u32) na tabela de strings
+BINARY_TYPES = {bool: "?", int: "q", str: "I"}
+
+HEADER = struct.Struct("<H")
+FIELD = struct.Struct("<cH")
+COUNT = struct.Struct("<I")
+
+# Limite da decodificação de uma vez do JSONSerializer, em MiB. Um loads do arquivo inteiro é bem
+# mais rápido, mas o pico de memória é o texto mais todos os dicionários ao lado dos modelos (vários
+# múltiplos do arquivo); acima do limite a leitura é elemento por elemento, com memória limitada
+JSON_BUFFER_BYTES = int(float(os.environ.get("SAIPH_JSON_BUFFER_MB", "4")) * 1024 * 1024)
+
+
+# O formato original: um array JSON com um objeto por registro
+@dataclass
+class JSONSerializer:
+    # Até este tamanho o arquivo é decodificado de uma vez; acima, elemento por elemento
+    max_buffered_bytes: int = JSON_BUFFER_BYTES
+
+    def dump(self, items: Iterable[dict[str, Any]], f: IO[bytes]):  # pylint: disable = C0103
+        # Uma única escrita, já em bytes
+        f.write(dumps(list(items)))
+
+    def load(self, f: IO[bytes]) -> Iterator[dict[str, Any]]:  # pylint: disable = C0103
+        start = f.tell()
+        size = f.seek(0, os.SEEK_END) - start
+        f.seek(start)
+        if size <= self.max_buffered_bytes:
+            items = loads(f.read())
+            if not isinstance(items, list):
+                raise ValueError("Expected a JSON array")
+            yield from items
+            return
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        try:
+            yield from iter_json_array(text)
+        finally:
+            text.detach()
+
+
+# Cabeçalho com os campos (tipo + nome), tabela de strings (comprimentos u32 seguidos dos bytes
+# UTF-8, cada string distinta uma única vez) e linhas de largura fixa, lidas com struct.iter_unpack.
+# Todos os inteiros são little-endian; o esquema vem do primeiro registro.
+@dataclass
+class BinarySerializer:
+    rows_per_chunk: int = 4096
+
+    def dump(self, items: Iterable[dict[str, Any]], f: IO[bytes]):  # pylint: disable = C0103
+        items = iter(items)
+        first = next(items, None)
+        fields = [] if first is None else [(name, self._type_code(name, value)) for name, value in first.items()]
+        names = [name for name, _ in fields]
+        text_positions = [position for position, (_, code) in enumerate(fields) if code == "I"]
+        row = struct.Struct("<" + "".join(code for _, code in fields))
+        strings: dict[str, int] = {}
+        rows = bytearray()
+        count = 0
+        for item in chain([first], items) if first is not None else ():
+            try:
+                values = [item[name] for name in names]
+                for position in text_positions:
+                    value = values[position]
+                    if not isinstance(value, str):
+                        raise ValueError(f"Field '{names[position]}' must be a string")
+                    values[position] = strings.setdefault(value, len(strings))
+                rows += row.pack(*values)
+            except (KeyError, struct.error) as error:
+                raise ValueError(f"Record does not fit the binary schema: {error}")  # pylint: disable = W0707
+            count += 1
+
+        f.write(BINARY_MAGIC)
+        f.write(HEADER.pack(len(fields)))
+        for name, code in fields:
+            encoded_name = name.encode("utf-8")
+            f.write(FIELD.pack(code.encode("ascii"), len(encoded_name)))
+            f.write(encoded_name)
+        encoded = [value.encode("utf-8") for value in strings]
+        f.write(COUNT.pack(len(encoded)))
+        f.write(struct.pack(f"<{len(encoded)}I", *(len(value) for value in encoded)))
+        f.write(b"".join(encoded))
+        f.write(COUNT.pack(count))
+        f.write(rows)
+
+    def load(self, f: IO[bytes]) -> Iterator[dict[str, Any]]:  # pylint: disable = C0103
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError("Not a binary snapshot")
+        (field_count,) = HEADER.unpack(self._read(f, HEADER.size))
+        names: list[str] = []
+        codes = ""
+        for _ in range(field_count):
+            code, name_length = FIELD.unpack(self._read(f, FIELD.size))
+            names.append(self._read(f, name_length).decode("utf-8"))
+            codes += code.decode("ascii")
+        text_positions = [position for position, code in enumerate(codes) if code == "I"]
+
+        (string_count,) = COUNT.unpack(self._read(f, COUNT.size))
+        lengths = struct.unpack(f"<{string_count}I", self._read(f, 4 * string_count))
+        blob = self._read(f, sum(lengths))
+        offsets = [0, *accumulate(lengths)]
+        strings = [blob[start:end].decode("utf-8") for start, end in zip(offsets, offsets[1:])]
+
+        (remaining,) = COUNT.unpack(self._read(f, COUNT.size))
+        row = struct.Struct("<" + codes)
+        while remaining:
+            count = min(remaining, self.rows_per_chunk)
+            for values in row.iter_unpack(self._read(f, count * row.size)):
+                if text_positions:
+                    values = list(values)
+                    for position in text_positions:
+                        values[position] = strings[values[position]]
+                yield dict(zip(names, values))
+            remaining -= count
+
+    def _type_code(self, name: str, value: Any) -> str:
+        code = BINARY_TYPES.get(type(value))
+        if code is None:
+            raise ValueError(f"Unsupported type for field '{name}': {type(value).__name__}")
+        return code
+
+    def _read(self, f: IO[bytes], size: int) -> bytes:  # pylint: disable = C0103
+        data = f.read(size)
+        if len(data) != size:
+            raise ValueError("Truncated binary snapshot")
+        return data
+
+
+Serializer = Union[JSONSerializer, BinarySerializer]
+
+SERIALIZERS: dict[str, Serializer] = {"json": JSONSerializer(), "binary": BinarySerializer()}
+
+
+# O formato é reconhecido pela assinatura, não pela configuração: trocar o serializer de uma
+# coleção existente funciona, e ela é regravada no novo formato na próxima escrita.
+def load_snapshot(f: IO[bytes]) -> Iterator[dict[str, Any]]:  # pylint: disable = C0103
+    binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+    f.seek(0)
+    return SERIALIZERS["binary" if binary else "json"].load(f)
@@ -0,0 +1,50 @@
+import argparse
+import json
+
+from backend.infrastructure.repositories.snapshots import MANIFEST_NAME, SnapshotStore, install_snapshot
+from backend.main.config.config import (
+    collection_paths,
+    configure_admin_dependencies,
+    configure_book_dependencies,
+    configure_user_dependencies,
+    get_snapshot_dir,
+)
+
+
+# create lê as coleções pelos mesmos repositórios do servidor; com o servidor no ar prefira
+# POST /admin/snapshots, que copia a memória do próprio processo. restore instala os arquivos
+# diretamente e deve rodar com o servidor parado (para restaurar online use a rota administrativa).
+def main():
+    parser = argparse.ArgumentParser(description="Cria, lista e restaura snapshots das coleções")
+    parser.add_argument("command", choices=["create", "list", "restore"])
+    parser.add_argument("name", nargs="?")
+    parser.add_argument("--users", default="database/users.json")
+    parser.add_argument("--books", default="database/books.json")
+    parser.add_argument("--dir", default=None, help="diretório dos snapshots (padrão: SAIPH_SNAPSHOT_DIR)")
+    args = parser.parse_args()
+    snapshot_dir = get_snapshot_dir(args.dir)
+
+    if args.command == "list":
+        for manifest in SnapshotStore(directory=snapshot_dir, repositories={}).manifests():
+            print(manifest["name"], manifest["created_at"])
+        return
+
+    if args.command == "restore":
+        if not args.name:
+            parser.error("restore requires a snapshot name")
+        if not (snapshot_dir / args.name / MANIFEST_NAME).exists():
+            parser.error(f"snapshot {args.name} not found in {snapshot_dir}")
+        install_snapshot(snapshot_dir / args.name, collection_paths(args.users, args.books))
+        print(f"Snapshot {args.name} installed")
+        return
+
+    user_controller = configure_user_dependencies(args.users)
+    book_controller = configure_book_dependencies(args.books)
+    # O token só protege as rotas HTTP; aqui o controlador é usado diretamente
+    admin_controller = configure_admin_dependencies(user_controller, book_controller, str(snapshot_dir), token="cli")
+    _, manifest = admin_controller.create_snapshot({"name": args.name})  # type: ignore
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
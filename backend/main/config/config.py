@@ -1,20 +1,137 @@
+import os
+from pathlib import Path
+from typing import Any, Optional, Union
+
 from backend.application.use_cases.book_use_cases import BookUseCases
+from backend.application.use_cases.snapshot_use_cases import SnapshotUseCases
+from backend.application.use_cases.stats_use_cases import StatsUseCases
 from backend.application.use_cases.user_use_cases import UserUseCases
 from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.repositories.snapshots import SnapshotStore, install_snapshot
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+from backend.infrastructure.repositories.sqlite_repository import is_sqlite_url, sqlite_path
+from backend.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
 from backend.infrastructure.repositories.user_repository import UserRepository
+from backend.main.controllers.admin_controller import AdminController
 from backend.main.controllers.book_controller import BookController
+from backend.main.controllers.stats_controller import StatsController
 from backend.main.controllers.user_controller import UserController
 
 
-def configure_user_dependencies(db_path: str) -> UserController:
-    user_repository = UserRepository(db_path=db_path)
+def get_storage_options(storage: Optional[str] = None) -> dict[str, Any]:
+    return {
+        # "file" reescreve o arquivo inteiro a cada escrita; "journal" anexa cada mutação a um journal
+        "storage": storage or os.environ.get("SAIPH_STORAGE_ENGINE", "file"),
+        # "none", "always" ou "interval=<ms>"
+        "durability": os.environ.get("SAIPH_FSYNC", "none"),
+        "commit_window_ms": float(os.environ.get("SAIPH_COMMIT_WINDOW_MS", "0")),
+        # Formato do snapshot: "json" ou "binary" (o formato atual do arquivo é detectado na leitura)
+        "serializer": os.environ.get("SAIPH_SERIALIZER", "json"),
+    }
+
+
+def get_server_options(engine: Optional[str] = None) -> dict[str, Any]:
+    return {
+        # "threading" abre uma thread por conexão; "pool" usa workers fixos e fila limitada (503 quando cheia);
+        # "asyncio" atende as conexões num event loop e leva as chamadas bloqueantes a um executor
+        "engine": engine or os.environ.get("SAIPH_SERVER_ENGINE", "threading"),
+        "workers": int(os.environ.get("SAIPH_WORKERS", "0")) or None,
+        "queue_size": int(os.environ.get("SAIPH_QUEUE_SIZE", "0")) or None,
+        "retry_after": int(os.environ.get("SAIPH_RETRY_AFTER", "1")),
+    }
+
+
+def get_worker_processes() -> int:
+    # Acima de 1, run() entra no modo pre-fork: um supervisor e N processos na mesma porta
+    return int(os.environ.get("SAIPH_PROCESSES", "1"))
+
+
+def get_database_url(db_path: str) -> str:
+    # SAIPH_DATABASE_URL=sqlite:///database/saiph.db troca as duas coleções para o SQLite
+    return os.environ.get("SAIPH_DATABASE_URL") or str(db_path)
+
+
+def create_user_repository(db_path: str, storage: Optional[str] = None) -> Union[UserRepository, SQLiteUserRepository]:
+    database_url = get_database_url(db_path)
+    if is_sqlite_url(database_url):
+        return SQLiteUserRepository(dsn=database_url)
+    return UserRepository(db_path=database_url, **get_storage_options(storage))
+
+
+def create_book_repository(db_path: str, storage: Optional[str] = None) -> Union[BookRepository, SQLiteBookRepository]:
+    database_url = get_database_url(db_path)
+    if is_sqlite_url(database_url):
+        return SQLiteBookRepository(dsn=database_url)
+    # SAIPH_BOOK_STORE=columnar guarda os livros em colunas (BookTable) em vez de um modelo por registro
+    if os.environ.get("SAIPH_BOOK_STORE", "objects") == "columnar":
+        return ColumnarBookRepository(db_path=database_url, **get_storage_options(storage))
+    return BookRepository(db_path=database_url, **get_storage_options(storage))
+
+
+def configure_user_dependencies(db_path: str, storage: Optional[str] = None) -> UserController:
+    user_repository = create_user_repository(db_path, storage)
     user_use_cases = UserUseCases(repository=user_repository)
     user_controller = UserController(user_use_cases=user_use_cases)
     return user_controller
 
 
-def configure_book_dependencies(db_path: str) -> BookController:
-    book_repository = BookRepository(db_path=db_path)
+def configure_book_dependencies(db_path: str, storage: Optional[str] = None) -> BookController:
+    book_repository = create_book_repository(db_path, storage)
     book_use_cases = BookUseCases(repository=book_repository)
     book_controller = BookController(book_use_case=book_use_cases)
     return book_controller
+
+
+def configure_stats_dependencies(user_controller: UserController, book_controller: BookController) -> StatsController:
+    # Os contadores vivem nos repositórios que atendem as escritas
+    stats_use_cases = StatsUseCases(
+        user_repository=user_controller.user_use_cases.repository,
+        book_repository=book_controller.book_use_case.repository,
+    )
+    return StatsController(stats_use_cases=stats_use_cases)
+
+
+def get_snapshot_dir(snapshot_dir: Optional[str] = None) -> Path:
+    return Path(snapshot_dir or os.environ.get("SAIPH_SNAPSHOT_DIR", "database/snapshots"))
+
+
+def configure_admin_dependencies(
+    user_controller: UserController,
+    book_controller: BookController,
+    snapshot_dir: Optional[str] = None,
+    token: Optional[str] = None,
+) -> Optional[AdminController]:
+    token = token or os.environ.get("SAIPH_ADMIN_TOKEN")
+    if not token:
+        return None
+    store = SnapshotStore(
+        directory=get_snapshot_dir(snapshot_dir),
+        repositories={
+            # Os mesmos repositórios que atendem as requisições: o snapshot sai da memória deles
+            "users": user_controller.user_use_cases.repository,
+            "books": book_controller.book_use_case.repository,
+        },
+    )
+    snapshot_use_cases = SnapshotUseCases(store=store)
+    return AdminController(snapshot_use_cases=snapshot_use_cases, token=token)
+
+
+def collection_paths(db_path_user: str, db_path_book: str) -> dict[str, Path]:
+    paths = {}
+    for name, db_path in (("users", db_path_user), ("books", db_path_book)):
+        database_url = get_database_url(db_path)
+        paths[name] = sqlite_path(database_url) if is_sqlite_url(database_url) else Path(database_url)
+    return paths
+
+
+def warm_start(db_path_user: str, db_path_book: str, snapshot: Optional[str] = None) -> bool:
+    # SAIPH_WARM_START=<diretório de um snapshot>: instala a imagem quando as coleções ainda não existem
+    snapshot = snapshot or os.environ.get("SAIPH_WARM_START")
+    if not snapshot:
+        return False
+    paths = collection_paths(db_path_user, db_path_book)
+    if any(path.exists() for path in paths.values()):
+        return False
+    install_snapshot(Path(snapshot), paths)
+    return True
@@ -0,0 +1,32 @@
+import hmac
+from typing import Any, List, Literal, Optional
+
+from backend.application.use_cases.snapshot_use_cases import SnapshotUseCases
+from backend.main.server.responses import HTTPError
+
+
+class AdminController:
+    def __init__(self, snapshot_use_cases: SnapshotUseCases, token: str):
+        self.snapshot_use_cases = snapshot_use_cases
+        self.token = token
+
+    def authorize(self, authorization: Optional[str]):
+        # Sem credencial é 401 (com o desafio do esquema Bearer); credencial errada é 403
+        if not authorization:
+            raise HTTPError(401, "Missing admin token", (("WWW-Authenticate", 'Bearer realm="admin"'),))
+        # Comparação em tempo constante para não vazar o token pelo tempo de resposta
+        expected = f"Bearer {self.token}"
+        if not hmac.compare_digest(authorization.encode(), expected.encode()):
+            raise HTTPError(403, "Invalid admin token")
+
+    def create_snapshot(self, snapshot_data: dict[str, Any]) -> tuple[Literal[201], dict[str, Any]]:
+        manifest = self.snapshot_use_cases.create_snapshot(snapshot_data.get("name"))
+        return 201, manifest
+
+    def list_snapshots(self) -> tuple[Literal[200], List[dict[str, Any]]]:
+        manifests = self.snapshot_use_cases.list_snapshots()
+        return 200, manifests
+
+    def restore_snapshot(self, snapshot_data: dict[str, Any]) -> tuple[Literal[200], dict[str, Any]]:
+        manifest = self.snapshot_use_cases.restore_snapshot(snapshot_data.get("name"))
+        return 200, manifest
@@ -1,4 +1,4 @@
-from typing import Any, List, Literal
+from typing import Any, Iterator, List, Literal, Optional
 
 from backend.application.use_cases.book_use_cases import BookUseCases
 from backend.domain.entities.book import Book
@@ -12,10 +12,42 @@ class BookController:
         book = self.book_use_case.create_book(Book(id=0, **book_data))
         return 201, book
 
+    def create_books(self, books_data: List[dict[str, Any]]) -> tuple[Literal[201], dict[str, Any]]:
+        result = self.book_use_case.create_books(books_data)
+        return 201, result
+
+    def update_books(self, updates: List[dict[str, Any]]) -> tuple[Literal[200], dict[str, Any]]:
+        result = self.book_use_case.update_books(updates)
+        return 200, result
+
+    def delete_books(self, book_ids: List[int]) -> tuple[Literal[200], dict[str, Any]]:
+        result = self.book_use_case.delete_books(book_ids)
+        return 200, result
+
     def list_books(self) -> tuple[Literal[200], List[dict[str, Any]]]:
         book = self.book_use_case.list_books()
         return 200, book
 
+    def stream_books(self) -> tuple[Literal[200], Iterator[dict[str, Any]]]:
+        books = self.book_use_case.iter_books()
+        return 200, books
+
+    def list_books_page(self, limit: int, after: int) -> tuple[Literal[200], dict[str, Any]]:
+        page = self.book_use_case.list_books_page(limit, after)
+        return 200, page
+
+    def query_books(self, params: dict[str, str]) -> tuple[Literal[200], Iterator[dict[str, Any]]]:
+        books = self.book_use_case.query_books(params)
+        return 200, books
+
+    def query_books_page(self, params: dict[str, str], limit: int, after: int) -> tuple[Literal[200], dict[str, Any]]:
+        page = self.book_use_case.query_books_page(params, limit, after)
+        return 200, page
+
+    def search_books(self, text: Optional[str], limit: int) -> tuple[Literal[200], List[dict[str, Any]]]:
+        books = self.book_use_case.search_books(text, limit)
+        return 200, books
+
     def get_by_id(self, book_id: int) -> tuple[Literal[200], dict[str, Any]]:
         book = self.book_use_case.get_by_id(book_id)
         return 200, book
@@ -0,0 +1,12 @@
+from typing import Any, Literal
+
+from backend.application.use_cases.stats_use_cases import StatsUseCases
+
+
+class StatsController:
+    def __init__(self, stats_use_cases: StatsUseCases):
+        self.stats_use_cases = stats_use_cases
+
+    def get_stats(self) -> tuple[Literal[200], dict[str, Any]]:
+        stats = self.stats_use_cases.get_stats()
+        return 200, stats
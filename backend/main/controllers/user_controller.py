@@ -1,4 +1,4 @@
-from typing import Any, List, Literal
+from typing import Any, Iterator, List, Literal
 
 from backend.application.use_cases.user_use_cases import UserUseCases
 from backend.domain.entities.user import User
@@ -20,10 +20,30 @@ class UserController:
         user = self.user_use_cases.login_user(email, password)
         return 200, user
 
+    def create_users(self, users_data: List[dict[str, Any]]) -> tuple[Literal[201], dict[str, Any]]:
+        result = self.user_use_cases.create_users(users_data)
+        return 201, result
+
+    def update_users(self, updates: List[dict[str, Any]]) -> tuple[Literal[200], dict[str, Any]]:
+        result = self.user_use_cases.update_users(updates)
+        return 200, result
+
+    def delete_users(self, user_ids: List[int]) -> tuple[Literal[200], dict[str, Any]]:
+        result = self.user_use_cases.delete_users(user_ids)
+        return 200, result
+
     def list_users(self) -> tuple[Literal[200], List[dict[str, Any]]]:
         user = self.user_use_cases.list_users()
         return 200, user
 
+    def stream_users(self) -> tuple[Literal[200], Iterator[dict[str, Any]]]:
+        users = self.user_use_cases.iter_users()
+        return 200, users
+
+    def list_users_page(self, limit: int, after: int) -> tuple[Literal[200], dict[str, Any]]:
+        page = self.user_use_cases.list_users_page(limit, after)
+        return 200, page
+
     def get_by_id(self, user_id: int) -> tuple[Literal[200], dict[str, Any]]:
         user = self.user_use_cases.get_by_id(user_id)
         return 200, user
@@ -0,0 +1,6 @@
+def admin_middleware(handler):  # type: ignore
+    def wrapper(request, controller, *args, **kwargs):  # type: ignore
+        controller.authorize(request.headers.get("Authorization"))
+        return handler(request, controller, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,43 @@
+from typing import Any
+
+from backend.main.controllers.admin_controller import AdminController
+from backend.main.middlewares.admin_middleware import admin_middleware
+from backend.main.routes.router import RouteTable
+
+table = RouteTable()
+route = table.route
+
+
+@route("/admin/snapshots", "GET", middlewares=[admin_middleware])
+def get_snapshots(request, controller: AdminController):  # pylint: disable = W0613   # type: ignore
+    def handler():
+        status, snapshots = controller.list_snapshots()
+        return status, snapshots
+
+    return handler
+
+
+@route("/admin/snapshots", "POST", middlewares=[admin_middleware])
+def post_snapshot(
+    request, controller: AdminController, snapshot_data: dict[str, Any]  # pylint: disable = W0613  # type: ignore
+):
+    def handler():
+        status, snapshot = controller.create_snapshot(snapshot_data)
+        return status, snapshot
+
+    return handler
+
+
+@route("/admin/snapshots/restore", "POST", middlewares=[admin_middleware])
+def post_snapshot_restore(
+    request, controller: AdminController, snapshot_data: dict[str, Any]  # pylint: disable = W0613  # type: ignore
+):
+    def handler():
+        status, snapshot = controller.restore_snapshot(snapshot_data)
+        return status, snapshot
+
+    return handler
+
+
+def get_admin_routes():
+    return table.routes
@@ -1,40 +1,47 @@
-import re
 from typing import Any
 
+from backend.application.services.book_query import BOOK_QUERY_PARAMS
+from backend.application.services.search import DEFAULT_SEARCH_RESULTS
 from backend.main.controllers.book_controller import BookController
+from backend.main.routes.router import RouteTable
 
-routes = []
+table = RouteTable()
+route = table.route
 
 
-def apply_middlewares(handler, middlewares):  # type: ignore
-    for middleware in middlewares:
-        handler = middleware(handler)
-    return handler
-
-
-def route(path: str, method: str, middlewares=None):  # type: ignore
-    if middlewares is None:
-        middlewares = []
-
-    def decorator(func):  # type: ignore
-        pattern = re.compile(re.sub(r"<(\w+)>", r"(?P<\1>\\d+)", path))
-        wrapped_func = apply_middlewares(func, middlewares)  # type: ignore
-        routes.append((pattern, method, wrapped_func))
-        return wrapped_func
+@route("/books", "GET")
+def get_all_books(request, controller: BookController):  # pylint: disable = W0613   # type: ignore
+    def handler():
+        limit = request.get_query_param("limit")
+        after = int(request.get_query_param("after", "0"))
+        # Filtros e ordenação vão para o repositório, que só materializa as linhas selecionadas
+        params = {name: request.get_query_param(name) for name in BOOK_QUERY_PARAMS if name in request.query}
+        if params:
+            if limit is not None:
+                status, page = controller.query_books_page(params, int(limit), after)
+                return status, page
+            status, books = controller.query_books(params)
+            return status, books
+        if limit is not None:
+            status, page = controller.list_books_page(int(limit), after)
+            return status, page
+        status, books = controller.stream_books()
+        return status, books
 
-    return decorator
+    return handler
 
 
-@route("/books", "GET")
-def get_all_books(request, controller: BookController):  # pylint: disable = W0613   # type: ignore
+@route("/books/search", "GET")
+def search_books(request, controller: BookController):  # pylint: disable = W0613   # type: ignore
     def handler():
-        status, books = controller.list_books()
+        limit = int(request.get_query_param("limit", str(DEFAULT_SEARCH_RESULTS)))
+        status, books = controller.search_books(request.get_query_param("q"), limit)
         return status, books
 
     return handler
 
 
-@route("/books/<id>", "GET")
+@route("/books/<int:id>", "GET")
 def get_books_by_id(
     request, controller: BookController, id: int  # pylint: disable = C0103, W0622, W0613   # type: ignore
 ):
@@ -45,7 +52,7 @@ def get_books_by_id(
     return handler
 
 
-@route("/books/user/<id>", "GET")
+@route("/books/user/<int:id>", "GET")
 def get_books_by_user_id(
     request, controller: BookController, id: int  # pylint: disable = C0103, W0622, W0613   # type: ignore
 ):
@@ -67,7 +74,7 @@ def post_book(
     return handler
 
 
-@route("/books/<id>", "PATCH")
+@route("/books/<int:id>", "PATCH")
 def patch_book(request, controller: BookController, id: int):  # pylint: disable = C0103, W0622, W0613   # type: ignore
     def handler(book_data: dict[str, Any]):
         status, books = controller.update_book(int(id), book_data)
@@ -76,7 +83,7 @@ def patch_book(request, controller: BookController, id: int):  # pylint: disable
     return handler
 
 
-@route("/books/toggle-status/<id>", "PATCH")
+@route("/books/toggle-status/<int:id>", "PATCH")
 def toggle_book_status(
     request, controller: BookController, id: int  # pylint: disable = C0103, W0622, W0613   # type: ignore
 ):
@@ -87,7 +94,7 @@ def toggle_book_status(
     return handler
 
 
-@route("/books/<id>", "DELETE")
+@route("/books/<int:id>", "DELETE")
 def delete_book(request, controller: BookController, id: int):  # pylint: disable = C0103, W0622, W0613   # type: ignore
     def handler():
         status, books = controller.delete_book(int(id))
@@ -96,5 +103,34 @@ def delete_book(request, controller: BookController, id: int):  # pylint: disabl
     return handler
 
 
+@route("/books/bulk", "POST")
+def post_books_bulk(
+    request, controller: BookController, books_data: list[dict[str, Any]]  # pylint: disable = W0613  # type: ignore
+):
+    def handler():
+        status, result = controller.create_books(books_data)
+        return status, result
+
+    return handler
+
+
+@route("/books/bulk", "PATCH")
+def patch_books_bulk(request, controller: BookController):  # pylint: disable = W0613   # type: ignore
+    def handler(updates: list[dict[str, Any]]):
+        status, result = controller.update_books(updates)
+        return status, result
+
+    return handler
+
+
+@route("/books/bulk", "DELETE")
+def delete_books_bulk(request, controller: BookController):  # pylint: disable = W0613   # type: ignore
+    def handler(book_ids: list[int]):
+        status, result = controller.delete_books(book_ids)
+        return status, result
+
+    return handler
+
+
 def get_books_routes():
-    return sorted(routes, key=lambda route: len(route[0].pattern), reverse=True)  # type: ignore
+    return table.routes
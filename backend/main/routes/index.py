@@ -1,27 +1,56 @@
+from typing import Optional
+
+from backend.main.controllers.admin_controller import AdminController
 from backend.main.controllers.book_controller import BookController
+from backend.main.controllers.stats_controller import StatsController
 from backend.main.controllers.user_controller import UserController
+from backend.main.routes.admin_routes import get_admin_routes
 from backend.main.routes.book_routes import get_books_routes
+from backend.main.routes.router import Router
+from backend.main.routes.stats_routes import get_stats_routes
 from backend.main.routes.user_routes import get_routes
 
-all_routes = []
+router = Router()
 
 
-def register_route(pattern, method, handler, controller):  # type: ignore
-    all_routes.append((pattern, method, handler, controller))
+def register_route(path, method, handler, controller):  # type: ignore
+    router.add(path, method, handler, controller)
 
 
 def register_user_routes(controller: UserController):
-    sorted_user_routes = get_routes()
-    for route in sorted_user_routes:
+    user_routes = get_routes()
+    for route in user_routes:
         register_route(*route, controller)
 
 
 def register_book_routes(controller: BookController):
-    sorted_book_routes = get_books_routes()
-    for route in sorted_book_routes:
+    book_routes = get_books_routes()
+    for route in book_routes:
+        register_route(*route, controller)
+
+
+def register_admin_routes(controller: AdminController):
+    admin_routes = get_admin_routes()
+    for route in admin_routes:
+        register_route(*route, controller)
+
+
+def register_stats_routes(controller: StatsController):
+    stats_routes = get_stats_routes()
+    for route in stats_routes:
         register_route(*route, controller)
 
 
-def register_routes(user_controller: UserController, book_controller: BookController):
+def register_routes(
+    user_controller: UserController,
+    book_controller: BookController,
+    admin_controller: Optional[AdminController] = None,
+    stats_controller: Optional[StatsController] = None,
+):
     register_user_routes(user_controller)
     register_book_routes(book_controller)
+    if stats_controller is not None:
+        register_stats_routes(stats_controller)
+    # Rotas administrativas só existem quando há um token configurado
+    if admin_controller is not None:
+        register_admin_routes(admin_controller)
@@ -0,0 +1,110 @@
+import logging
+import re
+from typing import Any, Callable, Optional
+
+# Criar um logger
+logger = logging.getLogger("router")
+
+# Parâmetro de caminho: <nome> ou <tipo:nome>
+PARAM_PATTERN = re.compile(r"<(?:(\w+):)?(\w+)>")
+
+
+def to_int(segment: str) -> int:
+    # int() aceitaria "+1", " 1" e "1_000"; no caminho só dígitos ASCII
+    if not (segment.isascii() and segment.isdigit()):
+        raise ValueError(f"Not an integer: {segment}")
+    return int(segment)
+
+
+CONVERTERS: dict[str, Callable[[str], Any]] = {"int": to_int, "str": str}
+
+
+def split_path(path: str) -> list[str]:
+    # A barra final é ignorada: "/books/" é "/books"
+    return path.strip("/").split("/") if path.strip("/") else []
+
+
+def apply_middlewares(handler, middlewares):  # type: ignore
+    for middleware in middlewares:
+        handler = middleware(handler)
+    return handler
+
+
+# Rotas declaradas num módulo (user_routes, book_routes...) com o decorador route; o
+# register_routes do index as liga a um controller no Router
+class RouteTable:
+    def __init__(self):
+        self.routes: list[tuple[str, str, Any]] = []
+
+    def route(self, path: str, method: str, middlewares=None):  # type: ignore
+        def decorator(func):  # type: ignore
+            wrapped_func = apply_middlewares(func, middlewares or [])  # type: ignore
+            self.routes.append((path, method, wrapped_func))
+            return wrapped_func
+
+        return decorator
+
+
+class RouteNode:
+    __slots__ = ("static", "params", "methods")
+
+    def __init__(self):
+        self.static: dict[str, RouteNode] = {}
+        # (tipo, nome, conversor, filho); os segmentos fixos têm prioridade sobre os parâmetros
+        self.params: list[tuple[str, str, Callable[[str], Any], RouteNode]] = []
+        # método -> (handler, controller)
+        self.methods: dict[str, tuple[Any, Any]] = {}
+
+
+# Árvore de segmentos do caminho: resolver custa um acesso a dicionário por segmento, não um
+# regex por rota, e o caminho inteiro precisa casar ("/books" não engole "/books/1").
+class Router:
+    def __init__(self):
+        self._root = RouteNode()
+
+    def add(self, path: str, method: str, handler: Any, controller: Any):
+        node = self._root
+        for segment in split_path(path):
+            param = PARAM_PATTERN.fullmatch(segment)
+            if param is None:
+                node = node.static.setdefault(segment, RouteNode())
+                continue
+            kind, name = param.group(1) or "str", param.group(2)
+            if kind not in CONVERTERS:
+                raise ValueError(f"Unknown path parameter type: {kind}")
+            child = next((entry[3] for entry in node.params if entry[:2] == (kind, name)), None)
+            if child is None:
+                child = RouteNode()
+                node.params.append((kind, name, CONVERTERS[kind], child))
+            node = child
+        if method in node.methods:
+            logger.warning(f"Route replaced: method={method}, path={path}")
+        node.methods[method] = (handler, controller)
+
+    def resolve(self, path: str) -> Optional[tuple[dict[str, tuple[Any, Any]], dict[str, Any]]]:
+        # (handlers por método, parâmetros convertidos), ou None quando nenhuma rota casa o caminho
+        params: dict[str, Any] = {}
+        node = self._match(self._root, split_path(path), 0, params)
+        return None if node is None else (node.methods, params)
+
+    def _match(self, node: RouteNode, segments: list[str], index: int, params: dict[str, Any]) -> Optional[RouteNode]:
+        if index == len(segments):
+            return node if node.methods else None
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None and (found := self._match(child, segments, index + 1, params)) is not None:
+            return found
+        for _, name, converter, child in node.params:
+            try:
+                params[name] = converter(segment)
+            except ValueError:
+                continue
+            if (found := self._match(child, segments, index + 1, params)) is not None:
+                return found
+            del params[name]
+        return None
+
+
+def allowed_methods(methods: dict[str, Any]) -> str:
+    # Valor do cabeçalho Allow de um 405; OPTIONS é respondido para qualquer caminho
+    return ", ".join([*sorted(methods), "OPTIONS"])
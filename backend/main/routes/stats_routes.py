@@ -0,0 +1,18 @@
+from backend.main.controllers.stats_controller import StatsController
+from backend.main.routes.router import RouteTable
+
+table = RouteTable()
+route = table.route
+
+
+@route("/stats", "GET")
+def get_stats(request, controller: StatsController):  # pylint: disable = W0613   # type: ignore
+    def handler():
+        status, stats = controller.get_stats()
+        return status, stats
+
+    return handler
+
+
+def get_stats_routes():
+    return table.routes
@@ -1,41 +1,27 @@
-import re
 from typing import Any
 
 from backend.main.controllers.user_controller import UserController
 from backend.main.middlewares.session_middleware import session_middleware
+from backend.main.routes.router import RouteTable
 
-routes = []
-
-
-def apply_middlewares(handler, middlewares):  # type: ignore
-    for middleware in middlewares:
-        handler = middleware(handler)
-    return handler
-
-
-def route(path: str, method: str, middlewares=None):  # type: ignore
-    if middlewares is None:
-        middlewares = []
-
-    def decorator(func):  # type: ignore
-        pattern = re.compile(re.sub(r"<(\w+)>", r"(?P<\1>\\d+)", path))
-        wrapped_func = apply_middlewares(func, middlewares)  # type: ignore
-        routes.append((pattern, method, wrapped_func))
-        return wrapped_func
-
-    return decorator
+table = RouteTable()
+route = table.route
 
 
 @route("/users", "GET")
 def get_users(request, controller: UserController):  # pylint: disable = W0613   # type: ignore
     def handler():
-        status, user = controller.list_users()
+        limit = request.get_query_param("limit")
+        if limit is not None:
+            status, page = controller.list_users_page(int(limit), int(request.get_query_param("after", "0")))
+            return status, page
+        status, user = controller.stream_users()
         return status, user
 
     return handler
 
 
-@route("/users/<id>", "GET")
+@route("/users/<int:id>", "GET")
 def get_users_by_id(
     request, controller: UserController, id: int  # pylint: disable = C0103, W0622, W0613   # type: ignore
 ):
@@ -68,7 +54,7 @@ def login_user(
     return handler
 
 
-@route("/users/<id>", "PATCH")
+@route("/users/<int:id>", "PATCH")
 def patch_user(request, controller: UserController, id: int):  # pylint: disable = C0103, W0622, W0613   # type: ignore
     def handler(user_data: dict[str, Any]):
         status, user = controller.update_user(int(id), user_data)
@@ -77,7 +63,7 @@ def patch_user(request, controller: UserController, id: int):  # pylint: disable
     return handler
 
 
-@route("/users/<id>", "DELETE")
+@route("/users/<int:id>", "DELETE")
 def delete_user(request, controller: UserController, id: int):  # pylint: disable = C0103, W0622, W0613   # type: ignore
     def handler():
         status, user = controller.delete_user(int(id))
@@ -86,5 +72,34 @@ def delete_user(request, controller: UserController, id: int):  # pylint: disabl
     return handler
 
 
+@route("/users/bulk", "POST")
+def post_users_bulk(
+    request, controller: UserController, users_data: list[dict[str, Any]]  # pylint: disable = W0613  # type: ignore
+):
+    def handler():
+        status, result = controller.create_users(users_data)
+        return status, result
+
+    return handler
+
+
+@route("/users/bulk", "PATCH")
+def patch_users_bulk(request, controller: UserController):  # pylint: disable = W0613   # type: ignore
+    def handler(updates: list[dict[str, Any]]):
+        status, result = controller.update_users(updates)
+        return status, result
+
+    return handler
+
+
+@route("/users/bulk", "DELETE")
+def delete_users_bulk(request, controller: UserController):  # pylint: disable = W0613   # type: ignore
+    def handler(user_ids: list[int]):
+        status, result = controller.delete_users(user_ids)
+        return status, result
+
+    return handler
+
+
 def get_routes():
-    return sorted(routes, key=lambda route: len(route[0].pattern), reverse=True)  # type: ignore
+    return table.routes
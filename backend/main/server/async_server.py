@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import socket
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from http import HTTPStatus
+from http.client import HTTPMessage
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from backend.infrastructure.storage.fast_json import dumps, loads
+from backend.main.routes.router import Router, allowed_methods
+from backend.main.server.responses import (
+    CORS_HEADERS,
+    KEEP_ALIVE_TIMEOUT,
+    MAX_KEEP_ALIVE_REQUESTS,
+    HTTPError,
+    json_array_chunks,
+    keep_alive_value,
+)
+
+# Criar um logger
+logger = logging.getLogger("async_server")
+
+# Limite da linha de requisição + cabeçalhos; acima disso a conexão é encerrada
+MAX_HEAD_SIZE = 64 * 1024
+
+
+class AsyncRequest:
+    # O que as rotas e middlewares usam do RequestHandler: query, headers e get_query_param
+    __slots__ = ("method", "path", "query", "headers", "request_version")
+
+    def __init__(self, method: str, path: str, query: dict[str, list[str]], headers: HTTPMessage, version: str):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.request_version = version
+
+    def get_query_param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+
+def call_route(request: AsyncRequest, handler: Any, params: dict[str, str], controller: Any, body: bytes) -> Any:
+    # Mesma convenção de chamada do RequestHandler; roda no executor porque os controllers bloqueiam
+    method = request.method
+    if method == "POST":
+        status_code, response = handler(request, controller, loads(body))()
+    elif method in ("PUT", "PATCH"):
+        status_code, response = handler(request, controller, **params)(loads(body))
+    elif method == "DELETE":
+        args = [loads(body)] if body else []
+        status_code, response = handler(request, controller, **params)(*args)
+    else:
+        status_code, response = handler(request, controller, **params)()
+    if isinstance(response, Iterator):
+        # O primeiro item é lido antes dos cabeçalhos: erros do repositório ainda viram 400/500
+        return status_code, json_array_chunks(next(response, None), response)
+    return status_code, dumps(response)
+
+
+def response_head(status_code: int, headers: list[tuple[str, str]], keep_alive: Optional[str]) -> bytes:
+    # keep_alive: valor do cabeçalho Keep-Alive, ou None quando a conexão fecha depois desta resposta
+    lines = [f"HTTP/1.1 {status_code} {HTTPStatus(status_code).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    lines.extend(f"{name}: {value}" for name, value in CORS_HEADERS)
+    if keep_alive is None:
+        lines.append("Connection: close")
+    else:
+        lines.append("Connection: keep-alive")
+        lines.append(f"Keep-Alive: {keep_alive}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+# Servidor HTTP/1.1 sobre asyncio streams: uma corrotina por conexão em vez de uma thread, então
+# conexões ociosas (keep-alive do dashboard) custam só um socket. As chamadas aos controllers, que
+# bloqueiam em locks e disco, vão para um ThreadPoolExecutor. A interface (serve_forever, shutdown,
+# server_close) é a do socketserver, para o run() e os testes tratarem os motores igualmente.
+class AsyncHTTPServer:
+    def __init__(
+        self,
+        server_address: Any,
+        router: Router,
+        workers: Optional[int] = None,
+        idle_timeout: float = KEEP_ALIVE_TIMEOUT,
+        max_requests: int = MAX_KEEP_ALIVE_REQUESTS,
+        reuse_port: bool = False,
+    ):
+        self.router = router
+        self.idle_timeout = idle_timeout
+        self.max_requests = max_requests
+        self.socket = socket.create_server(server_address, backlog=1024, reuse_port=reuse_port)
+        self.server_address = self.socket.getsockname()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http-blocking")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._stopped = threading.Event()
+
+    def serve_forever(self):
+        self._stopped.clear()
+        try:
+            asyncio.run(self._serve())
+        finally:
+            self._stopped.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._handle_connection, sock=self.socket, limit=MAX_HEAD_SIZE)
+        logger.info(f"Async server listening on: {self.server_address}")
+        async with server:
+            await self._stop.wait()
+
+    def shutdown(self):
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+            self._stopped.wait()
+
+    def server_close(self):
+        self.socket.close()
+        self._executor.shutdown(wait=False)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            # Pipelining: as requisições são lidas do stream e respondidas uma de cada vez, em ordem
+            remaining = self.max_requests
+            while remaining > 0 and await self._handle_request(reader, writer, remaining - 1):
+                remaining -= 1
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+            # Cliente fechou, mandou cabeçalhos grandes demais ou ficou ocioso além do limite
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, remaining: int) -> bool:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.idle_timeout)
+        request_line, _, header_block = head.partition(b"\r\n")
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            await self._send(writer, 400, "text/plain", b"Bad Request", None)
+            return False
+        method, target, version = parts
+        headers = BytesParser(_class=HTTPMessage).parsebytes(header_block)
+        connection = (headers.get("Connection") or "").lower()
+        persistent = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+        # Corpo chunked não é suportado: sem como achar o fim dele, a conexão não é reaproveitada
+        persistent = persistent and remaining > 0 and "Transfer-Encoding" not in headers
+        keep_alive = keep_alive_value(self.idle_timeout, remaining) if persistent else None
+        try:
+            length = int(headers.get("Content-Length") or 0)
+        except ValueError:
+            await self._send(writer, 400, "text/plain", b"Bad Request", None)
+            return False
+        body = await reader.readexactly(length) if length > 0 else b""
+        url = urlsplit(target)
+        request = AsyncRequest(method, url.path, parse_qs(url.query), headers, version)
+        return await self._dispatch(request, body, writer, keep_alive)
+
+    async def _dispatch(
+        self, request: AsyncRequest, body: bytes, writer: asyncio.StreamWriter, keep_alive: Optional[str]
+    ) -> bool:
+        method, path = request.method, request.path
+        if method == "OPTIONS":
+            await self._send(writer, 200, None, b"", keep_alive)
+            return keep_alive is not None
+        resolved = self.router.resolve(path)
+        if resolved is None:
+            logger.warning(f"Route not found: path={path}, method={method}")
+            await self._send(writer, 404, "text/plain", b"Not Found", keep_alive)
+            return keep_alive is not None
+        methods, params = resolved
+        if method not in methods:
+            logger.warning(f"Method not allowed: path={path}, method={method}")
+            allow = [("Allow", allowed_methods(methods))]
+            await self._send(writer, 405, "text/plain", b"Method Not Allowed", keep_alive, allow)
+            return keep_alive is not None
+        handler, controller = methods[method]
+        loop = asyncio.get_running_loop()
+        headers: list[tuple[str, str]] = []
+        try:
+            status_code, response = await loop.run_in_executor(
+                self._executor, call_route, request, handler, params, controller, body
+            )
+        except HTTPError as error:
+            logger.warning(f"HTTPError {error.status_code}: {error}")
+            status_code, response = error.status_code, dumps({"error": str(error)})
+            headers.extend(error.headers)
+        except ValueError as error:
+            logger.error(f"ValueError: {error}")
+            status_code, response = 400, dumps({"error": str(error)})
+        except Exception as error:  # pylint: disable = W0718
+            logger.error(f"Unhandled exception: {error}")
+            status_code, response = 500, dumps({"error": str(error)})
+        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+        if isinstance(response, Iterator):
+            return await self._send_stream(writer, status_code, response, keep_alive, request.request_version)
+        await self._send(writer, status_code, "application/json", response, keep_alive, headers)
+        return keep_alive is not None
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status_code: int,
+        content_type: Optional[str],
+        body: bytes,
+        keep_alive: Optional[str],
+        extra_headers: Optional[list[tuple[str, str]]] = None,
+    ):
+        headers = [("Content-type", content_type)] if content_type else []
+        headers.extend(extra_headers or [])
+        headers.append(("Content-Length", str(len(body))))
+        writer.write(response_head(status_code, headers, keep_alive) + body)
+        await writer.drain()
+
+    async def _send_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        status_code: int,
+        chunks: Iterator[bytes],
+        keep_alive: Optional[str],
+        version: str,
+    ) -> bool:
+        # Clientes HTTP/1.0 não entendem chunked: o fim da resposta é o fechamento da conexão
+        chunked = version != "HTTP/1.0"
+        keep_alive = keep_alive if chunked else None
+        headers = [("Content-type", "application/json")]
+        if chunked:
+            headers.append(("Transfer-Encoding", "chunked"))
+        writer.write(response_head(status_code, headers, keep_alive))
+        loop = asyncio.get_running_loop()
+        try:
+            # Cada bloco é codificado no executor: a iteração lê o repositório
+            while (chunk := await loop.run_in_executor(self._executor, next, chunks, None)) is not None:
+                writer.write(b"%X\r\n%s\r\n" % (len(chunk), chunk) if chunked else chunk)
+                await writer.drain()
+            if chunked:
+                writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception as error:  # pylint: disable = W0718
+            # Os cabeçalhos já foram enviados: sem o chunk final o cliente percebe a resposta incompleta
+            logger.error(f"Streamed response aborted: {error}")
+            return False
+        return keep_alive is not None
@@ -0,0 +1,172 @@
+import logging
+import os
+import queue
+import socket
+import threading
+from http.server import HTTPServer, ThreadingHTTPServer
+from typing import Any, Optional, Union
+
+from backend.infrastructure.storage.fast_json import dumps
+from backend.main.server.async_server import AsyncHTTPServer
+
+# Criar um logger
+logger = logging.getLogger("engines")
+
+# Tempo máximo que o thread de accept gasta entregando um 503: um cliente lento não o segura
+REJECT_TIMEOUT = 0.05
+# No motor "pool" uma conexão persistente ociosa segura um worker: a espera pela próxima requisição é curta
+POOL_KEEP_ALIVE_TIMEOUT = 1.0
+
+
+def overloaded_response(retry_after: int) -> bytes:
+    body = dumps({"error": "Server overloaded"})
+    head = (
+        "HTTP/1.1 503 Service Unavailable\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Retry-After: {retry_after}\r\n"
+        "Access-Control-Allow-Origin: *\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+# socketserver só lê allow_reuse_port a partir do Python 3.11: a opção é ligada aqui, antes do bind
+class ReusePortMixin:
+    reuse_port = False
+
+    def server_bind(self):
+        if self.reuse_port:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)  # type: ignore
+        super().server_bind()  # type: ignore
+
+
+class ReusePortThreadingHTTPServer(ReusePortMixin, ThreadingHTTPServer):
+    pass
+
+
+# Número fixo de workers atrás de uma fila limitada de conexões aceitas. Com a fila cheia a
+# conexão nova recebe um 503 com Retry-After na hora, sem esperar um worker: a latência de
+# quem foi aceito continua previsível e a sobrecarga não vira uma pilha de threads.
+class PooledHTTPServer(ReusePortMixin, HTTPServer):
+    keep_alive_timeout = POOL_KEEP_ALIVE_TIMEOUT
+
+    def __init__(
+        self,
+        server_address: Any,
+        handler_class: Any,
+        workers: int = 8,
+        queue_size: int = 64,
+        retry_after: int = 1,
+        reuse_port: bool = False,
+    ):
+        if workers < 1 or queue_size < 1:
+            raise ValueError("workers and queue_size must be positive")
+        self.reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self.queue_size = queue_size
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._overloaded = overloaded_response(retry_after)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"http-worker-{number}", daemon=True) for number in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Worker pool started: workers={workers}, queue_size={queue_size}")
+
+    def process_request(self, request: Any, client_address: Any):
+        try:
+            self._queue.put_nowait((request, client_address))
+        except queue.Full:
+            self._reject(request, client_address)
+
+    def saturated(self) -> bool:
+        # Com conexões esperando na fila, a resposta atual fecha a conexão e libera o worker
+        return not self._queue.empty()
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:  # pylint: disable = W0703
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def _reject(self, request: socket.socket, client_address: Any):
+        logger.warning(f"Queue full, shedding connection from: {client_address}")
+        try:
+            # Descarta o que já chegou da requisição: fechar com dados não lidos manda um RST,
+            # e o cliente poderia perder o 503
+            request.setblocking(False)
+            try:
+                while request.recv(65536):
+                    pass
+            except (BlockingIOError, InterruptedError):
+                pass
+            request.settimeout(REJECT_TIMEOUT)
+            request.sendall(self._overloaded)
+        except OSError:
+            pass
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(1)
+
+
+SERVER_ENGINES = ("threading", "pool", "asyncio")
+
+
+def create_server(
+    server_address: Any,
+    handler_class: Any,
+    engine: str = "threading",
+    workers: Optional[int] = None,
+    queue_size: Optional[int] = None,
+    retry_after: int = 1,
+    reuse_port: bool = False,
+) -> Union[HTTPServer, AsyncHTTPServer]:
+    # "threading": uma thread por conexão, sem limite; "pool": PooledHTTPServer; "asyncio": AsyncHTTPServer.
+    # reuse_port=True (SO_REUSEPORT) deixa vários processos abrirem a mesma porta; o kernel divide as conexões
+    if engine == "threading":
+        httpd = ReusePortThreadingHTTPServer(server_address, handler_class, bind_and_activate=False)
+        httpd.reuse_port = reuse_port
+        # Num worker do pre-fork, server_close espera as requisições em andamento (parada e reload graciosos)
+        httpd.daemon_threads = not reuse_port
+        try:
+            httpd.server_bind()
+            httpd.server_activate()
+        except BaseException:
+            httpd.server_close()
+            raise
+        return httpd
+    if engine == "pool":
+        return PooledHTTPServer(
+            server_address,
+            handler_class,
+            workers=workers or default_workers(),
+            queue_size=queue_size or 64,
+            retry_after=retry_after,
+            reuse_port=reuse_port,
+        )
+    if engine == "asyncio":
+        # As rotas são as mesmas do RequestHandler; o handler_class só empresta o router
+        return AsyncHTTPServer(
+            server_address, handler_class.router, workers=workers or default_workers(), reuse_port=reuse_port
+        )
+    raise ValueError(f"Unknown server engine: {engine}")
+
+
+def default_workers() -> int:
+    # Os handlers passam boa parte do tempo em I/O (socket, disco): mais threads que núcleos
+    return min(32, (os.cpu_count() or 1) * 4)
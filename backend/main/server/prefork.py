@@ -0,0 +1,193 @@
+import logging
+import os
+import select
+import signal
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable
+
+# Criar um logger
+logger = logging.getLogger("prefork")
+
+# Tratados no laço do supervisor com sigtimedwait: ficam bloqueados, sem handlers assíncronos
+SUPERVISOR_SIGNALS = {signal.SIGCHLD, signal.SIGHUP, signal.SIGTERM, signal.SIGINT}
+# Um worker que morre com menos que isso de vida é uma falha de inicialização: o próximo espera
+# RESTART_DELAY, para um erro de configuração não virar um laço de forks
+MIN_UPTIME = 1.0
+RESTART_DELAY = 1.0
+
+
+@dataclass(slots=True)
+class Worker:
+    pid: int
+    slot: int
+    started: float
+    # Leitura do pipe em que o worker avisa que já está escutando
+    ready_fd: int
+
+
+# Supervisor do modo pre-fork: mantém N processos rodando target(ready=...), cada um com o seu
+# socket na mesma porta (SO_REUSEPORT). Worker que morre é reposto; SIGHUP sobe uma geração
+# nova e só depois de ela estar escutando manda SIGTERM para a antiga (reload sem recusar
+# conexões); SIGTERM/SIGINT param todos e esperam as requisições em andamento.
+@dataclass
+class Supervisor:
+    target: Callable[..., None]
+    workers: int
+    ready_timeout: float = 30.0
+    stop_timeout: float = 30.0
+    _current: dict[int, Worker] = field(init=False, default_factory=dict)
+    _retiring: set[int] = field(init=False, default_factory=set)
+    # slot -> instante em que o worker deve ser reposto
+    _respawn: dict[int, float] = field(init=False, default_factory=dict)
+    _mask: set[signal.Signals] = field(init=False, default_factory=set)
+
+    def run(self):
+        if self.workers < 1:
+            raise ValueError("At least one worker process is required")
+        self._mask = signal.pthread_sigmask(signal.SIG_BLOCK, SUPERVISOR_SIGNALS)
+        try:
+            started = [self._spawn(slot) for slot in range(self.workers)]
+            logger.info(f"Workers ready: {len(self._wait_ready(started))}/{self.workers}")
+            while True:
+                received = signal.sigtimedwait(SUPERVISOR_SIGNALS, self._next_timeout())
+                self._reap()
+                self._respawn_due()
+                if received is None or received.si_signo == signal.SIGCHLD:
+                    continue
+                if received.si_signo == signal.SIGHUP:
+                    self._reload()
+                else:
+                    self._stop()
+                    return
+        finally:
+            signal.pthread_sigmask(signal.SIG_SETMASK, self._mask)
+
+    def _spawn(self, slot: int) -> Worker:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._run_worker(write_fd)
+        os.close(write_fd)
+        worker = Worker(pid=pid, slot=slot, started=time.monotonic(), ready_fd=read_fd)
+        self._current[pid] = worker
+        logger.info(f"Started worker {pid} (slot {slot})")
+        return worker
+
+    def _run_worker(self, ready_fd: int):
+        code = 0
+        try:
+            # Ctrl+C e o hangup do terminal chegam ao grupo todo: quem decide parar os workers é o supervisor
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.pthread_sigmask(signal.SIG_SETMASK, self._mask)
+            self.target(ready=partial(notify_ready, ready_fd))
+        except BaseException as error:  # pylint: disable = W0718
+            logger.error(f"Worker {os.getpid()} failed: {error}")
+            code = 1
+        finally:
+            # Nunca volta para o código do supervisor
+            os._exit(code)  # pylint: disable = W0212
+
+    def _wait_ready(self, workers: list[Worker]) -> list[Worker]:
+        pending = {worker.ready_fd: worker for worker in workers}
+        ready = []
+        deadline = time.monotonic() + self.ready_timeout
+        while pending and (remaining := deadline - time.monotonic()) > 0:
+            readable, _, _ = select.select(list(pending), [], [], remaining)
+            for fd in readable:  # pylint: disable = C0103
+                worker = pending.pop(fd)
+                # EOF sem o aviso: o worker morreu antes de escutar
+                if os.read(fd, 1):
+                    ready.append(worker)
+                os.close(fd)
+        for fd in pending:  # pylint: disable = C0103
+            os.close(fd)
+        return ready
+
+    def _next_timeout(self) -> float:
+        if not self._respawn:
+            return 1.0
+        return max(0.0, min(self._respawn.values()) - time.monotonic())
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            code = os.waitstatus_to_exitcode(status)
+            if pid in self._retiring:
+                self._retiring.discard(pid)
+                logger.info(f"Worker {pid} retired with code {code}")
+                continue
+            worker = self._current.pop(pid, None)
+            if worker is None:
+                continue
+            logger.warning(f"Worker {pid} exited with code {code}, restarting slot {worker.slot}")
+            delay = RESTART_DELAY if time.monotonic() - worker.started < MIN_UPTIME else 0.0
+            self._respawn[worker.slot] = time.monotonic() + delay
+
+    def _respawn_due(self):
+        now = time.monotonic()
+        for slot, due in list(self._respawn.items()):
+            if due <= now:
+                del self._respawn[slot]
+                os.close(self._spawn(slot).ready_fd)
+
+    def _reload(self):
+        logger.info("Reloading workers")
+        previous, self._current = self._current, {}
+        pending_slots, self._respawn = self._respawn, {}
+        started = [self._spawn(slot) for slot in range(self.workers)]
+        ready = self._wait_ready(started)
+        if len(ready) < len(started):
+            # A geração nova não subiu inteira: a antiga continua atendendo
+            logger.error(f"Reload aborted: {len(ready)}/{len(started)} new workers ready")
+            self._signal(list(self._current), signal.SIGTERM)
+            self._retiring.update(self._current)
+            self._current, self._respawn = previous, pending_slots
+            return
+        self._signal(list(previous), signal.SIGTERM)
+        self._retiring.update(previous)
+        logger.info(f"Reload complete: {len(ready)} workers")
+
+    def _stop(self):
+        pids = set(self._current) | self._retiring
+        logger.info(f"Stopping {len(pids)} workers")
+        self._signal(list(pids), signal.SIGTERM)
+        deadline = time.monotonic() + self.stop_timeout
+        while pids and time.monotonic() < deadline:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.05)
+            pids.discard(pid)
+        for pid in pids:
+            logger.warning(f"Worker {pid} did not stop in time, killing it")
+            self._signal([pid], signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._current.clear()
+        self._retiring.clear()
+
+    def _signal(self, pids: list[int], signum: signal.Signals):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def notify_ready(fd: int):  # pylint: disable = C0103
+    try:
+        os.write(fd, b"1")
+        os.close(fd)
+    except OSError:
+        # O supervisor já não espera por este aviso (worker reposto depois de uma falha)
+        pass
@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from itertools import chain, islice
+from typing import Any, Optional
+
+from backend.infrastructure.storage.fast_json import dumps
+
+# Tamanho do bloco acumulado antes de cada escrita no socket em respostas em streaming
+STREAM_BUFFER_SIZE = 64 * 1024
+# Itens codificados por chamada ao encoder JSON em respostas em streaming
+STREAM_BATCH_SIZE = 256
+
+# Conexões persistentes: ociosa por mais que KEEP_ALIVE_TIMEOUT segundos, ou depois de
+# MAX_KEEP_ALIVE_REQUESTS respostas, a conexão é fechada (o cliente abre outra)
+KEEP_ALIVE_TIMEOUT = 15.0
+MAX_KEEP_ALIVE_REQUESTS = 100
+
+CORS_HEADERS = (
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, PATCH, DELETE, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type, Authorization, Session-ID"),
+)
+
+
+# Erro com status próprio, levantado por controllers e middlewares (ex.: 401/403 da área
+# administrativa); ValueError continua sendo 400
+class HTTPError(Exception):
+    def __init__(self, status_code: int, message: str, headers: tuple[tuple[str, str], ...] = ()):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers
+
+
+def keep_alive_value(timeout: float, remaining: int) -> str:
+    return f"timeout={int(timeout)}, max={remaining}"
+
+
+def batched(items: Iterator[Any], size: int) -> Iterator[list[Any]]:
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def json_array_chunks(first: Optional[Any], items: Iterator[Any]) -> Iterator[bytes]:
+    # Array JSON em blocos de ~STREAM_BUFFER_SIZE; os itens são codificados em lotes: uma chamada
+    # ao encoder por lote, sem os colchetes
+    buffer = bytearray(b"[")
+    if first is not None:
+        separator = b""
+        for batch in chain([[first]], batched(items, STREAM_BATCH_SIZE)):
+            buffer += separator
+            buffer += dumps(batch)[1:-1]
+            separator = b","
+            if len(buffer) >= STREAM_BUFFER_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+    buffer += b"]"
+    yield bytes(buffer)
@@ -1,9 +1,34 @@
-import json
 import logging
+import signal
+import threading
+from collections.abc import Callable, Iterator
+from functools import partial
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
 
-from backend.main.config.config import configure_book_dependencies, configure_user_dependencies
-from backend.main.routes.index import all_routes, register_routes
+from backend.infrastructure.storage.fast_json import dumps, loads
+from backend.main.config.config import (
+    configure_admin_dependencies,
+    configure_book_dependencies,
+    configure_stats_dependencies,
+    configure_user_dependencies,
+    get_server_options,
+    get_worker_processes,
+    warm_start,
+)
+from backend.main.routes.index import register_routes, router
+from backend.main.routes.router import allowed_methods
+from backend.main.server.engines import create_server
+from backend.main.server.prefork import Supervisor
+from backend.main.server.responses import (
+    CORS_HEADERS,
+    KEEP_ALIVE_TIMEOUT,
+    MAX_KEEP_ALIVE_REQUESTS,
+    HTTPError,
+    json_array_chunks,
+    keep_alive_value,
+)
 
 # Configuração básica do logging
 logging.basicConfig(
@@ -18,24 +43,125 @@ logger = logging.getLogger("server")
 
 
 class RequestHandler(BaseHTTPRequestHandler):
-    routes = all_routes
+    router = router
+    # HTTP/1.1: conexões persistentes (e pipelining, atendido em ordem) e respostas chunked
+    protocol_version = "HTTP/1.1"
+    # Espera máxima pela próxima requisição numa conexão ociosa (timeout do socket)
+    timeout = KEEP_ALIVE_TIMEOUT
+    max_requests = MAX_KEEP_ALIVE_REQUESTS
+    # Cabeçalhos e corpo saem em writes separados: com Nagle, numa conexão reaproveitada o corpo
+    # esperaria o ACK atrasado do cliente (~40 ms por resposta)
+    disable_nagle_algorithm = True
+    query: dict[str, list[str]] = {}
+    requests_served = 0
+    _body: Optional[bytes] = None
 
-    def _send_response(self, status_code: int, content_type: str, data: str):
-        logger.debug(f"Sending response: status_code={status_code}, content_type={content_type}")
+    def setup(self):
+        # O motor pode encurtar a espera ociosa (ver PooledHTTPServer: a conexão parada segura um worker)
+        self.timeout = getattr(self.server, "keep_alive_timeout", self.timeout)
+        super().setup()
+
+    def get_query_param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        values = self.query.get(name)
+        return values[-1] if values else default
+
+    def _read_body(self) -> bytes:
+        if self._body is None:
+            if "Transfer-Encoding" in self.headers:
+                # Corpo chunked não é suportado: sem como achar o fim dele, a conexão não é reaproveitada
+                self.close_connection = True
+                self._body = b""
+                return self._body
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                self.close_connection = True
+                raise
+            self._body = self.rfile.read(length) if length > 0 else b""
+        return self._body
+
+    def _consume_body(self) -> bool:
+        # O corpo é sempre lido, mesmo quando a rota não o usa (ou não existe): o que sobrasse no
+        # socket seria lido como a próxima requisição da conexão
+        self._body = None
+        try:
+            self._read_body()
+        except ValueError:
+            logger.warning(f"Invalid Content-Length: {self.headers.get('Content-Length')}")
+            self._send_response(400, "text/plain", "Bad Request")
+            return False
+        return True
+
+    def _send_headers(self, status_code: int, content_type: str):
         self.send_response(status_code)
         self.send_header("Content-type", content_type)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, DELETE, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, Session-ID")
+        for name, value in CORS_HEADERS:
+            self.send_header(name, value)
+        self._send_connection_headers()
+
+    def _send_connection_headers(self):
+        # A conexão continua aberta até o cliente pedir close (ou ser HTTP/1.0 sem keep-alive),
+        # o limite de requisições por conexão ou o timeout ocioso
+        self.requests_served += 1
+        saturated = getattr(self.server, "saturated", None)
+        if self.requests_served >= self.max_requests or (saturated is not None and saturated()):
+            self.close_connection = True
+        if self.close_connection:
+            self.send_header("Connection", "close")
+            return
+        self.send_header("Connection", "keep-alive")
+        self.send_header("Keep-Alive", keep_alive_value(self.timeout, self.max_requests - self.requests_served))
+
+    def _send_response(
+        self, status_code: int, content_type: str, data: str | bytes, headers: tuple[tuple[str, str], ...] = ()
+    ):
+        logger.debug(f"Sending response: status_code={status_code}, content_type={content_type}")
+        body = data if isinstance(data, bytes) else data.encode("utf-8")
+        self._send_headers(status_code, content_type)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
         self.end_headers()
-        self.wfile.write(data.encode("utf-8"))
+        self.wfile.write(body)
+
+    def _send_stream(self, status_code: int, items: Iterator[Any]):
+        # O primeiro item é lido antes dos cabeçalhos: erros do repositório ainda viram 400/500
+        first = next(items, None)
+        logger.debug(f"Sending streamed response: status_code={status_code}")
+        # Clientes HTTP/1.0 não entendem chunked: o fim da resposta é o fechamento da conexão
+        chunked = self.request_version != "HTTP/1.0"
+        if not chunked:
+            self.close_connection = True
+        self._send_headers(status_code, "application/json")
+        if chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in json_array_chunks(first, items):
+                self._write_chunk(chunk, chunked)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except Exception as error:  # pylint: disable = W0718
+            # Os cabeçalhos já foram enviados: sem o chunk final (e com a conexão fechada) o cliente
+            # percebe a resposta incompleta
+            logger.error(f"Streamed response aborted: {error}")
+            self.close_connection = True
+
+    def _write_chunk(self, data: bytes | bytearray, chunked: bool):
+        if chunked:
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+        else:
+            self.wfile.write(data)
 
     def do_OPTIONS(self):  # pylint: disable = C0103
         logger.debug(f"Handling OPTIONS request: path={self.path}")
+        if not self._consume_body():
+            return
         self.send_response(200)
-        self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "GET, POST, PATCH, DELETE, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization, Session-ID")
+        for name, value in CORS_HEADERS:
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self._send_connection_headers()
         self.end_headers()
 
     def do_GET(self):  # pylint: disable = C0103
@@ -50,98 +176,149 @@ class RequestHandler(BaseHTTPRequestHandler):
         logger.debug(f"Handling PATCH request: path={self.path}")
         self._handle_request("PATCH")
 
+    def do_PUT(self):  # pylint: disable = C0103
+        logger.debug(f"Handling PUT request: path={self.path}")
+        self._handle_request("PUT")
+
     def do_DELETE(self):  # pylint: disable = C0103
         logger.debug(f"Handling DELETE request: path={self.path}")
         self._handle_request("DELETE")
 
-    def get_command(self, handler, match, controller):  # type: ignore
-        logger.debug(f"Executing GET command: handler={handler}, match={match.groupdict()}, controller={controller}")
-        status_code, response = handler(self, controller, **match.groupdict())()
+    def get_command(self, handler, params, controller):  # type: ignore
+        logger.debug(f"Executing GET command: handler={handler}, params={params}, controller={controller}")
+        status_code, response = handler(self, controller, **params)()
         return status_code, response
 
     def post_command(self, handler, controller):  # type: ignore
-        content_length = int(self.headers["Content-Length"])
-        post_data = self.rfile.read(content_length).decode("utf-8")
-        request_data = json.loads(post_data)
+        request_data = loads(self._read_body())
         logger.debug(f"Executing POST command: handler={handler}, request_data={request_data}, controller={controller}")
         status_code, response = handler(self, controller, request_data)()
         return status_code, response
 
-    def put_command(self, handler, match, controller):  # type: ignore
-        content_length = int(self.headers["Content-Length"])
-        post_data = self.rfile.read(content_length).decode("utf-8")
-        request_data = json.loads(post_data)
+    def put_command(self, handler, params, controller):  # type: ignore
+        request_data = loads(self._read_body())
         logger.debug(
-            f"Executing PUT command: handler={handler}, match={match.groupdict()}, request_data={request_data}, controller={controller}"  # pylint: disable = C0301   # noqa: E501
+            f"Executing PUT command: handler={handler}, params={params}, request_data={request_data}, controller={controller}"  # pylint: disable = C0301   # noqa: E501
         )
-        status_code, response = handler(self, controller, **match.groupdict())(request_data)
+        status_code, response = handler(self, controller, **params)(request_data)
         return status_code, response
 
-    def patch_command(self, handler, match, controller):  # type: ignore
-        content_length = int(self.headers["Content-Length"])
-        post_data = self.rfile.read(content_length).decode("utf-8")
-        request_data = json.loads(post_data)
+    def patch_command(self, handler, params, controller):  # type: ignore
+        request_data = loads(self._read_body())
         logger.debug(
-            f"Executing PATCH command: handler={handler}, match={match.groupdict()}, request_data={request_data}, controller={controller}"  # pylint: disable = C0301   # noqa: E501
+            f"Executing PATCH command: handler={handler}, params={params}, request_data={request_data}, controller={controller}"  # pylint: disable = C0301   # noqa: E501
         )
-        status_code, response = handler(self, controller, **match.groupdict())(request_data)
+        status_code, response = handler(self, controller, **params)(request_data)
         return status_code, response
 
-    def delete_command(self, handler, match, controller):  # type: ignore
-        logger.debug(f"Executing DELETE command: handler={handler}, match={match.groupdict()}, controller={controller}")
-        status_code, response = handler(self, controller, **match.groupdict())()
+    def delete_command(self, handler, params, controller):  # type: ignore
+        logger.debug(f"Executing DELETE command: handler={handler}, params={params}, controller={controller}")
+        # DELETE com corpo (ex.: /books/bulk) recebe os dados como o PATCH
+        body = self._read_body()
+        args = [loads(body)] if body else []
+        status_code, response = handler(self, controller, **params)(*args)
         return status_code, response
 
     def _handle_request(self, method: str):
-        path = self.path
-        logger.debug(f"Handling request: method={method}, path={path}")
-        for pattern, route_method, handler, controller in self.routes:
-            match = pattern.match(path)
-            if match and method == route_method:
-                try:
-                    if method == "POST":
-                        status_code, response = self.post_command(handler, controller)  # type: ignore
-                        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
-                    elif method == "PUT":
-                        status_code, response = self.put_command(handler, match, controller)  # type: ignore
-                        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
-                    elif method == "PATCH":
-                        status_code, response = self.patch_command(handler, match, controller)  # type: ignore
-                        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
-                    elif method == "DELETE":
-                        status_code, response = self.delete_command(handler, match, controller)  # type: ignore
-                        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
-                    elif method == "GET":
-                        status_code, response = self.get_command(handler, match, controller)  # type: ignore
-                        logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
-                    self._send_response(status_code, "application/json", json.dumps(response))  # type: ignore
-                except ValueError as error:
-                    logger.error(f"ValueError: {error}")
-                    self._send_response(400, "application/json", json.dumps({"error": str(error)}))
-                except Exception as error:
-                    logger.error(f"Unhandled exception: {error}")
-                    self._send_response(500, "application/json", json.dumps({"error": str(error)}))
-                return
-        logger.warning(f"Route not found: path={path}, method={method}")
-        self._send_response(404, "text/plain", "Not Found")
+        url = urlsplit(self.path)
+        path = url.path
+        self.query = parse_qs(url.query)
+        logger.debug(f"Handling request: method={method}, path={path}, query={self.query}")
+        if not self._consume_body():
+            return
+        resolved = self.router.resolve(path)
+        if resolved is None:
+            logger.warning(f"Route not found: path={path}, method={method}")
+            self._send_response(404, "text/plain", "Not Found")
+            return
+        methods, params = resolved
+        if method not in methods:
+            logger.warning(f"Method not allowed: path={path}, method={method}")
+            self._send_response(405, "text/plain", "Method Not Allowed", (("Allow", allowed_methods(methods)),))
+            return
+        handler, controller = methods[method]
+        try:
+            if method == "POST":
+                status_code, response = self.post_command(handler, controller)  # type: ignore
+                logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+            elif method == "PUT":
+                status_code, response = self.put_command(handler, params, controller)  # type: ignore
+                logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+            elif method == "PATCH":
+                status_code, response = self.patch_command(handler, params, controller)  # type: ignore
+                logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+            elif method == "DELETE":
+                status_code, response = self.delete_command(handler, params, controller)  # type: ignore
+                logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+            elif method == "GET":
+                status_code, response = self.get_command(handler, params, controller)  # type: ignore
+                logger.info(f"Request handled: method={method}, path={path}, status_code={status_code}")
+            if isinstance(response, Iterator):  # type: ignore
+                self._send_stream(status_code, response)  # type: ignore
+            else:
+                self._send_response(status_code, "application/json", dumps(response))  # type: ignore
+        except HTTPError as error:
+            logger.warning(f"HTTPError {error.status_code}: {error}")
+            self._send_response(error.status_code, "application/json", dumps({"error": str(error)}), error.headers)
+        except ValueError as error:
+            logger.error(f"ValueError: {error}")
+            self._send_response(400, "application/json", dumps({"error": str(error)}))
+        except Exception as error:
+            logger.error(f"Unhandled exception: {error}")
+            self._send_response(500, "application/json", dumps({"error": str(error)}))
 
 
-def run(
-    server_class: type[HTTPServer] = HTTPServer,
+def serve(
+    port: int,
+    db_path_user: str,
+    db_path_book: str,
+    server_class: Optional[type[HTTPServer]] = None,
     handler_class: type[RequestHandler] = RequestHandler,
-    port: int = 8080,
-    db_path_user: str = "database/users.json",
-    db_path_book: str = "database/books.json",
+    reuse_port: bool = False,
+    ready: Optional[Callable[[], None]] = None,
 ):
     logger.debug("Configuring user dependencies")
     user_controller = configure_user_dependencies(db_path_user)
     book_controller = configure_book_dependencies(db_path_book)
-    register_routes(user_controller, book_controller)
+    admin_controller = configure_admin_dependencies(user_controller, book_controller)
+    stats_controller = configure_stats_dependencies(user_controller, book_controller)
+    register_routes(user_controller, book_controller, admin_controller, stats_controller)
     logger.debug("Registering routes")
     server_address = ("", port)
-    httpd = server_class(server_address, handler_class)
+    # Sem server_class explícito o motor vem da configuração (SAIPH_SERVER_ENGINE)
+    if server_class is None:
+        httpd = create_server(server_address, handler_class, reuse_port=reuse_port, **get_server_options())
+    else:
+        httpd = server_class(server_address, handler_class)
+    if ready is not None:
+        # Worker do pre-fork: SIGTERM encerra o laço (shutdown precisa de outra thread) e o server_close
+        # abaixo espera as requisições em andamento
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=httpd.shutdown, daemon=True).start())
+        ready()
     print(f"Starting HTTP server on port {port}...")
     httpd.serve_forever()
+    httpd.server_close()
+
+
+def run(
+    server_class: Optional[type[HTTPServer]] = None,
+    handler_class: type[RequestHandler] = RequestHandler,
+    port: int = 8080,
+    db_path_user: str = "database/users.json",
+    db_path_book: str = "database/books.json",
+    processes: Optional[int] = None,
+):
+    if warm_start(db_path_user, db_path_book):
+        logger.info("Collections initialized from warm-start snapshot")
+    processes = processes or get_worker_processes()
+    if processes > 1:
+        # Pre-fork: cada worker abre os repositórios (e as conexões SQLite) depois do fork e escuta
+        # na mesma porta; as escritas de um chegam aos outros pelos arquivos da coleção (ver JSONRepository)
+        print(f"Starting {processes} HTTP worker processes on port {port}...")
+        target = partial(serve, port, db_path_user, db_path_book, server_class, handler_class, True)
+        Supervisor(target=target, workers=processes).run()
+        return
+    serve(port, db_path_user, db_path_book, server_class, handler_class)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
+import http.client
+import re
+import socket
 import threading
 import time
-from http.server import HTTPServer
 from pathlib import Path
 
 import pytest  # type: ignore
@@ -8,18 +10,30 @@ import requests  # type: ignore
 
 from backend.domain.entities.book import Book
 from backend.domain.entities.user import User
-from backend.main.config.config import configure_book_dependencies, configure_user_dependencies
+from backend.main.config.config import (
+    configure_admin_dependencies,
+    configure_book_dependencies,
+    configure_stats_dependencies,
+    configure_user_dependencies,
+    get_server_options,
+)
 from backend.main.routes.index import register_routes
+from backend.main.server.engines import create_server
 from backend.main.server.server import RequestHandler
 
+ADMIN_TOKEN = "test-admin-token"
+
 
 # Função para iniciar o servidor em uma thread separada
 def start_server(port: int, db_path_user: str, db_path_book: str):
     server_address = ("", port)
     user_controller = configure_user_dependencies(db_path_user)
     book_controller = configure_book_dependencies(db_path_book)
-    register_routes(user_controller, book_controller)
-    httpd = HTTPServer(server_address, RequestHandler)
+    snapshot_dir = str(Path(db_path_book).parent / "snapshots")
+    admin_controller = configure_admin_dependencies(user_controller, book_controller, snapshot_dir, token=ADMIN_TOKEN)
+    stats_controller = configure_stats_dependencies(user_controller, book_controller)
+    register_routes(user_controller, book_controller, admin_controller, stats_controller)
+    httpd = create_server(server_address, RequestHandler, **get_server_options())
     httpd.serve_forever()
 
 
@@ -159,7 +173,7 @@ class TestUpdateUserServer:
     def test_update_user(self, test_server):  # type: ignore
         url = f"{test_server}/users"
         user_data = {"name": "Jane Smith", "email": "janesmith@example.com", "password": "default", "age": 28}
-        update_data = {"name": "Jane Doe", "email": "janedoe@example.com", "password": "default", "age": 29}
+        update_data = {"name": "Jane Doe", "email": "jane.doe@example.com", "password": "default", "age": 29}
 
         response_post = requests.post(url, json=user_data)
         created_user = response_post.json()
@@ -171,10 +185,38 @@ class TestUpdateUserServer:
         assert response_patch.status_code == 200
         assert updated_user["id"] == user_id
         assert updated_user["name"] == "Jane Doe"
-        assert updated_user["email"] == "janedoe@example.com"
+        assert updated_user["email"] == "jane.doe@example.com"
         assert updated_user["password"] == "default"
         assert updated_user["age"] == 29
 
+    def test_update_user_with_registered_email(self, test_server):  # type: ignore
+        url = f"{test_server}/users"
+        user_data = {"name": "Joan Doe", "email": "joandoe@example.com", "password": "default", "age": 28}
+
+        response_post = requests.post(url, json=user_data)
+        user_id = response_post.json()["id"]
+
+        response_patch = requests.patch(f"{url}/{user_id}", json={"email": "JohnDoe@example.com"})
+
+        assert response_patch.status_code == 400
+        assert response_patch.json()["error"] == "Email already registered"
+
+    def test_concurrent_create_with_same_email(self, test_server):  # type: ignore
+        url = f"{test_server}/users"
+        user_data = {"name": "June Doe", "email": "junedoe@example.com", "password": "default", "age": 27}
+        status_codes: list[int] = []
+
+        def create():
+            status_codes.append(requests.post(url, json=user_data).status_code)
+
+        threads = [threading.Thread(target=create) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(status_codes) == [201] + [400] * 7
+
 
 class TestDeleteUserServer:
     def test_delete_user(self, test_server):  # type: ignore
@@ -192,6 +234,21 @@ class TestDeleteUserServer:
         assert response_invalided.status_code == 400
 
 
+class TestBulkUserServer:
+    def test_bulk_create_users(self, test_server):  # type: ignore
+        users_data = [
+            {"name": "Ana Lima", "email": "analima@example.com", "password": "default", "age": 40},
+            {"name": "Ana Lima", "email": "AnaLima@example.com", "password": "default", "age": 40},
+        ]
+
+        response_post = requests.post(f"{test_server}/users/bulk", json=users_data)
+        result = response_post.json()
+
+        assert response_post.status_code == 201
+        assert [user["email"] for user in result["created"]] == ["analima@example.com"]
+        assert result["errors"] == [{"index": 1, "error": "Email already registered"}]
+
+
 class TestCreateBookServer:
     def test_create_book(self, test_server):  # type: ignore
         url = f"{test_server}/books"
@@ -242,6 +299,154 @@ class TestGetBookServer:
         assert len(fetched_book) > 0
 
 
+class TestPaginateBookServer:
+    def test_get_books_page(self, test_server):  # type: ignore
+        url = f"{test_server}/books"
+        for title in ("Duna", "Neuromancer", "Fundação"):
+            requests.post(url, json={"title": title, "user_id": 2})
+        all_books = requests.get(url).json()
+
+        fetched_books = []
+        after = 0
+        while after is not None:
+            response_get = requests.get(url, params={"limit": 2, "after": after})
+            page = response_get.json()
+            assert response_get.status_code == 200
+            assert len(page["items"]) <= 2
+            fetched_books.extend(page["items"])
+            after = page["next_after"]
+
+        assert fetched_books == sorted(all_books, key=lambda book: book["id"])
+
+    def test_get_books_page_with_invalid_limit(self, test_server):  # type: ignore
+        response_get = requests.get(f"{test_server}/books", params={"limit": 0})
+
+        assert response_get.status_code == 400
+
+    def test_get_all_books_is_chunked(self, test_server):  # type: ignore
+        response_get = requests.get(f"{test_server}/books")
+
+        assert response_get.status_code == 200
+        assert response_get.headers["Transfer-Encoding"] == "chunked"
+        assert isinstance(response_get.json(), list)
+
+    def test_streamed_books_span_several_batches(self, test_server):  # type: ignore
+        url = f"{test_server}/books"
+        books = [{"title": f"Lote {index}", "user_id": 1} for index in range(600)]
+        requests.post(f"{url}/bulk", json=books)
+
+        streamed = requests.get(url).json()
+        paged = []
+        after = 0
+        while after is not None:
+            page = requests.get(url, params={"limit": 1000, "after": after}).json()
+            paged.extend(page["items"])
+            after = page["next_after"]
+
+        assert len(streamed) >= 600
+        assert streamed == paged
+
+
+class TestFilterBookServer:
+    def test_filter_and_sort_books(self, test_server):  # type: ignore
+        url = f"{test_server}/books"
+        for title in ("Admirável Mundo Novo", "Admirável Mundo Novo", "Duna"):
+            requests.post(url, json={"title": title, "user_id": 7, "status": True})
+        all_books = requests.get(url).json()
+        expected = [
+            book for book in all_books if book["user_id"] == 7 and book["status"] and book["title"].startswith("Adm")
+        ]
+
+        response_get = requests.get(url, params={"status": "true", "user_id": 7, "title_prefix": "Adm", "sort": "-id"})
+
+        assert response_get.status_code == 200
+        assert response_get.json() == sorted(expected, key=lambda book: book["id"], reverse=True)
+        assert len(response_get.json()) == 2
+
+    def test_filter_books_page(self, test_server):  # type: ignore
+        response_get = requests.get(f"{test_server}/books", params={"user_id": 7, "limit": 1})
+
+        assert response_get.status_code == 200
+        assert len(response_get.json()["items"]) == 1
+        assert response_get.json()["next_after"] is not None
+
+    def test_filter_books_with_invalid_status(self, test_server):  # type: ignore
+        response_get = requests.get(f"{test_server}/books", params={"status": "maybe"})
+
+        assert response_get.status_code == 400
+
+
+class TestSearchBookServer:
+    def test_search_books(self, test_server):  # type: ignore
+        url = f"{test_server}/books"
+        requests.post(url, json={"title": "O Cortiço", "user_id": 3})
+
+        response_get = requests.get(f"{url}/search", params={"q": "cortico", "limit": 5})
+
+        assert response_get.status_code == 200
+        assert [book["title"] for book in response_get.json()] == ["O Cortiço"]
+
+    def test_search_books_without_query(self, test_server):  # type: ignore
+        response_get = requests.get(f"{test_server}/books/search")
+
+        assert response_get.status_code == 400
+
+
+class TestBulkBookServer:
+    def test_bulk_create_update_delete_books(self, test_server):  # type: ignore
+        url = f"{test_server}/books/bulk"
+        books_data = [
+            {"title": "Duna", "user_id": 3},
+            {"title": "", "user_id": 3},
+            {"title": "Neuromancer", "user_id": 3, "isbn": "123"},
+            {"title": "Fundação", "user_id": 3},
+        ]
+
+        response_post = requests.post(url, json=books_data)
+        result = response_post.json()
+        book_ids = [book["id"] for book in result["created"]]
+
+        assert response_post.status_code == 201
+        assert [book["title"] for book in result["created"]] == ["Duna", "Fundação"]
+        assert book_ids[1] == book_ids[0] + 1
+        assert [error["index"] for error in result["errors"]] == [1, 2]
+
+        response_patch = requests.patch(url, json=[{"id": book_ids[0], "status": True}, {"id": 999999}])
+        result = response_patch.json()
+
+        assert response_patch.status_code == 200
+        assert result["updated"][0]["status"] is True
+        assert result["errors"] == [{"index": 1, "error": "Book not found"}]
+
+        response_delete = requests.delete(url, json=[book_ids[1], book_ids[1], "x"])
+        result = response_delete.json()
+
+        assert response_delete.status_code == 200
+        assert result["deleted"] == [book_ids[1]]
+        assert [error["index"] for error in result["errors"]] == [1, 2]
+        assert requests.get(f"{test_server}/books/{book_ids[1]}").status_code == 400
+
+    def test_bulk_create_books_reports_wrongly_typed_fields(self, test_server):  # type: ignore
+        books_data = [
+            {"title": "abcd", "user_id": "x"},
+            {"title": "Tipos Certos", "user_id": 1},
+            {"title": 5, "user_id": 1},
+            {"title": "abcd", "user_id": None},
+        ]
+
+        response_post = requests.post(f"{test_server}/books/bulk", json=books_data)
+        result = response_post.json()
+
+        assert response_post.status_code == 201
+        assert [book["title"] for book in result["created"]] == ["Tipos Certos"]
+        assert [error["index"] for error in result["errors"]] == [0, 2, 3]
+
+    def test_bulk_create_books_requires_list(self, test_server):  # type: ignore
+        response_post = requests.post(f"{test_server}/books/bulk", json={"title": "Duna", "user_id": 3})
+
+        assert response_post.status_code == 400
+
+
 class TestUpdateBookServer:
     def test_update_book(self, test_server):  # type: ignore
         url = f"{test_server}/books"
@@ -259,6 +464,19 @@ class TestUpdateBookServer:
         assert updated_book.get("title") == update_data.get("title")
         assert updated_book.get("status") == update_data.get("status")
 
+    def test_update_book_cannot_change_id_or_skip_validation(self, test_server):  # type: ignore
+        url = f"{test_server}/books"
+        first = requests.post(url, json={"title": "Primeiro", "user_id": 1}).json()
+        second = requests.post(url, json={"title": "Segundo", "user_id": 1}).json()
+
+        response_patch = requests.patch(f"{url}/{first['id']}", json={"id": second["id"], "title": "Trocado"})
+        response_invalid = requests.patch(f"{url}/{first['id']}", json={"title": ""})
+
+        assert (response_patch.status_code, response_patch.json()["id"]) == (200, first["id"])
+        assert requests.get(f"{url}/{second['id']}").json()["title"] == "Segundo"
+        assert response_invalid.status_code == 400
+        assert requests.get(f"{url}/{first['id']}").json()["title"] == "Trocado"
+
     def test_toggle_book_status(self, test_server):  # type: ignore
         url = f"{test_server}/books"
         book_data = {"title": "1984", "user_id": 1, "status": False}
@@ -289,3 +507,135 @@ class TestDeleteBookServer:
 
         response_invalided = requests.get(f"{url}/{book_id}")
         assert response_invalided.status_code == 400
+
+
+class TestStatsServer:
+    def test_stats_match_the_collections(self, test_server):  # type: ignore
+        book = requests.post(f"{test_server}/books", json={"title": "Estatística", "user_id": 4242}).json()
+        requests.patch(f"{test_server}/books/toggle-status/{book['id']}", json={})
+
+        response = requests.get(f"{test_server}/stats")
+        stats = response.json()
+        books = requests.get(f"{test_server}/books").json()
+        users = requests.get(f"{test_server}/users").json()
+
+        assert response.status_code == 200
+        assert stats["users"]["total"] == len(users)
+        assert sum(entry["total"] for entry in stats["users"]["age_histogram"]) == len(users)
+        assert stats["books"]["total"] == len(books)
+        assert stats["books"]["read"] == sum(book["status"] for book in books)
+        assert {"user_id": 4242, "total": 1, "read": 1, "unread": 0} in stats["books"]["per_user"]
+
+
+class TestSnapshotServer:
+    def test_requires_admin_token(self, test_server):  # type: ignore
+        response = requests.get(f"{test_server}/admin/snapshots", headers={"Authorization": "Bearer wrong"})
+
+        assert response.status_code == 403
+        assert response.json() == {"error": "Invalid admin token"}
+
+    def test_missing_admin_token_is_challenged(self, test_server):  # type: ignore
+        response = requests.get(f"{test_server}/admin/snapshots")
+
+        assert response.status_code == 401
+        assert response.headers["WWW-Authenticate"] == 'Bearer realm="admin"'
+
+    def test_create_and_restore_snapshot(self, test_server):  # type: ignore
+        headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+        url = f"{test_server}/admin/snapshots"
+
+        response_create = requests.post(url, json={"name": "integration"}, headers=headers)
+        created_book = requests.post(f"{test_server}/books", json={"title": "Depois", "user_id": 1}).json()
+        response_list = requests.get(url, headers=headers)
+        response_restore = requests.post(f"{url}/restore", json={"name": "integration"}, headers=headers)
+
+        assert response_create.status_code == 201
+        assert set(response_create.json()["collections"]) == {"users", "books"}
+        assert "integration" in [snapshot["name"] for snapshot in response_list.json()]
+        assert response_restore.status_code == 200
+        assert requests.get(f"{test_server}/books/{created_book['id']}").status_code == 400
+
+    def test_restore_unknown_snapshot(self, test_server):  # type: ignore
+        headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+        response = requests.post(f"{test_server}/admin/snapshots/restore", json={"name": "missing"}, headers=headers)
+
+        assert response.status_code == 400
+
+
+def pipeline(test_server: str, raw: bytes) -> bytes:
+    host, port = test_server.removeprefix("http://").split(":")
+    with socket.create_connection((host, int(port)), timeout=5) as connection:
+        connection.sendall(raw)
+        response = b""
+        while chunk := connection.recv(65536):
+            response += chunk
+    return response
+
+
+class TestKeepAliveServer:
+    def test_connection_is_reused(self, test_server):  # type: ignore
+        host, port = test_server.removeprefix("http://").split(":")
+        connection = http.client.HTTPConnection(host, int(port), timeout=5)
+
+        connection.request("GET", "/stats")
+        first = connection.getresponse()
+        first.read()
+        sock = connection.sock
+        connection.request("GET", "/books?limit=1")
+        second = connection.getresponse()
+        second.read()
+
+        assert (first.status, second.status) == (200, 200)
+        assert first.getheader("Connection") == "keep-alive"
+        assert "timeout=" in first.getheader("Keep-Alive")
+        assert sock is not None and connection.sock is sock
+        connection.close()
+
+    def test_pipelined_requests_are_answered_in_order(self, test_server):  # type: ignore
+        book = b'{"title": "Pipelined", "user_id": 1}'
+        raw = (
+            b"POST /books HTTP/1.1\r\nHost: x\r\nContent-Type: application/json\r\n"
+            + b"Content-Length: %d\r\n\r\n%s" % (len(book), book)
+            # Corpo numa rota que não existe: tem de ser descartado, não lido como a próxima requisição
+            + b"GET /missing HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nxxxxx"
+            + b"GET /books/search?q=pipelined HTTP/1.1\r\nHost: x\r\n\r\n"
+            + b"GET /stats HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"
+        )
+
+        response = pipeline(test_server, raw)
+
+        assert re.findall(rb"HTTP/1.1 (\d{3})", response) == [b"201", b"404", b"200", b"200"]
+        assert response.count(b"Pipelined") == 2
+
+    def test_http_10_streamed_response_closes_the_connection(self, test_server):  # type: ignore
+        response = pipeline(test_server, b"GET /books HTTP/1.0\r\n\r\n")
+
+        assert response.startswith(b"HTTP/1.1 200")
+        assert b"Connection: close" in response
+        assert response.endswith(b"]")
+
+    def test_request_cap_closes_the_connection(self, test_server, monkeypatch):  # type: ignore
+        if get_server_options()["engine"] == "asyncio":
+            pytest.skip("o limite do motor asyncio é do AsyncHTTPServer (ver test_async_server)")
+        monkeypatch.setattr(RequestHandler, "max_requests", 2)
+
+        response = pipeline(test_server, b"GET /stats HTTP/1.1\r\nHost: x\r\n\r\n" * 3)
+
+        assert re.findall(rb"Connection: ([\w-]+)", response) == [b"keep-alive", b"close"]
+
+
+class TestRoutingServer:
+    def test_wrong_method_is_405_with_allow(self, test_server):  # type: ignore
+        response = requests.post(f"{test_server}/books/1", json={})
+
+        assert response.status_code == 405
+        assert response.headers["Allow"] == "DELETE, GET, PATCH, OPTIONS"
+
+    def test_prefix_of_a_route_is_not_a_match(self, test_server):  # type: ignore
+        # Antes "/users/bulk" casava com o padrão de "/users" e listava os usuários
+        bulk = requests.get(f"{test_server}/users/bulk")
+        not_an_id = requests.get(f"{test_server}/books/abc")
+
+        assert (bulk.status_code, bulk.headers["Allow"]) == (405, "DELETE, PATCH, POST, OPTIONS")
+        assert not_an_id.status_code == 404
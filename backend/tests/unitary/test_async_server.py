@@ -0,0 +1,138 @@
+import http.client
+import re
+import socket
+import threading
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.infrastructure.storage.fast_json import loads
+from backend.main.routes.router import Router
+from backend.main.server.async_server import AsyncHTTPServer
+
+
+class FakeController:
+    def __init__(self):
+        self.created: list[Any] = []
+
+
+def get_item(request, controller, id: int):  # type: ignore  # pylint: disable = W0622, W0613
+    def handler():
+        if id == 0:
+            raise ValueError("Invalid id")
+        return 200, {"id": id, "session": request.headers.get("Session-ID"), "q": request.get_query_param("q")}
+
+    return handler
+
+
+def stream_items(request, controller):  # type: ignore  # pylint: disable = W0613
+    def handler():
+        return 200, iter({"id": number} for number in range(1000))
+
+    return handler
+
+
+def post_item(request, controller, data):  # type: ignore  # pylint: disable = W0613
+    def handler():
+        controller.created.append(data)
+        return 201, data
+
+    return handler
+
+
+@pytest.fixture
+def server():  # type: ignore
+    controller = FakeController()
+    router = Router()
+    router.add("/items/<int:id>", "GET", get_item, controller)
+    router.add("/items", "GET", stream_items, controller)
+    router.add("/items", "POST", post_item, controller)
+    httpd = AsyncHTTPServer(("127.0.0.1", 0), router, workers=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", httpd.server_address[1], timeout=5)
+    yield connection, controller
+    connection.close()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch(connection: http.client.HTTPConnection, method: str, path: str, body: Any = None, headers: Any = None):
+    connection.request(method, path, body=body, headers=headers or {})
+    response = connection.getresponse()
+    return response, response.read()
+
+
+class TestAsyncHTTPServer:
+    def test_keep_alive_reuses_the_connection(self, server: Any):
+        # Arrange
+        connection, controller = server
+
+        # Act
+        first, first_body = fetch(connection, "GET", "/items/7?q=duna", headers={"Session-ID": "abc"})
+        sock = connection.sock
+        second, second_body = fetch(connection, "POST", "/items", body=b'{"title": "Duna"}')
+
+        # Assert
+        assert (first.status, first.getheader("Connection")) == (200, "keep-alive")
+        assert loads(first_body) == {"id": 7, "session": "abc", "q": "duna"}
+        assert second.status == 201
+        assert connection.sock is sock
+        assert controller.created == [{"title": "Duna"}]
+        assert loads(second_body) == {"title": "Duna"}
+
+    def test_streams_iterators_as_chunked_json(self, server: Any):
+        # Arrange
+        connection, _ = server
+
+        # Act
+        response, body = fetch(connection, "GET", "/items")
+
+        # Assert
+        assert response.getheader("Transfer-Encoding") == "chunked"
+        assert loads(body) == [{"id": number} for number in range(1000)]
+
+    def test_errors(self, server: Any):
+        # Arrange
+        connection, _ = server
+
+        # Act
+        invalid, invalid_body = fetch(connection, "GET", "/items/0")
+        bad_json, _ = fetch(connection, "POST", "/items", body=b"{not json")
+        missing, missing_body = fetch(connection, "GET", "/missing")
+        not_allowed, _ = fetch(connection, "DELETE", "/items")
+        closed, _ = fetch(connection, "GET", "/items/1", headers={"Connection": "close"})
+
+        # Assert
+        assert (invalid.status, loads(invalid_body)) == (400, {"error": "Invalid id"})
+        assert bad_json.status == 400
+        assert (missing.status, missing_body) == (404, b"Not Found")
+        assert (not_allowed.status, not_allowed.getheader("Allow")) == (405, "GET, POST, OPTIONS")
+        assert (closed.status, closed.getheader("Connection")) == (200, "close")
+
+
+class TestAsyncKeepAlive:
+    def test_request_cap_closes_the_connection(self):
+        # Arrange
+        router = Router()
+        router.add("/items", "GET", stream_items, FakeController())
+        httpd = AsyncHTTPServer(("127.0.0.1", 0), router, max_requests=2)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+
+        # Act
+        with socket.create_connection(("127.0.0.1", httpd.server_address[1]), timeout=5) as connection:
+            connection.sendall(b"GET /items HTTP/1.1\r\nHost: x\r\n\r\n" * 3)
+            response = b""
+            while chunk := connection.recv(65536):
+                response += chunk
+        httpd.shutdown()
+        httpd.server_close()
+
+        # Assert
+        assert re.findall(rb"Connection: ([\w-]+)", response) == [b"keep-alive", b"close"]
+        assert b"Keep-Alive: timeout=15, max=1" in response
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,3 +1,4 @@
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -139,6 +140,19 @@ class TestController:
         assert len(listed_books) == len(books)
         assert listed_books == books
 
+    def test_get_book_by_user_id_after_changing_owner(self, book_controller: BookController, book_list: list[Book]):
+        # Arrange
+        book_id: int = book_list[0]["id"]  # type: ignore
+
+        # Act
+        book_controller.update_book(book_id, {"user_id": 2})
+        status_code_get_by_user_id, listed_books = book_controller.get_by_user_id(2)
+
+        # Assert
+        assert status_code_get_by_user_id == 200
+        assert [book["id"] for book in listed_books] == [book_id, 3, 4]
+        assert [book["id"] for book in book_controller.get_by_user_id(1)[1]] == [2]
+
     def test_update_book(self, book_controller: BookController, book_builder: Book):
         # Arrange
         update_data = {"title": "Admirável Mundo Novo"}
@@ -178,6 +192,33 @@ class TestController:
         assert status_code_toggle_book_status == 200
         assert reverted_status == initial_status
 
+    def test_concurrent_toggles_keep_a_concurrent_patch(self, book_controller: BookController, book_builder: Book):
+        # Arrange
+        book_data = book_to_pydantic(book_builder).model_dump()
+        book_data.pop("id", None)
+        _, created_book = book_controller.create_book(book_data)  # type: ignore
+        book_id = created_book["id"]
+
+        def toggle():
+            for _ in range(10):
+                book_controller.toggle_book_status(book_id)
+
+        def rename():
+            for attempt in range(10):
+                book_controller.update_book(book_id, {"title": f"Título {attempt}"})
+
+        # Act
+        threads = [threading.Thread(target=target) for target in (toggle, toggle, rename)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        _, book = book_controller.get_by_id(book_id)
+        assert book["status"] == created_book["status"]
+        assert book["title"] == "Título 9"
+
     def test_delete_book(self, book_controller: BookController, book_builder: Book):
         # Arrange
         book_data = book_to_pydantic(book_builder).model_dump()
@@ -192,6 +233,22 @@ class TestController:
         with pytest.raises(ValueError):
             book_controller.get_by_id(book_id)
 
+    def test_bulk_operations_reject_boolean_ids(self, book_controller: BookController, book_builder: Book):
+        # Arrange
+        book_data = book_to_pydantic(book_builder).model_dump()
+        book_data.pop("id", None)
+        _, created_book = book_controller.create_book(book_data)  # type: ignore
+
+        # Act
+        _, updated = book_controller.update_books([{"id": True, "title": "Outro Título"}])
+        _, deleted = book_controller.delete_books([True])
+
+        # Assert
+        assert created_book["id"] == 1
+        assert (updated["updated"], [error["index"] for error in updated["errors"]]) == ([], [0])
+        assert (deleted["deleted"], [error["index"] for error in deleted["errors"]]) == ([], [0])
+        assert book_controller.get_by_id(1)[1]["title"] == "1984"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-vv"])
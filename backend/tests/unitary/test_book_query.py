@@ -0,0 +1,137 @@
+from typing import Any, Union
+
+import pytest  # type: ignore
+
+from backend.application.services.book_query import BookQuery, parse_book_query
+from backend.domain.builders.book_builder import BookBuilder
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+
+TITLES = ["Admirável Mundo Novo", "Duna", "Admirável Mundo Novo", "1984", "Neuromancer"]
+
+
+@pytest.fixture(params=["json", "columnar", "sqlite"])
+def book_repository(request, tmpdir):  # type: ignore
+    if request.param == "sqlite":
+        repository: Any = SQLiteBookRepository(dsn=f"sqlite:///{tmpdir.join('database/saiph.db')}")
+    elif request.param == "columnar":
+        repository = ColumnarBookRepository(str(tmpdir.join("database/books.json")))
+    else:
+        repository = BookRepository(str(tmpdir.join("database/books.json")))
+    # 40 livros: user_id 1..4 em rodízio, status alternado, títulos em rodízio
+    for i in range(40):
+        book = BookBuilder().with_title(TITLES[i % 5]).with_user_id(i % 4 + 1).with_status(i % 2 == 0).build()
+        repository.add(book)
+    yield repository
+    if request.param == "sqlite":
+        repository.close()
+
+
+def ids(books: Any) -> list[int]:
+    return [book["id"] for book in books]
+
+
+class TestParseBookQuery:
+    def test_parse(self):
+        query = parse_book_query({"status": "true", "user_id": "3", "title_prefix": "Adm", "sort": "-id"})
+        assert query == BookQuery(status=True, user_id=3, title_prefix="Adm", descending=True)
+
+    @pytest.mark.parametrize("params", [{"status": "yes"}, {"user_id": "0"}, {"user_id": "x"}, {"sort": "title"}])
+    def test_invalid(self, params: dict[str, str]):
+        with pytest.raises(ValueError):
+            parse_book_query(params)
+
+
+class TestQueryBooks:
+    def test_filters(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        # Act
+        books = list(book_repository.query(BookQuery(status=True, user_id=3, title_prefix="Adm")))
+
+        # Assert
+        assert ids(books) == [3, 11, 23, 31]
+        assert all(book["status"] and book["user_id"] == 3 for book in books)
+
+    def test_sort_descending(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        books = list(book_repository.query(BookQuery(user_id=2, descending=True)))
+        assert ids(books) == list(range(38, 0, -4))
+
+    def test_title_prefix_is_case_sensitive(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        assert not list(book_repository.query(BookQuery(title_prefix="adm")))
+        assert ids(book_repository.query(BookQuery(title_prefix="Neuro"))) == list(range(5, 41, 5))
+
+    def test_pages(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        # Act
+        first = book_repository.query_page(BookQuery(status=False, descending=True), 5)
+        second = book_repository.query_page(BookQuery(status=False, descending=True), 5, first["next_after"])
+        last = book_repository.query_page(BookQuery(status=False, descending=True), 10, second["next_after"])
+
+        # Assert
+        assert ids(first["items"]) == [40, 38, 36, 34, 32]
+        assert ids(second["items"]) == [30, 28, 26, 24, 22]
+        assert ids(last["items"]) == [20, 18, 16, 14, 12, 10, 8, 6, 4, 2]
+        assert last["next_after"] is None
+
+
+class TestQueryPlan:
+    @pytest.fixture
+    def book_repository(self, tmpdir):  # type: ignore
+        repository = BookRepository(str(tmpdir.join("database/books.json")))
+        for i in range(40):
+            repository.add(BookBuilder().with_title("Duna").with_user_id(i % 10 + 1).with_status(i % 2 == 0).build())
+        return repository
+
+    def test_user_index(self, book_repository: BookRepository):
+        assert book_repository._plan(BookQuery(user_id=3, status=True))[0] == "user_id"
+
+    def test_unselective_index_falls_back_to_scan(self, book_repository: BookRepository):
+        assert book_repository._plan(BookQuery(status=True))[0] == "scan"
+        assert book_repository._plan(BookQuery(title_prefix="Du"))[0] == "scan"
+
+    def test_index_follows_updates(self, book_repository: BookRepository):
+        # Act
+        book_repository.update(3, {"user_id": 99, "status": False})
+
+        # Assert
+        assert ids(book_repository.query(BookQuery(user_id=99))) == [3]
+        assert 3 not in ids(book_repository.query(BookQuery(user_id=3)))
+        assert 3 in ids(book_repository.query(BookQuery(status=False)))
+
+
+class TestColumnarQueryPlan:
+    @pytest.fixture
+    def book_repository(self, tmpdir):  # type: ignore
+        repository = ColumnarBookRepository(str(tmpdir.join("database/books.json")))
+        for i in range(40):
+            repository.add(BookBuilder().with_title("Duna").with_user_id(i % 10 + 1).with_status(i % 2 == 0).build())
+        return repository
+
+    def test_plans(self, book_repository: ColumnarBookRepository):
+        assert book_repository._plan(BookQuery(user_id=3))[0] == "user_id"
+        assert book_repository._plan(BookQuery(user_id=3, status=True))[0] == "user_id"
+        assert book_repository._plan(BookQuery(status=True))[0] == "scan"
+        assert book_repository._plan(BookQuery(title_prefix="Du"))[0] == "scan"
+
+    def test_unread_books_of_a_user(self, book_repository: ColumnarBookRepository):
+        # Act
+        books = list(book_repository.query(BookQuery(user_id=2, status=False)))
+
+        # Assert
+        assert ids(books) == [2, 12, 22, 32]
+        assert ids(book_repository.query(BookQuery(status=False)))[:3] == [2, 4, 6]
+
+    def test_rare_status_scans_the_columns(self, book_repository: ColumnarBookRepository):
+        # Arrange
+        book_repository.update_many([{"id": book_id, "status": False} for book_id in range(1, 40, 2)])
+        book_repository.update(7, {"status": True})
+
+        # Act
+        plan = book_repository._plan(BookQuery(status=True))[0]
+
+        # Assert
+        assert plan == "columns"
+        assert ids(book_repository.query(BookQuery(status=True))) == [7]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,130 @@
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories import book_table
+from backend.infrastructure.repositories.book_table import BookTable
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.storage.file_storage import model_dump
+
+
+def book(book_id: int, title: str = "Duna", user_id: int = 1, status: bool = False) -> BookModel:
+    return BookModel(id=book_id, title=title, user_id=user_id, status=status)
+
+
+@pytest.fixture
+def table():  # type: ignore
+    return BookTable([book(1, "1984", 1, True), book(2, "Admirável Mundo Novo", 2), book(3, "Duna", 1)])
+
+
+class TestBookTable:
+    def test_behaves_like_a_dict(self, table: BookTable):
+        # Act
+        table[5] = book(5, "Solaris", 3)
+        table[4] = book(4, "Neuromancer", 2, True)
+        del table[2]
+
+        # Assert
+        assert list(table) == [1, 3, 5, 4]
+        assert len(table) == 4
+        assert 2 not in table and 4 in table
+        assert table[4] == book(4, "Neuromancer", 2, True)
+        assert table.get(2) is None
+        assert [item.id for item in table.values()] == [1, 3, 5, 4]
+        assert table.sorted_ids().tolist() == [1, 3, 4, 5]
+
+    def test_rows_are_built_from_the_columns(self, table: BookTable):
+        # Assert
+        assert list(table.rows([3, 1])) == [
+            {"id": 3, "title": "Duna", "user_id": 1, "status": False},
+            {"id": 1, "title": "1984", "user_id": 1, "status": True},
+        ]
+        assert [row["title"] for row in table.rows()] == ["1984", "Admirável Mundo Novo", "Duna"]
+
+    def test_update_in_place(self, table: BookTable):
+        # Act
+        table[2] = book(2, "Duna", 3, True)
+        table[3] = book(3, "Duna Messias", 1, True)
+
+        # Assert
+        assert list(table.rows([2, 3])) == [
+            {"id": 2, "title": "Duna", "user_id": 3, "status": True},
+            {"id": 3, "title": "Duna Messias", "user_id": 1, "status": True},
+        ]
+        assert table.count(True) == 3
+        assert table.count(False) == 0
+
+    def test_ids_where(self, table: BookTable):
+        # Assert
+        assert table.ids_where(status=False) == [2, 3]
+        assert table.ids_where(user_id=1) == [1, 3]
+        assert table.ids_where(user_id=1, status=True) == [1]
+        assert table.ids_where(user_id=9) == []
+
+    def test_matcher(self, table: BookTable):
+        # Assert
+        assert table.matcher(user_id=2, status=False, title_prefix="Admirável".encode("utf-8"))(2)
+        assert not table.matcher(title_prefix=b"admir")(2)
+        assert not table.matcher(status=False)(1)
+        assert table.matcher()(3)
+
+    def test_duplicate_ids_keep_the_last_row(self):
+        # Act
+        table = BookTable([book(2), book(1, "1984"), book(2, "Solaris", status=True)])
+
+        # Assert
+        assert len(table) == 2
+        assert table[2].title == "Solaris"
+        assert table.count(True) == 1
+
+    def test_freeze_is_a_copy(self, table: BookTable):
+        # Act
+        frozen = table.freeze()
+        table[1] = book(1, "Changed")
+        del table[3]
+
+        # Assert
+        assert len(frozen) == 3
+        assert [row["title"] for row in frozen] == ["1984", "Admirável Mundo Novo", "Duna"]
+        assert [model_dump(row)["id"] for row in frozen] == [1, 2, 3]
+
+    def test_compaction(self, monkeypatch: Any):
+        # Arrange
+        monkeypatch.setattr(book_table, "COMPACT_MIN_ROWS", 4)
+        table = BookTable(book(book_id, f"Livro {book_id}") for book_id in range(1, 21))
+
+        # Act
+        for book_id in range(1, 20, 2):
+            del table[book_id]
+        del table[2]
+
+        # Assert
+        assert len(table._ids) == 9
+        assert list(table) == list(range(4, 21, 2))
+        assert table[10].title == "Livro 10"
+        assert table.ids_where(user_id=1) == list(range(4, 21, 2))
+
+
+class TestColumnarBookRepository:
+    def test_reopen(self, tmpdir):  # type: ignore
+        # Arrange
+        path = str(tmpdir.join("database/books.json"))
+        repository = ColumnarBookRepository(path)
+        repository.save_data([book(1, "1984", 1, True), book(2, "Duna", 2)])
+        repository.update(2, {"title": "Duna Messias"})
+
+        # Act
+        reopened = ColumnarBookRepository(path)
+
+        # Assert
+        assert reopened.get_all() == [
+            {"id": 1, "title": "1984", "user_id": 1, "status": True},
+            {"id": 2, "title": "Duna Messias", "user_id": 2, "status": False},
+        ]
+        assert reopened.get_by_user_id(2) == [{"id": 2, "title": "Duna Messias", "user_id": 2, "status": False}]
+        assert reopened.get_page(1)["next_after"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,116 @@
+from typing import Any
+
+import pytest  # type: ignore
+from pydantic import ValidationError  # type: ignore
+
+from backend.application.services import codec
+from backend.application.services.codec import BOOK_CODEC, USER_CODEC, ModelCodec, codec_for
+from backend.domain.entities.book import Book, BookModel
+from backend.domain.entities.user import UserModel
+
+
+class TestModelCodec:
+    def test_validate_many_in_one_pass(self):
+        # Arrange
+        rows = [{"id": 1, "title": "1984", "user_id": 1}, {"id": 2, "title": "Duna", "user_id": 2, "status": True}]
+
+        # Act
+        models = BOOK_CODEC.validate_many(iter(rows))
+
+        # Assert
+        assert [type(model) for model in models] == [BookModel, BookModel]
+        assert BOOK_CODEC.to_dicts(models) == [{**rows[0], "status": False}, rows[1]]
+
+    def test_validate_many_consumes_rows_one_chunk_at_a_time(self, monkeypatch: Any):
+        # Arrange
+        monkeypatch.setattr(codec, "VALIDATE_CHUNK", 2)
+        pulled = []
+
+        def rows():  # type: ignore
+            for book_id in range(1, 6):
+                pulled.append(book_id)
+                yield {"id": book_id, "title": f"Livro {book_id}", "user_id": 1}
+
+        batch = BOOK_CODEC._batch
+        pending = []
+
+        class RecordingAdapter:
+            def validate_python(self, chunk):  # type: ignore
+                # Linhas lidas do gerador e ainda não validadas
+                pending.append(len(pulled) - sum(pending))
+                return batch.validate_python(chunk)
+
+        monkeypatch.setattr(BOOK_CODEC, "_batch", RecordingAdapter())
+
+        # Act
+        models = BOOK_CODEC.validate_many(rows())
+
+        # Assert
+        assert [model.id for model in models] == [1, 2, 3, 4, 5]
+        assert pending == [2, 2, 1]
+
+    def test_validate_many_rejects_invalid_rows(self):
+        # Act / Assert
+        with pytest.raises(ValidationError):
+            BOOK_CODEC.validate_many([{"id": 1, "title": "1984", "user_id": 1}, {"id": 2, "title": "x", "user_id": 2}])
+
+    def test_from_entities_reports_positions(self):
+        # Arrange
+        books = [
+            Book(id=1, title="1984", user_id=1),
+            Book(id=2, title="x", user_id=1),
+            Book(id=3, title="Duna", user_id=0),
+            Book(id=4, title="Solaris", user_id=2),
+        ]
+
+        # Act
+        models, errors = BOOK_CODEC.from_entities(books)
+
+        # Assert
+        assert list(models) == [0, 3]
+        assert [position for position, _ in errors] == [1, 2]
+        assert "deve ter pelo menos 3 caracteres" in str(errors[0][1])
+
+    def test_from_entities_reports_wrongly_typed_fields(self):
+        # Arrange
+        books = [
+            Book(id=1, title="abcd", user_id="x"),  # type: ignore
+            Book(id=2, title="abcd", user_id=1),
+            Book(id=3, title=5, user_id=1),  # type: ignore
+            Book(id=4, title="abcd", user_id=None),  # type: ignore
+        ]
+
+        # Act
+        models, errors = BOOK_CODEC.from_entities(books)
+
+        # Assert
+        assert list(models) == [1]
+        assert [position for position, _ in errors] == [0, 2, 3]
+
+    def test_to_dict_is_a_copy(self):
+        # Arrange
+        model = BOOK_CODEC.validate({"id": 1, "title": "1984", "user_id": 1})
+
+        # Act
+        book = BOOK_CODEC.to_dict(model)
+        book["title"] = "Changed"
+
+        # Assert
+        assert model.title == "1984"
+
+    def test_check_returns_normalized_entity(self):
+        # Act
+        book = BOOK_CODEC.check(Book(id=1, title="1984", user_id=7, status="yes"))  # type: ignore
+
+        # Assert
+        assert book == Book(id=1, title="1984", user_id=7, status=True)
+
+    def test_codec_for(self):
+        # Assert
+        assert codec_for(BookModel) is BOOK_CODEC
+        assert codec_for(UserModel) is USER_CODEC
+        assert isinstance(codec_for(BookModel.__base__), ModelCodec)  # type: ignore
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,184 @@
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.storage.commit_pipeline import CommitPipeline, DurabilityPolicy
+from backend.infrastructure.storage.file_storage import Change, FileStorage
+
+
+class SlowStorage(FileStorage):
+    def __init__(self):
+        super().__init__(path=Path("unused.json"))
+        self.batches: list[list[Change]] = []
+        self.synced: list[bool] = []
+
+    def write(self, records: dict[int, Any], changes: list[Change], sync: bool = False):
+        time.sleep(0.05)
+        self.batches.append(list(changes))
+        self.synced.append(sync)
+
+
+class TestDurabilityPolicy:
+    @pytest.mark.parametrize(
+        "value, mode, interval_ms",
+        [("none", "none", 0), ("always", "always", 0), ("interval=250", "interval", 250)],
+    )
+    def test_parse(self, value: str, mode: str, interval_ms: int):
+        policy = DurabilityPolicy.parse(value)
+
+        assert policy.mode == mode
+        assert policy.interval_ms == interval_ms
+
+    @pytest.mark.parametrize("value", ["sometimes", "interval=0", "interval=abc"])
+    def test_parse_invalid(self, value: str):
+        with pytest.raises(ValueError):
+            DurabilityPolicy.parse(value)
+
+
+class TestCommitPipeline:
+    def test_concurrent_writes_are_grouped(self):
+        # Arrange
+        storage = SlowStorage()
+        pipeline = CommitPipeline(storage=storage, policy=DurabilityPolicy(mode="always"))
+        threads = [
+            threading.Thread(target=pipeline.commit, args=({}, [("delete", book_id)])) for book_id in range(1, 11)
+        ]
+
+        # Act
+        for thread in threads:
+            thread.start()
+            time.sleep(0.001)
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert len(storage.batches) < 10
+        assert sorted(change[1] for batch in storage.batches for change in batch) == list(range(1, 11))
+        assert all(storage.synced)
+
+    def test_write_error_is_raised_to_every_writer(self):
+        # Arrange
+        storage = SlowStorage()
+        storage.write = lambda *args, **kwargs: (_ for _ in ()).throw(OSError("disk full"))  # type: ignore
+        pipeline = CommitPipeline(storage=storage)
+
+        # Assert
+        with pytest.raises(OSError):
+            pipeline.commit({}, [("delete", 1)])
+
+
+class TestCommittedState:
+    def test_compaction_snapshots_only_committed_changes(self, tmpdir: Any):
+        # Arrange
+        path = str(tmpdir.join("books.json"))
+        repository = JSONRepository(db_path=path, model=BookModel, storage="journal")
+        storage = repository._storage
+        # Toda gravação compacta: o snapshot é a imagem inteira dos registros em memória
+        storage.max_journal_bytes = 1  # type: ignore
+        write, guard = storage.write, repository._pipeline.guard
+        writes: list[int] = []
+        failures: list[BaseException] = []
+
+        def write_once(records: Any, changes: list[Change], sync: bool = False):
+            writes.append(len(changes))
+            if len(writes) > 1:
+                raise OSError("disk full")
+            write(records, changes, sync)
+
+        def insert_second():
+            try:
+                repository.insert(BookModel(id=2, title="Duna", user_id=1))
+            except OSError as error:
+                failures.append(error)
+
+        second = threading.Thread(target=insert_second)
+
+        def guard_with_concurrent_insert():
+            # Entre o líder abrir o lote e obter o guard, outra escrita altera os registros
+            if not second.is_alive() and not writes:
+                second.start()
+                while 2 not in (repository._records or {}):
+                    time.sleep(0.001)
+            return guard()
+
+        storage.write = write_once  # type: ignore
+        repository._pipeline.guard = guard_with_concurrent_insert
+
+        # Act
+        repository.insert(BookModel(id=1, title="1984", user_id=1))
+        second.join()
+        with pytest.raises(OSError):
+            repository.insert(BookModel(id=3, title="Neuromancer", user_id=1))
+        storage.wait_for_compaction()  # type: ignore
+
+        # Assert
+        on_disk = [item.id for item in JSONRepository(db_path=path, model=BookModel, storage="journal").load_data()]
+        # O que está em disco foi confirmado a quem escreveu, e o que falhou não está
+        assert failures == []
+        assert on_disk == [1, 2]
+        assert repository.find(3) is None
+        assert [item.id for item in repository.load_data()] == [1, 2]
+
+
+def disk_and_memory(repository: JSONRepository) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    reopened = JSONRepository(db_path=repository.db_path, model=BookModel, storage=repository.storage)
+    return (
+        [(item.id, item.title) for item in reopened.load_data()],
+        [(item.id, item.title) for item in repository.load_data()],
+    )
+
+
+class TestRestore:
+    @pytest.mark.parametrize("engine", ["file", "journal"])
+    def test_insert_racing_a_restore_lands_after_it(self, tmpdir: Any, engine: str):
+        # Arrange
+        repository = JSONRepository(db_path=str(tmpdir.join("books.json")), model=BookModel, storage=engine)
+        repository.insert(BookModel(id=1, title="Old one", user_id=1))
+        storage = repository._storage
+        replace = storage.replace
+        concurrent = threading.Thread(target=repository.insert, args=(BookModel(id=2, title="Concurrent", user_id=1),))
+
+        def replace_during_insert(items: list[Any], sync: bool = False):
+            concurrent.start()
+            # A inserção fica esperando a troca terminar
+            time.sleep(0.05)
+            replace(items, sync)
+
+        storage.replace = replace_during_insert  # type: ignore
+
+        # Act
+        repository.restore([BookModel(id=1, title="Snapshot", user_id=1)], next_id=2)
+        concurrent.join()
+
+        # Assert
+        on_disk, in_memory = disk_and_memory(repository)
+        assert on_disk == in_memory == [(1, "Snapshot"), (2, "Concurrent")]
+
+    @pytest.mark.parametrize("engine", ["file", "journal"])
+    def test_batch_submitted_before_a_restore_is_written_first(self, tmpdir: Any, engine: str):
+        # Arrange
+        path = str(tmpdir.join("books.json"))
+        repository = JSONRepository(db_path=path, model=BookModel, storage=engine, commit_window_ms=100)
+        repository.insert(BookModel(id=1, title="Old one", user_id=1))
+        # O líder deste lote dorme na janela de agrupamento enquanto o restore acontece
+        pending = threading.Thread(target=repository.insert, args=(BookModel(id=2, title="Pending", user_id=1),))
+        pending.start()
+        while 2 not in (repository._records or {}):
+            time.sleep(0.001)
+
+        # Act
+        repository.restore([BookModel(id=1, title="Snapshot", user_id=1)], next_id=3)
+        pending.join()
+
+        # Assert
+        on_disk, in_memory = disk_and_memory(repository)
+        assert on_disk == in_memory == [(1, "Snapshot")]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
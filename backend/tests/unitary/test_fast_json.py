@@ -0,0 +1,83 @@
+import io
+
+import pytest  # type: ignore
+
+from backend.infrastructure.storage.fast_json import JSON_BACKENDS, select_backend
+from backend.infrastructure.storage.serializers import JSONSerializer
+
+RECORDS = [
+    {"id": 1, "title": "Admirável Mundo Novo", "user_id": 1, "status": True},
+    {"id": 2, "title": "Duna", "user_id": 1, "status": False},
+]
+
+
+def available_backends() -> list[str]:
+    backends = []
+    for name in JSON_BACKENDS:
+        try:
+            select_backend(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+@pytest.fixture(params=available_backends())
+def backend(request):  # type: ignore
+    return select_backend(request.param)
+
+
+class TestJSONBackend:
+    def test_round_trip_in_bytes(self, backend):  # type: ignore
+        # Act
+        data = backend.dumps(RECORDS)
+
+        # Assert
+        assert isinstance(data, bytes)
+        assert backend.loads(data) == RECORDS
+        assert backend.loads(data.decode("utf-8")) == RECORDS
+
+    def test_values_outside_fast_path(self, backend):  # type: ignore
+        # Act
+        data = backend.dumps({1: "um", "big": 2**70})
+
+        # Assert
+        assert backend.loads(data) == {"1": "um", "big": 2**70}
+
+    def test_invalid_json_is_value_error(self, backend):  # type: ignore
+        # Act / Assert
+        with pytest.raises(ValueError):
+            backend.loads(b'{"title": ')
+
+    def test_unknown_backend(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            select_backend("yaml")
+
+    def test_auto_selects_an_installed_backend(self):
+        # Assert
+        assert select_backend().name == available_backends()[0]
+
+
+class TestJSONSerializer:
+    @pytest.mark.parametrize("max_buffered_bytes", [0, 1024 * 1024])
+    def test_buffered_and_streamed_loads_match(self, max_buffered_bytes: int):
+        # Arrange
+        f = io.BytesIO()  # pylint: disable = C0103
+        JSONSerializer().dump(RECORDS, f)
+        f.seek(0)
+
+        # Act
+        records = list(JSONSerializer(max_buffered_bytes=max_buffered_bytes).load(f))
+
+        # Assert
+        assert records == RECORDS
+
+    def test_buffered_load_requires_array(self):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            list(JSONSerializer().load(io.BytesIO(b'{"id": 1}')))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
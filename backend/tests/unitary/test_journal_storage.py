@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.storage.journal_storage import JournalStorage
+
+
+@pytest.fixture
+def temp_json_file(tmpdir):  # type: ignore
+    return Path(tmpdir.join("database/books.json"))  # type: ignore
+
+
+@pytest.fixture
+def journal_repository(temp_json_file: Any):
+    return JSONRepository(db_path=temp_json_file, model=BookModel, storage="journal")
+
+
+def reopen(path: Path) -> JSONRepository:
+    return JSONRepository(db_path=str(path), model=BookModel, storage="journal")
+
+
+class TestJournalStorage:
+    def test_mutations_are_appended(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Act
+        journal_repository.insert(BookModel(id=1, title="1984", user_id=1))
+        journal_repository.insert(BookModel(id=2, title="Duna", user_id=1))
+        journal_repository.replace(BookModel(id=1, title="Admirável Mundo Novo", user_id=1))
+        journal_repository.remove(2)
+
+        # Assert
+        journal = temp_json_file.with_name("books.json.journal").read_text().splitlines()
+        assert len(journal) == 4
+        assert json.loads(temp_json_file.read_text()) == []
+        assert [item.model_dump() for item in reopen(temp_json_file).load_data()] == [
+            {"id": 1, "title": "Admirável Mundo Novo", "user_id": 1, "status": False}
+        ]
+
+    def test_torn_entry_is_discarded(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        journal_repository.insert(BookModel(id=1, title="1984", user_id=1))
+        with open(temp_json_file.with_name("books.json.journal"), "a") as f:  # pylint: disable = W1514, C0103
+            f.write('{"op": "put", "record": {"id": 2, "tit')
+
+        # Act
+        repository = reopen(temp_json_file)
+        repository.insert(BookModel(id=3, title="Duna", user_id=1))
+
+        # Assert
+        assert [item.id for item in reopen(temp_json_file).load_data()] == [1, 3]
+
+    def test_compaction(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        storage: JournalStorage = journal_repository._storage  # type: ignore  # pylint: disable = W0212
+        storage.max_journal_bytes = 512
+
+        # Act
+        for book_id in range(1, 21):
+            journal_repository.insert(BookModel(id=book_id, title="1984", user_id=1))
+        storage.wait_for_compaction()
+
+        # Assert
+        assert len(json.loads(temp_json_file.read_text())) > 0
+        assert not temp_json_file.with_name("books.json.journal.old").exists()
+        assert [item.id for item in reopen(temp_json_file).load_data()] == list(range(1, 21))
+
+    def test_save_data_replaces_collection(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        journal_repository.insert(BookModel(id=1, title="1984", user_id=1))
+
+        # Act
+        journal_repository.save_data([BookModel(id=2, title="Duna", user_id=1)])
+
+        # Assert
+        assert [item.id for item in reopen(temp_json_file).load_data()] == [2]
+
+
+class TestJournalCatchUp:
+    def test_other_process_writes_are_applied_without_reload(
+        self, journal_repository: JSONRepository, temp_json_file: Path, monkeypatch: Any
+    ):
+        # Arrange
+        journal_repository.insert(BookModel(id=1, title="1984", user_id=1))
+        journal_repository.insert(BookModel(id=2, title="Duna", user_id=1))
+        other_process = reopen(temp_json_file)
+        assert len(other_process.load_data()) == 2
+        monkeypatch.setattr(other_process._storage, "read", None)  # pylint: disable = W0212
+
+        # Act
+        journal_repository.insert(BookModel(id=3, title="Solaris", user_id=2))
+        journal_repository.modify(1, {"status": True})
+        journal_repository.remove(2)
+
+        # Assert
+        assert [item.model_dump() for item in other_process.load_data()] == [
+            {"id": 1, "title": "1984", "user_id": 1, "status": True},
+            {"id": 3, "title": "Solaris", "user_id": 2, "status": False},
+        ]
+        assert other_process.page_data(10)[0] == [
+            {"id": 1, "title": "1984", "user_id": 1, "status": True},
+            {"id": 3, "title": "Solaris", "user_id": 2, "status": False},
+        ]
+
+    def test_stale_writer_replays_the_journal_in_order(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        journal_repository.insert(BookModel(id=1, title="1984", user_id=1))
+        other_process = reopen(temp_json_file)
+        other_process.load_data()
+
+        # Act
+        journal_repository.modify(1, {"title": "Duna"})
+        other_process.insert(BookModel(id=2, title="Solaris", user_id=1))
+        journal_repository.remove(2)
+
+        # Assert
+        expected = [{"id": 1, "title": "Duna", "user_id": 1, "status": False}]
+        assert [item.model_dump() for item in other_process.load_data()] == expected
+        assert [item.model_dump() for item in journal_repository.load_data()] == expected
+        assert [item.model_dump() for item in reopen(temp_json_file).load_data()] == expected
+
+    def test_compaction_falls_back_to_a_full_reload(self, journal_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        journal_repository._storage.max_journal_bytes = 256  # type: ignore  # pylint: disable = W0212
+        other_process = reopen(temp_json_file)
+        other_process.load_data()
+
+        # Act
+        for book_id in range(1, 11):
+            journal_repository.insert(BookModel(id=book_id, title="1984", user_id=1))
+        journal_repository._storage.wait_for_compaction()  # type: ignore  # pylint: disable = W0212
+
+        # Assert
+        assert [item.id for item in other_process.load_data()] == list(range(1, 11))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
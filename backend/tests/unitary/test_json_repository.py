@@ -0,0 +1,190 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.storage.file_storage import FileStorage
+
+
+@pytest.fixture
+def temp_json_file(tmpdir):  # type: ignore
+    file = tmpdir.join("database/books.json")
+    file.ensure(file=True)
+    file.write(json.dumps([{"id": 1, "title": "1984", "user_id": 1, "status": True}]))
+    return Path(file)  # type: ignore
+
+
+@pytest.fixture
+def json_repository(temp_json_file: Any):
+    return JSONRepository(db_path=temp_json_file, model=BookModel)
+
+
+class TestCache:
+    def test_load_data_uses_cache(self, json_repository: JSONRepository, monkeypatch: Any):
+        # Arrange
+        json_repository.load_data()
+        monkeypatch.setattr(json, "load", lambda *args, **kwargs: pytest.fail("file parsed again"))  # type: ignore
+
+        # Act
+        data = json_repository.load_data()
+
+        # Assert
+        assert [item.id for item in data] == [1]
+
+    def test_save_data_updates_cache(self, json_repository: JSONRepository, monkeypatch: Any):
+        # Arrange
+        data = json_repository.load_data()
+        data.append(BookModel(id=2, title="Admirável Mundo Novo", user_id=1))
+
+        # Act
+        json_repository.save_data(data)
+        monkeypatch.setattr(json, "load", lambda *args, **kwargs: pytest.fail("file parsed again"))  # type: ignore
+
+        # Assert
+        assert [item.id for item in json_repository.load_data()] == [1, 2]
+
+    def test_external_change_invalidates_cache(self, json_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        json_repository.load_data()
+        other_process = JSONRepository(db_path=str(temp_json_file), model=BookModel)
+
+        # Act
+        other_process.save_data([BookModel(id=3, title="Duna", user_id=2)])
+
+        # Assert
+        assert [item.id for item in json_repository.load_data()] == [3]
+
+
+class TestPrimaryKeyIndex:
+    def test_find(self, json_repository: JSONRepository):
+        # Act
+        item = json_repository.find(1)
+
+        # Assert
+        assert item is not None
+        assert item.title == "1984"
+        assert json_repository.find(99) is None
+
+    def test_remove_keeps_insertion_order(self, json_repository: JSONRepository):
+        # Arrange
+        json_repository.insert(BookModel(id=2, title="Duna", user_id=1))
+        json_repository.insert(BookModel(id=3, title="Neuromancer", user_id=1))
+
+        # Act
+        json_repository.remove(2)
+
+        # Assert
+        assert [item.id for item in json_repository.load_data()] == [1, 3]
+        assert json_repository.find(2) is None
+
+    def test_insert_duplicate_id(self, json_repository: JSONRepository):
+        with pytest.raises(ValueError):
+            json_repository.insert(BookModel(id=1, title="Duna", user_id=1))
+
+    def test_modify_keeps_the_id_and_revalidates(self, json_repository: JSONRepository):
+        # Arrange
+        json_repository.insert(BookModel(id=2, title="Duna", user_id=1))
+
+        # Act
+        modified = json_repository.modify(1, {"id": 2, "title": "Admirável Mundo Novo"})
+
+        # Assert
+        assert (modified.id, modified.title) == (1, "Admirável Mundo Novo")  # type: ignore
+        assert json_repository.find(2).title == "Duna"  # type: ignore
+        assert [item.id for item in json_repository.load_data()] == [1, 2]
+        for fields in ({"title": ""}, {"user_id": "x"}, {"isbn": "123"}):
+            with pytest.raises(ValueError):
+                json_repository.modify(1, fields)
+        assert json_repository.find(1).title == "Admirável Mundo Novo"  # type: ignore
+
+
+class TestIdAllocator:
+    def test_sequence_starts_after_existing_ids(self, json_repository: JSONRepository):
+        assert json_repository.reserve_ids(1) == range(2, 3)
+
+    def test_ids_are_not_reused(self, json_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        book_id = json_repository.reserve_ids(1).start
+        json_repository.insert(BookModel(id=book_id, title="Duna", user_id=1))
+
+        # Act
+        json_repository.remove(book_id)
+        other_process = JSONRepository(db_path=str(temp_json_file), model=BookModel)
+
+        # Assert
+        assert other_process.reserve_ids(1).start == book_id + 1
+
+    def test_reserve_block(self, json_repository: JSONRepository):
+        # Act
+        block = json_repository.reserve_ids(10)
+
+        # Assert
+        assert len(block) == 10
+        assert json_repository.reserve_ids(1).start == block.stop
+
+
+class TestConcurrency:
+    def test_concurrent_modifications_are_not_lost(self, json_repository: JSONRepository):
+        # Arrange
+        json_repository.insert(BookModel(id=2, title="Duna", user_id=1))
+
+        def modify(fields: dict[str, Any]):
+            for _ in range(20):
+                json_repository.modify(2, fields)
+
+        # Act
+        threads = [
+            threading.Thread(target=modify, args=({"title": "Duna Messias"},)),
+            threading.Thread(target=modify, args=({"status": True},)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        book = json_repository.find(2)
+        assert book.title == "Duna Messias"  # type: ignore
+        assert book.status is True  # type: ignore
+
+    def test_concurrent_inserts_are_all_written(self, json_repository: JSONRepository, temp_json_file: Path):
+        # Arrange
+        def insert():
+            for _ in range(10):
+                book_id = json_repository.reserve_ids(1).start
+                json_repository.insert(BookModel(id=book_id, title="Duna", user_id=1))
+
+        # Act
+        threads = [threading.Thread(target=insert) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        on_disk = JSONRepository(db_path=str(temp_json_file), model=BookModel)
+        assert len(on_disk.load_data()) == 41
+        assert len(json_repository.load_data()) == 41
+
+    def test_write_from_stale_process_is_merged(self, temp_json_file: Path):
+        # Arrange
+        storage = FileStorage(path=temp_json_file)
+        records = {item["id"]: BookModel(**item) for item in storage.read()}
+        other_process = JSONRepository(db_path=str(temp_json_file), model=BookModel)
+        other_process.insert(BookModel(id=2, title="Duna", user_id=1))
+
+        # Act
+        records[3] = BookModel(id=3, title="Neuromancer", user_id=1)
+        storage.write(records, [("put", records[3])])
+
+        # Assert
+        assert [item["id"] for item in json.loads(temp_json_file.read_text())] == [1, 2, 3]
+        assert storage.changed()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,44 @@
+import io
+import json
+
+import pytest  # type: ignore
+
+from backend.infrastructure.storage.json_stream import iter_json_array
+
+BOOKS = [
+    {"id": 1, "title": "Admirável Mundo Novo", "user_id": 1, "status": True},
+    {"id": 22, "title": "1984", "user_id": 333, "status": False},
+    {"id": 4444, "title": "Duna, [parte 1]", "user_id": 5, "status": False},
+]
+
+
+class TestIterJsonArray:
+    @pytest.mark.parametrize("chunk_size", [1, 2, 7, 64 * 1024])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_yields_every_item(self, chunk_size: int, indent: int):
+        text = json.dumps(BOOKS, indent=indent, ensure_ascii=False)
+
+        assert list(iter_json_array(io.StringIO(text), chunk_size)) == BOOKS
+
+    def test_numbers_cut_at_chunk_boundary(self):
+        assert list(iter_json_array(io.StringIO("[1, 23, 456]"), chunk_size=5)) == [1, 23, 456]
+
+    def test_empty_array(self):
+        assert not list(iter_json_array(io.StringIO(" [ ] "), chunk_size=1))
+
+    def test_is_lazy(self):
+        items = iter_json_array(io.StringIO('[{"id": 1}, {"id": 2}, oops'), chunk_size=4)
+
+        assert next(items) == {"id": 1}
+        assert next(items) == {"id": 2}
+        with pytest.raises(ValueError):
+            next(items)
+
+    @pytest.mark.parametrize("text", ["", "{}", "[1,", "[1 2]"])
+    def test_invalid(self, text: str):
+        with pytest.raises(ValueError):
+            list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
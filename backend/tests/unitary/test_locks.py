@@ -0,0 +1,94 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from backend.infrastructure.storage.locks import FileLock, ReadWriteLock
+
+
+class TestReadWriteLock:
+    def test_readers_share_the_lock(self):
+        # Arrange
+        lock = ReadWriteLock()
+        inside = threading.Barrier(2, timeout=1)
+
+        def reader():
+            with lock.read():
+                inside.wait()
+
+        # Act
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert not inside.broken
+
+    def test_writer_excludes_readers(self):
+        # Arrange
+        lock = ReadWriteLock()
+        events: list[str] = []
+
+        def reader():
+            with lock.read():
+                events.append("read")
+
+        # Act
+        with lock.write():
+            thread = threading.Thread(target=reader)
+            thread.start()
+            time.sleep(0.05)
+            events.append("write")
+        thread.join()
+
+        # Assert
+        assert events == ["write", "read"]
+
+    def test_writer_is_reentrant(self):
+        lock = ReadWriteLock()
+        with lock.write(), lock.write(), lock.read():
+            pass
+        with lock.read():
+            pass
+
+    def test_read_cannot_be_upgraded(self):
+        lock = ReadWriteLock()
+        with lock.read(), pytest.raises(RuntimeError):
+            with lock.write():
+                pass
+
+
+class TestFileLock:
+    def test_serializes_holders(self, tmpdir):  # type: ignore
+        # Arrange
+        path = Path(tmpdir) / "books.json.lock"
+        events: list[str] = []
+
+        def holder(name: str):
+            # Cada FileLock abre o próprio descritor, como faria outro processo
+            with FileLock(path):
+                events.append(f"{name}:in")
+                time.sleep(0.05)
+                events.append(f"{name}:out")
+
+        # Act
+        threads = [threading.Thread(target=holder, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert [event.split(":")[1] for event in events] == ["in", "out", "in", "out"]
+
+    def test_is_reentrant(self, tmpdir):  # type: ignore
+        lock = FileLock(Path(tmpdir) / "books.json.lock")
+        with lock, lock:
+            pass
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
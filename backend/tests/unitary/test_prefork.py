@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest  # type: ignore
+
+from backend.main.server.engines import create_server
+from backend.main.server.prefork import Supervisor
+
+
+class PidHandler(BaseHTTPRequestHandler):
+    def do_GET(self):  # pylint: disable = C0103
+        body = str(os.getpid()).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any):  # pylint: disable = W0622
+        pass
+
+
+def serve_pid(port: int, ready: Callable[[], None]):
+    httpd = create_server(("127.0.0.1", port), PidHandler, reuse_port=True)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=httpd.shutdown, daemon=True).start())
+    ready()
+    httpd.serve_forever()
+    httpd.server_close()
+
+
+def supervise(port: int, workers: int):
+    Supervisor(target=lambda ready: serve_pid(port, ready), workers=workers).run()
+
+
+def get_pid(port: int) -> int:
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as connection:
+        connection.sendall(b"GET / HTTP/1.0\r\n\r\n")
+        response = b""
+        while chunk := connection.recv(4096):
+            response += chunk
+    return int(response.rsplit(b"\r\n\r\n", 1)[1])
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.05)
+
+
+def alive(pid: int) -> bool:
+    return Path(f"/proc/{pid}").exists()
+
+
+@pytest.fixture
+def supervisor():  # type: ignore
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = multiprocessing.get_context("fork").Process(target=supervise, args=(port, 2))
+    process.start()
+    yield process, port
+    if process.is_alive():
+        os.kill(process.pid, signal.SIGKILL)  # type: ignore
+    process.join()
+
+
+class TestSupervisor:
+    def test_restart_reload_and_stop(self, supervisor: Any):
+        # Arrange
+        process, port = supervisor
+        seen: set[int] = set()
+
+        def both_workers_answer() -> bool:
+            try:
+                seen.add(get_pid(port))
+            except OSError:
+                pass
+            return len(seen) == 2
+
+        wait_for(both_workers_answer)
+        first, second = sorted(seen)
+
+        # Act: um worker morre e é reposto
+        os.kill(first, signal.SIGKILL)
+        seen.clear()
+        wait_for(lambda: both_workers_answer() and first not in seen)
+        generation = set(seen)
+
+        # Act: SIGHUP troca a geração inteira sem deixar a porta fechada
+        os.kill(process.pid, signal.SIGHUP)
+        wait_for(lambda: not any(alive(pid) for pid in generation))
+        reloaded = {get_pid(port) for _ in range(20)}
+
+        # Act: SIGTERM para tudo
+        os.kill(process.pid, signal.SIGTERM)
+        process.join(10)
+
+        # Assert
+        assert second in generation
+        assert reloaded and not reloaded & generation
+        assert process.exitcode == 0
+        assert not any(alive(pid) for pid in reloaded)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,100 @@
+import pytest  # type: ignore
+
+from backend.main.routes.router import Router, RouteTable, allowed_methods
+
+
+@pytest.fixture
+def router():  # type: ignore
+    router = Router()
+    router.add("/books", "GET", "list_books", "books")
+    router.add("/books", "POST", "post_book", "books")
+    router.add("/books/search", "GET", "search_books", "books")
+    router.add("/books/bulk", "DELETE", "delete_books_bulk", "books")
+    router.add("/books/<int:id>", "GET", "get_book", "books")
+    router.add("/books/<int:id>", "PATCH", "patch_book", "books")
+    router.add("/books/user/<int:id>", "GET", "get_books_by_user", "books")
+    router.add("/tags/<name>", "GET", "get_tag", "tags")
+    return router
+
+
+class TestRouter:
+    def test_resolves_whole_path_with_typed_params(self, router: Router):
+        # Act
+        methods, params = router.resolve("/books/42")  # type: ignore
+
+        # Assert
+        assert methods["GET"] == ("get_book", "books")
+        assert params == {"id": 42}
+
+    def test_static_segments_win_over_params(self, router: Router):
+        # Act
+        search, _ = router.resolve("/books/search")  # type: ignore
+        bulk, _ = router.resolve("/books/bulk")  # type: ignore
+        by_user, params = router.resolve("/books/user/7")  # type: ignore
+
+        # Assert
+        assert search["GET"] == ("search_books", "books")
+        assert list(bulk) == ["DELETE"]
+        assert (by_user["GET"], params) == (("get_books_by_user", "books"), {"id": 7})
+
+    def test_prefixes_and_invalid_params_do_not_match(self, router: Router):
+        # Assert
+        assert router.resolve("/books/abc") is None
+        assert router.resolve("/books/+1") is None
+        assert router.resolve("/books/1/extra") is None
+        assert router.resolve("/books/user") is None
+        assert router.resolve("/") is None
+
+    def test_untyped_params_are_strings_and_trailing_slash_is_ignored(self, router: Router):
+        # Act
+        _, params = router.resolve("/tags/ficção/")  # type: ignore
+        methods, _ = router.resolve("/books/")  # type: ignore
+
+        # Assert
+        assert params == {"name": "ficção"}
+        assert allowed_methods(methods) == "GET, POST, OPTIONS"
+
+    def test_unknown_param_type_is_rejected(self, router: Router):
+        with pytest.raises(ValueError):
+            router.add("/books/<float:price>", "GET", "by_price", "books")
+
+    def test_registering_again_replaces_the_handler(self, router: Router):
+        # Act
+        router.add("/books/<int:id>", "GET", "get_book_v2", "books")
+        methods, _ = router.resolve("/books/1")  # type: ignore
+
+        # Assert
+        assert methods["GET"] == ("get_book_v2", "books")
+
+
+class TestRouteTable:
+    def test_route_applies_middlewares_in_order(self):
+        # Arrange
+        table = RouteTable()
+        calls = []
+
+        def middleware(name):  # type: ignore
+            def wrap(handler):  # type: ignore
+                def wrapper(*args):  # type: ignore
+                    calls.append(name)
+                    return handler(*args)
+
+                return wrapper
+
+            return wrap
+
+        @table.route("/ping", "GET", middlewares=[middleware("inner"), middleware("outer")])
+        def ping():  # type: ignore
+            return "pong"
+
+        # Act
+        path, method, handler = table.routes[0]
+        result = handler()
+
+        # Assert
+        assert (path, method, result) == ("/ping", "GET", "pong")
+        assert calls == ["outer", "inner"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
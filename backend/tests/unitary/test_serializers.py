@@ -0,0 +1,97 @@
+import io
+import json
+from pathlib import Path
+
+import pytest  # type: ignore
+
+from backend.domain.entities.book import BookModel
+from backend.infrastructure.repositories.json_repository import JSONRepository
+from backend.infrastructure.storage.convert import convert
+from backend.infrastructure.storage.serializers import BINARY_MAGIC, BinarySerializer, load_snapshot
+
+RECORDS = [
+    {"id": 1, "title": "1984", "user_id": 1, "status": True},
+    {"id": 2, "title": "Duna", "user_id": 1, "status": False},
+    {"id": 3, "title": "1984", "user_id": 2, "status": False},
+]
+
+
+def dump_binary(records: list) -> bytes:  # type: ignore
+    f = io.BytesIO()  # pylint: disable = C0103
+    BinarySerializer().dump(records, f)
+    return f.getvalue()
+
+
+@pytest.fixture
+def temp_json_file(tmpdir):  # type: ignore
+    file = tmpdir.join("database/books.json")
+    file.ensure(file=True)
+    file.write(json.dumps(RECORDS))
+    return Path(file)  # type: ignore
+
+
+class TestBinarySerializer:
+    def test_round_trip(self):
+        # Act
+        records = list(BinarySerializer(rows_per_chunk=2).load(io.BytesIO(dump_binary(RECORDS))))
+
+        # Assert
+        assert records == RECORDS
+
+    def test_strings_are_interned(self):
+        # Act
+        data = dump_binary(RECORDS)
+
+        # Assert
+        assert data.count(b"1984") == 1
+
+    def test_empty_collection(self):
+        assert not list(BinarySerializer().load(io.BytesIO(dump_binary([]))))
+
+    def test_truncated_snapshot(self):
+        with pytest.raises(ValueError):
+            list(BinarySerializer().load(io.BytesIO(dump_binary(RECORDS)[:-3])))
+
+    def test_record_outside_schema(self):
+        with pytest.raises(ValueError):
+            dump_binary(RECORDS + [{"id": 4, "title": 4, "user_id": 1, "status": False}])
+
+    def test_format_is_detected(self):
+        assert list(load_snapshot(io.BytesIO(dump_binary(RECORDS)))) == RECORDS
+        assert list(load_snapshot(io.BytesIO(json.dumps(RECORDS).encode("utf-8")))) == RECORDS
+
+
+class TestBinaryRepository:
+    def test_existing_json_is_rewritten_as_binary(self, temp_json_file: Path):
+        # Arrange
+        repository = JSONRepository(db_path=str(temp_json_file), model=BookModel, serializer="binary")
+
+        # Act
+        repository.insert(BookModel(id=4, title="Neuromancer", user_id=2))
+
+        # Assert
+        assert temp_json_file.read_bytes().startswith(BINARY_MAGIC)
+        reopened = JSONRepository(db_path=str(temp_json_file), model=BookModel)
+        assert [item.id for item in reopened.load_data()] == [1, 2, 3, 4]
+
+    def test_unknown_serializer(self, temp_json_file: Path):
+        with pytest.raises(ValueError):
+            JSONRepository(db_path=str(temp_json_file), model=BookModel, serializer="xml")
+
+
+class TestConvert:
+    def test_convert_both_ways(self, temp_json_file: Path):
+        # Arrange
+        binary_file = temp_json_file.with_name("books.bin")
+
+        # Act
+        convert(temp_json_file, binary_file, "binary")
+        convert(binary_file, temp_json_file, "json")
+
+        # Assert
+        assert binary_file.read_bytes().startswith(BINARY_MAGIC)
+        assert json.loads(temp_json_file.read_text()) == RECORDS
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
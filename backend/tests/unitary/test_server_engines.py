@@ -0,0 +1,120 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.main.server.engines import PooledHTTPServer, create_server
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    # Segura o worker até o teste liberar
+    started = threading.Event()
+    release = threading.Event()
+
+    def do_GET(self):  # pylint: disable = C0103
+        self.started.set()
+        self.release.wait(5)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any):  # pylint: disable = W0622
+        pass
+
+
+def send_get(port: int) -> socket.socket:
+    connection = socket.create_connection(("127.0.0.1", port), timeout=5)
+    connection.sendall(b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    return connection
+
+
+def read_all(connection: socket.socket) -> bytes:
+    data = b""
+    while chunk := connection.recv(65536):
+        data += chunk
+    connection.close()
+    return data
+
+
+@pytest.fixture
+def pooled_server():  # type: ignore
+    SlowHandler.started.clear()
+    SlowHandler.release.clear()
+    httpd = PooledHTTPServer(("127.0.0.1", 0), SlowHandler, workers=1, queue_size=1, retry_after=3)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    SlowHandler.release.set()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+class TestPooledHTTPServer:
+    def test_sheds_load_when_the_queue_is_full(self, pooled_server: PooledHTTPServer):
+        # Arrange
+        port = pooled_server.server_address[1]
+        # O primeiro ocupa o único worker, o segundo a única vaga da fila
+        busy = send_get(port)
+        SlowHandler.started.wait(5)
+        queued = send_get(port)
+        while pooled_server._queue.qsize() < 1:
+            threading.Event().wait(0.01)
+
+        # Act
+        rejected = read_all(send_get(port))
+        SlowHandler.release.set()
+
+        # Assert
+        assert rejected.startswith(b"HTTP/1.1 503 Service Unavailable\r\n")
+        assert b"\r\nRetry-After: 3\r\n" in rejected
+        assert rejected.endswith(b'{"error": "Server overloaded"}') or rejected.endswith(
+            b'{"error":"Server overloaded"}'
+        )
+        assert read_all(busy).endswith(b"\r\n\r\nok")
+        assert read_all(queued).endswith(b"\r\n\r\nok")
+
+    def test_rejects_invalid_sizes(self):
+        with pytest.raises(ValueError):
+            PooledHTTPServer(("127.0.0.1", 0), SlowHandler, workers=0)
+
+
+class TestCreateServer:
+    def test_engines(self):
+        # Act
+        threading_server = create_server(("127.0.0.1", 0), SlowHandler)
+        pooled = create_server(("127.0.0.1", 0), SlowHandler, engine="pool", workers=2, queue_size=5)
+
+        # Assert
+        assert isinstance(threading_server, ThreadingHTTPServer)
+        assert isinstance(pooled, PooledHTTPServer)
+        assert (pooled.workers, pooled.queue_size) == (2, 5)
+        threading_server.server_close()
+        pooled.server_close()
+        with pytest.raises(ValueError):
+            create_server(("127.0.0.1", 0), SlowHandler, engine="fibers")
+
+    @pytest.mark.parametrize("engine", ["threading", "pool"])
+    def test_reuse_port_lets_two_servers_share_the_port(self, engine: str):
+        # Arrange
+        first = create_server(("127.0.0.1", 0), SlowHandler, engine=engine, workers=1, reuse_port=True)
+        port = first.server_address[1]
+
+        # Act
+        try:
+            second = create_server(("127.0.0.1", port), SlowHandler, engine=engine, workers=1, reuse_port=True)
+        finally:
+            first.server_close()
+
+        # Assert
+        # Sem depender do allow_reuse_port do socketserver, que o Python 3.10 ignora
+        assert second.socket.getsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT) == 1
+        assert second.server_address[1] == port
+        second.server_close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.builders.book_builder import BookBuilder
+from backend.domain.builders.user_builder import UserBuilder  # type: ignore
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.snapshots import SnapshotStore, install_snapshot
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+from backend.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from backend.infrastructure.repositories.user_repository import UserRepository
+
+
+def make_book(title: str, user_id: int = 1) -> Any:
+    return BookBuilder().with_title(title).with_user_id(user_id).build()
+
+
+def make_user(email: str) -> Any:
+    return UserBuilder().with_name("John Doe").with_email(email).with_password("default").with_age(30).build()
+
+
+@pytest.fixture(params=["file", "journal"])
+def repositories(tmpdir, request):  # type: ignore
+    return {
+        "users": UserRepository(db_path=str(tmpdir.join("database/users.json")), storage=request.param),
+        "books": BookRepository(db_path=str(tmpdir.join("database/books.json")), storage=request.param),
+    }
+
+
+@pytest.fixture
+def store(tmpdir, repositories: dict[str, Any]):  # type: ignore
+    return SnapshotStore(directory=Path(tmpdir.join("snapshots")), repositories=repositories)
+
+
+class TestJSONSnapshots:
+    def test_create_and_restore(self, store: SnapshotStore, repositories: dict[str, Any]):
+        # Arrange
+        repositories["users"].add(make_user("john@example.com"))
+        repositories["books"].add(make_book("1984"))
+        repositories["books"].add(make_book("Duna"))
+
+        # Act
+        manifest = store.create("before")
+        repositories["books"].update(1, {"title": "Changed"})
+        repositories["books"].delete(2)
+        created = repositories["books"].add(make_book("Neuromancer"))
+        store.restore("before")
+
+        # Assert
+        assert manifest["collections"]["books"]["records"] == 2
+        assert manifest["collections"]["users"]["records"] == 1
+        assert [book["title"] for book in repositories["books"].get_all()] == ["1984", "Duna"]
+        # O id entregue depois do snapshot não volta a ser usado
+        assert repositories["books"].add(make_book("Solaris"))["id"] > created["id"]
+        assert [item["name"] for item in store.manifests()] == ["before"]
+
+    def test_restore_is_persisted(self, tmpdir, store: SnapshotStore, repositories: dict[str, Any]):  # type: ignore
+        # Arrange
+        repositories["books"].add(make_book("1984"))
+        store.create("one")
+        repositories["books"].add(make_book("Duna"))
+
+        # Act
+        store.restore("one")
+        reopened = BookRepository(
+            db_path=str(tmpdir.join("database/books.json")), storage=repositories["books"].storage
+        )
+
+        # Assert
+        assert [book["title"] for book in reopened.get_all()] == ["1984"]
+
+    def test_writes_continue_during_snapshot(self, store: SnapshotStore, repositories: dict[str, Any]):
+        # Arrange
+        for index in range(200):
+            repositories["books"].add(make_book(f"Book {index}"))
+        errors: list[Exception] = []
+
+        def writer():
+            try:
+                for index in range(100):
+                    repositories["books"].add(make_book(f"Concurrent {index}"))
+            except Exception as error:  # pylint: disable = W0718
+                errors.append(error)
+
+        # Act
+        thread = threading.Thread(target=writer)
+        thread.start()
+        manifest = store.create("live")
+        thread.join()
+
+        # Assert
+        records = manifest["collections"]["books"]["records"]
+        assert not errors
+        assert 200 <= records <= 300
+        assert manifest["collections"]["books"]["next_id"] > records
+
+    def test_invalid_names(self, store: SnapshotStore):
+        # Act / Assert
+        with pytest.raises(ValueError):
+            store.restore("../database")
+        with pytest.raises(ValueError):
+            store.restore("missing")
+        store.create("taken")
+        with pytest.raises(ValueError):
+            store.create("taken")
+
+    def test_warm_start(self, tmpdir, store: SnapshotStore, repositories: dict[str, Any]):  # type: ignore
+        # Arrange
+        repositories["users"].add(make_user("john@example.com"))
+        repositories["books"].add(make_book("1984"))
+        store.create("image")
+        target = Path(tmpdir.join("warm"))
+
+        # Act
+        install_snapshot(store.directory / "image", {"users": target / "users.json", "books": target / "books.json"})
+        books = BookRepository(db_path=str(target / "books.json"))
+
+        # Assert
+        assert [book["title"] for book in books.get_all()] == ["1984"]
+        assert books.add(make_book("Duna"))["id"] == 2
+        assert UserRepository(db_path=str(target / "users.json")).get_by_id(1)["email"] == "john@example.com"
+
+
+class TestSQLiteSnapshots:
+    def test_create_and_restore(self, tmpdir):  # type: ignore
+        # Arrange
+        database_url = f"sqlite:///{tmpdir.join('database/saiph.db')}"
+        books = SQLiteBookRepository(dsn=database_url)
+        users = SQLiteUserRepository(dsn=database_url)
+        store = SnapshotStore(directory=Path(tmpdir.join("snapshots")), repositories={"users": users, "books": books})
+        users.add(make_user("john@example.com"))
+        books.add(make_book("1984"))
+
+        # Act
+        manifest = store.create("before")
+        books.add(make_book("Duna"))
+        users.delete(1)
+        store.restore("before")
+
+        # Assert
+        assert manifest["collections"]["books"] == {"engine": "sqlite", "file": "saiph.db"}
+        assert [book["title"] for book in books.get_all()] == ["1984"]
+        assert users.get_by_id(1)["email"] == "john@example.com"
+        assert books.search("1984", 10)[0]["id"] == 1
+        assert books.add(make_book("Solaris"))["id"] == 3
+        books.close()
+        users.close()
+
+    def test_install_keeps_ids_issued_after_the_snapshot(self, tmpdir):  # type: ignore
+        # Arrange
+        database_url = f"sqlite:///{tmpdir.join('database/saiph.db')}"
+        books = SQLiteBookRepository(dsn=database_url)
+        users = SQLiteUserRepository(dsn=database_url)
+        store = SnapshotStore(directory=Path(tmpdir.join("snapshots")), repositories={"users": users, "books": books})
+        books.add(make_book("1984"))
+        store.create("before")
+        books.add(make_book("Duna"))
+        books.add(make_book("Solaris"))
+        books.close()
+        users.close()
+        target = books.path
+
+        # Act
+        install_snapshot(store.directory / "before", {"users": target, "books": target})
+        installed = SQLiteBookRepository(dsn=database_url)
+
+        # Assert
+        assert [book["title"] for book in installed.get_all()] == ["1984"]
+        assert installed.add(make_book("Fundação"))["id"] == 4
+        installed.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
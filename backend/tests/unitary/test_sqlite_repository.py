@@ -0,0 +1,231 @@
+import gc
+import os
+import threading
+import time
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.domain.builders.book_builder import BookBuilder
+from backend.domain.builders.user_builder import UserBuilder  # type: ignore
+from backend.domain.entities.book import Book
+from backend.infrastructure.repositories import sqlite_book_repository
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+from backend.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+
+
+@pytest.fixture
+def database_url(tmpdir):  # type: ignore
+    return f"sqlite:///{tmpdir.join('database/saiph.db')}"
+
+
+@pytest.fixture
+def book_repository(database_url: str):
+    repository = SQLiteBookRepository(dsn=database_url)
+    yield repository
+    repository.close()
+
+
+@pytest.fixture
+def user_repository(database_url: str):
+    repository = SQLiteUserRepository(dsn=database_url)
+    yield repository
+    repository.close()
+
+
+def make_user(email: str) -> Any:
+    return UserBuilder().with_name("John Doe").with_email(email).with_password("default").with_age(30).build()
+
+
+class TestSQLiteBookRepository:
+    def test_crud(self, book_repository: SQLiteBookRepository):
+        # Act
+        created = book_repository.add(BookBuilder().with_title("1984").with_user_id(1).build())
+        book_repository.add(BookBuilder().with_title("Duna").with_user_id(2).build())
+        updated = book_repository.update(created["id"], {"status": True})
+
+        # Assert
+        assert created == {"id": 1, "title": "1984", "user_id": 1, "status": False}
+        assert updated["status"] is True
+        assert book_repository.get_by_id(1) == updated
+        assert [book["id"] for book in book_repository.get_by_user_id(2)] == [2]
+        assert book_repository.delete(1) == [book_repository.get_by_id(2)]
+        with pytest.raises(ValueError):
+            book_repository.get_by_id(1)
+
+    def test_ids_are_not_reused(self, book_repository: SQLiteBookRepository):
+        # Arrange
+        created = book_repository.add(BookBuilder().with_title("1984").with_user_id(1).build())
+
+        # Act
+        book_repository.delete(created["id"])
+
+        # Assert
+        assert book_repository.add(BookBuilder().with_title("Duna").with_user_id(1).build())["id"] == created["id"] + 1
+
+    def test_connection_per_thread(self, book_repository: SQLiteBookRepository):
+        # Act
+        threads = [
+            threading.Thread(
+                target=book_repository.add, args=(BookBuilder().with_title("1984").with_user_id(1).build(),)
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        assert len(book_repository.get_all()) == 8
+
+    def test_update_keeps_the_id_and_revalidates(self, book_repository: SQLiteBookRepository):
+        # Arrange
+        book_repository.add(BookBuilder().with_title("1984").with_user_id(1).build())
+        book_repository.add(BookBuilder().with_title("Duna").with_user_id(2).build())
+
+        # Act
+        updated = book_repository.update(1, {"id": 2, "title": "Admirável Mundo Novo"})
+
+        # Assert
+        assert (updated["id"], updated["title"]) == (1, "Admirável Mundo Novo")
+        assert book_repository.get_by_id(2)["title"] == "Duna"
+        for fields in ({"title": ""}, {"user_id": "x"}, {"isbn": "123"}):
+            with pytest.raises(ValueError):
+                book_repository.update(1, fields)
+
+    def test_add_many_reports_constraint_violations_per_row(self, book_repository: SQLiteBookRepository):
+        # Arrange
+        existing = book_repository.add(BookBuilder().with_title("1984").with_user_id(1).build())
+        books = [
+            Book(id=existing["id"], title="Id Repetido", user_id=1),
+            Book(id=0, title="Duna", user_id=2),
+            Book(id=0, title="x", user_id=2),
+        ]
+
+        # Act
+        created, errors = book_repository.add_many(books)
+
+        # Assert
+        assert [book["title"] for book in created] == ["Duna"]
+        assert [position for position, _ in errors] == [0, 2]
+        assert [book["title"] for book in book_repository.get_all()] == ["1984", "Duna"]
+
+    def test_concurrent_patches_do_not_overwrite_each_other(
+        self, book_repository: SQLiteBookRepository, monkeypatch: Any
+    ):
+        # Arrange
+        book_repository.add(BookBuilder().with_title("Original").with_user_id(1).build())
+        row_to_book = sqlite_book_repository.row_to_book
+
+        def slow_row_to_book(row: Any) -> Any:
+            # Alarga a janela entre ler a linha e gravá-la
+            time.sleep(0.05)
+            return row_to_book(row)
+
+        monkeypatch.setattr(sqlite_book_repository, "row_to_book", slow_row_to_book)
+        patches = [{"title": "Novo Título"}, {"status": True}]
+        threads = [threading.Thread(target=book_repository.update, args=(1, patch)) for patch in patches]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        book = book_repository.get_by_id(1)
+        assert (book["title"], book["status"]) == ("Novo Título", True)
+
+    def test_toggle_does_not_overwrite_a_concurrent_patch(
+        self, book_repository: SQLiteBookRepository, monkeypatch: Any
+    ):
+        # Arrange
+        book_repository.add(BookBuilder().with_title("Original").with_user_id(1).build())
+        row_to_book = sqlite_book_repository.row_to_book
+
+        def slow_row_to_book(row: Any) -> Any:
+            time.sleep(0.05)
+            return row_to_book(row)
+
+        monkeypatch.setattr(sqlite_book_repository, "row_to_book", slow_row_to_book)
+        threads = [
+            threading.Thread(target=book_repository.toggle_status, args=(1,)),
+            threading.Thread(target=book_repository.update, args=(1, {"title": "Novo Título"})),
+        ]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        book = book_repository.get_by_id(1)
+        assert (book["title"], book["status"]) == ("Novo Título", True)
+
+    def test_toggle_missing_book(self, book_repository: SQLiteBookRepository):
+        with pytest.raises(ValueError):
+            book_repository.toggle_status(99)
+
+    def test_connections_of_finished_threads_are_closed(self, book_repository: SQLiteBookRepository):
+        # Arrange
+        book_repository.add(BookBuilder().with_title("1984").with_user_id(1).build())
+        open_fds = len(os.listdir("/proc/self/fd"))
+
+        # Act
+        # Como o motor "threading": uma thread curta por conexão HTTP
+        for _ in range(300):
+            thread = threading.Thread(target=book_repository.get_by_id, args=(1,))
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        # Assert
+        assert len(book_repository._holders) <= 1
+        assert len(os.listdir("/proc/self/fd")) <= open_fds + 3
+
+
+class TestSQLiteUserRepository:
+    def test_unique_email(self, user_repository: SQLiteUserRepository):
+        # Arrange
+        user_repository.add(make_user("johndoe@example.com"))
+
+        # Assert
+        with pytest.raises(ValueError):
+            user_repository.add(make_user("JohnDoe@example.com"))
+
+    def test_login(self, user_repository: SQLiteUserRepository):
+        # Arrange
+        created = user_repository.add(make_user("johndoe@example.com"))
+
+        # Assert
+        assert user_repository.validate_user("JOHNDOE@example.com", "default") == created
+        assert user_repository.validate_user("johndoe@example.com", "wrong") is None
+
+    def test_update_keeps_the_id_and_revalidates(self, user_repository: SQLiteUserRepository):
+        # Arrange
+        user_repository.add(make_user("john@example.com"))
+        user_repository.add(make_user("jane@example.com"))
+
+        # Act
+        updated = user_repository.update(1, {"id": 2, "name": "John Smith"})
+
+        # Assert
+        assert (updated["id"], updated["name"]) == (1, "John Smith")
+        assert user_repository.get_by_id(2)["email"] == "jane@example.com"
+        with pytest.raises(ValueError):
+            user_repository.update(1, {"name": ""})
+
+    def test_update_email_to_registered_email(self, user_repository: SQLiteUserRepository):
+        # Arrange
+        user_repository.add(make_user("johndoe@example.com"))
+        created = user_repository.add(make_user("janedoe@example.com"))
+
+        # Assert
+        with pytest.raises(ValueError):
+            user_repository.update(created["id"], {"email": "johndoe@example.com"})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+from typing import Any
+
+import pytest  # type: ignore
+
+from backend.application.services.stats import age_bucket
+from backend.application.use_cases.book_use_cases import BookUseCases
+from backend.application.use_cases.stats_use_cases import StatsUseCases
+from backend.domain.builders.book_builder import BookBuilder
+from backend.domain.entities.user import User
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.repositories.counters import GroupCounts
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+from backend.infrastructure.repositories.sqlite_user_repository import SQLiteUserRepository
+from backend.infrastructure.repositories.user_repository import UserRepository
+
+
+def open_repositories(engine: str, tmpdir: Any) -> tuple[Any, Any]:
+    if engine == "sqlite":
+        dsn = f"sqlite:///{tmpdir.join('database/saiph.db')}"
+        return SQLiteUserRepository(dsn=dsn), SQLiteBookRepository(dsn=dsn)
+    book_repository_class = ColumnarBookRepository if engine == "columnar" else BookRepository
+    return UserRepository(str(tmpdir.join("database/users.json"))), book_repository_class(
+        str(tmpdir.join("database/books.json"))
+    )
+
+
+@pytest.fixture(params=["json", "columnar", "sqlite"])
+def repositories(request, tmpdir):  # type: ignore
+    user_repository, book_repository = open_repositories(request.param, tmpdir)
+    for position, age in enumerate([7, 25, 29, 41]):
+        user_repository.add(
+            User(id=0, name=f"User {position}", email=f"user{position}@example.com", password="secret", age=age)
+        )
+    for i in range(6):
+        book_repository.add(BookBuilder().with_title("Duna").with_user_id(i % 3 + 1).with_status(i < 2).build())
+    yield request.param, user_repository, book_repository
+    if request.param == "sqlite":
+        user_repository.close()
+        book_repository.close()
+
+
+def per_user(stats: dict[str, Any]) -> dict[int, tuple[int, int]]:
+    return {entry["user_id"]: (entry["total"], entry["read"]) for entry in stats["books"]["per_user"]}
+
+
+class TestGroupCounts:
+    def test_empty_groups_are_dropped(self):
+        # Arrange
+        counts = GroupCounts(width=2)
+
+        # Act
+        counts.add(1, (1, True))
+        counts.add(2, (1, False))
+        counts.remove(1, (1, True))
+
+        # Assert
+        assert counts.totals == [1, 0]
+        assert counts.rows() == [(2, 1, 0)]
+
+    def test_age_bucket(self):
+        assert [age_bucket(age) for age in (0, 9, 10, 35, -1)] == [0, 0, 10, 30, 0]
+
+
+class TestStats:
+    def test_counters(self, repositories: Any):
+        # Arrange
+        _, user_repository, book_repository = repositories
+
+        # Act
+        stats = StatsUseCases(user_repository=user_repository, book_repository=book_repository).get_stats()
+
+        # Assert
+        assert stats["users"] == {
+            "total": 4,
+            "age_histogram": [
+                {"from": 0, "to": 9, "total": 1},
+                {"from": 20, "to": 29, "total": 2},
+                {"from": 40, "to": 49, "total": 1},
+            ],
+        }
+        assert {key: stats["books"][key] for key in ("total", "read", "unread")} == {"total": 6, "read": 2, "unread": 4}
+        assert stats["books"]["read_ratio"] == pytest.approx(1 / 3)
+        assert per_user(stats) == {1: (2, 1), 2: (2, 1), 3: (2, 0)}
+
+    def test_counters_follow_writes(self, repositories: Any):
+        # Arrange
+        _, user_repository, book_repository = repositories
+        use_cases = StatsUseCases(user_repository=user_repository, book_repository=book_repository)
+
+        # Act
+        BookUseCases(repository=book_repository).toggle_book_status(3)
+        book_repository.update(6, {"user_id": 9})
+        book_repository.delete(1)
+        book_repository.delete_many([4])
+        user_repository.update(1, {"age": 52})
+        stats = use_cases.get_stats()
+
+        # Assert
+        assert per_user(stats) == {2: (2, 1), 3: (1, 1), 9: (1, 0)}
+        assert (stats["books"]["total"], stats["books"]["read"]) == (4, 2)
+        assert [entry["from"] for entry in stats["users"]["age_histogram"]] == [20, 40, 50]
+
+    def test_counters_survive_reopen(self, repositories: Any, tmpdir: Any):
+        # Arrange
+        engine, user_repository, book_repository = repositories
+        expected = StatsUseCases(user_repository=user_repository, book_repository=book_repository).get_stats()
+
+        # Act
+        reopened = open_repositories(engine, tmpdir)
+        stats = StatsUseCases(user_repository=reopened[0], book_repository=reopened[1]).get_stats()
+
+        # Assert
+        assert stats == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
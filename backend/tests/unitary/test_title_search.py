@@ -0,0 +1,124 @@
+from typing import Any, Union
+
+import pytest  # type: ignore
+
+from backend.application.services.search import fold_text, tokenize
+from backend.application.use_cases.book_use_cases import BookUseCases
+from backend.domain.builders.book_builder import BookBuilder
+from backend.infrastructure.repositories.book_repository import BookRepository
+from backend.infrastructure.repositories.columnar_book_repository import ColumnarBookRepository
+from backend.infrastructure.repositories.sqlite_book_repository import SQLiteBookRepository
+from backend.infrastructure.repositories.title_index import TitleIndex
+
+TITLES = ["Admirável Mundo Novo", "O Mundo de Sofia", "Admirável", "Duna", "Mundo Admirável e Novo"]
+
+
+@pytest.fixture(params=["json", "columnar", "sqlite"])
+def book_repository(request, tmpdir):  # type: ignore
+    if request.param == "sqlite":
+        repository: Any = SQLiteBookRepository(dsn=f"sqlite:///{tmpdir.join('database/saiph.db')}")
+    elif request.param == "columnar":
+        repository = ColumnarBookRepository(str(tmpdir.join("database/books.json")))
+    else:
+        repository = BookRepository(str(tmpdir.join("database/books.json")))
+    for title in TITLES:
+        repository.add(BookBuilder().with_title(title).with_user_id(1).build())
+    yield repository
+    if request.param == "sqlite":
+        repository.close()
+
+
+def titles(books: Any) -> list[str]:
+    return [book["title"] for book in books]
+
+
+class TestTokenize:
+    def test_accents_and_case_are_folded(self):
+        assert fold_text("Admirável CORAÇÃO") == "admiravel coracao"
+        assert tokenize("Admirável Mundo, Novo!") == ["admiravel", "mundo", "novo"]
+
+
+class TestTitleIndex:
+    @pytest.fixture
+    def books(self):  # type: ignore
+        return {1: "Admirável Mundo Novo", 2: "Duna", 3: "Admirável", 4: "Mundo Admirável"}
+
+    @pytest.fixture(params=[False, True], ids=["lists", "compact"])
+    def index(self, request, books: dict[int, str]):  # type: ignore
+        index = TitleIndex(compact=request.param)
+        for book_id, title in books.items():
+            index.add(book_id, title)
+        return index
+
+    def test_prefix_search(self, index: TitleIndex):
+        assert index.search("admir", 10) == [3, 4, 1]
+        assert index.search("ADMIRAVEL mun", 10) == [4, 1]
+        assert index.search("admir duna", 10) == []
+        assert index.search("xyz", 10) == []
+
+    def test_whole_words_rank_first(self, index: TitleIndex, books: dict[int, str]):
+        # Act
+        books[5] = "Admiravelmente"
+        index.add(5, books[5])
+
+        # Assert
+        assert index.search("admiravel", 10) == [3, 4, 1, 5]
+        assert index.search("admiravel", 2) == [3, 4]
+
+    def test_remove(self, index: TitleIndex, books: dict[int, str]):
+        # Arrange
+        index.search("du", 10)  # type: ignore
+
+        # Act
+        index.remove(2, books.pop(2))
+        books[5] = "Dune"
+        index.add(5, books[5])
+
+        # Assert
+        assert index.search("dun", 10) == [5]
+
+
+class TestSearchBooks:
+    def test_search_is_accent_insensitive(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        assert sorted(titles(book_repository.search("admiravel", 10))) == sorted(
+            ["Admirável Mundo Novo", "Admirável", "Mundo Admirável e Novo"]
+        )
+
+    def test_all_terms_must_match(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        assert sorted(titles(book_repository.search("mun nov", 10))) == [
+            "Admirável Mundo Novo",
+            "Mundo Admirável e Novo",
+        ]
+
+    def test_limit(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        assert len(book_repository.search("mundo", 2)) == 2
+
+    def test_index_follows_updates(self, book_repository: Union[BookRepository, SQLiteBookRepository]):
+        # Act
+        book_repository.update(4, {"title": "Duna Messias"})
+        book_repository.delete(1)
+
+        # Assert
+        assert titles(book_repository.search("messi", 10)) == ["Duna Messias"]
+        assert "Admirável Mundo Novo" not in titles(book_repository.search("admir", 10))
+
+    def test_ranking(self, tmpdir):  # type: ignore
+        # Arrange
+        book_repository = BookRepository(str(tmpdir.join("database/books.json")))
+        for title in TITLES:
+            book_repository.add(BookBuilder().with_title(title).with_user_id(1).build())
+
+        # Act
+        books = book_repository.search("admiravel", 10)
+
+        # Assert
+        assert titles(books) == ["Admirável", "Admirável Mundo Novo", "Mundo Admirável e Novo"]
+
+    @pytest.mark.parametrize("text, limit", [("", 10), ("  ", 10), ("duna", 0), ("duna", 101)])
+    def test_invalid_search(self, book_repository: Union[BookRepository, SQLiteBookRepository], text: str, limit: int):
+        with pytest.raises(ValueError):
+            BookUseCases(repository=book_repository).search_books(text, limit)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -105,6 +105,19 @@ class TestController:
         with pytest.raises(ValueError):
             user_controller.create_user(user_data)  # type: ignore
 
+    def test_create_user_email_case_insensitive(self, user_controller: UserController, user_builder: User):
+        # Arrange
+        user_data = user_to_pydantic(user_builder).model_dump()
+        user_data.pop("id", None)
+        duplicated_user_data = {**user_data, "email": user_data["email"].upper()}
+
+        # Act
+        user_controller.create_user(user_data)  # type: ignore
+
+        # Assert
+        with pytest.raises(ValueError):
+            user_controller.create_user(duplicated_user_data)  # type: ignore
+
     def test_list_users(self, user_controller: UserController):
         # Arrange
         users = [
@@ -211,6 +224,22 @@ class TestController:
         with pytest.raises(ValueError):
             user_controller.get_by_id(user_id)
 
+    def test_bulk_operations_reject_boolean_ids(self, user_controller: UserController, user_builder: User):
+        # Arrange
+        user_data = user_to_pydantic(user_builder).model_dump()
+        user_data.pop("id", None)
+        _, created_user = user_controller.create_user(user_data)  # type: ignore
+
+        # Act
+        _, updated = user_controller.update_users([{"id": True, "name": "Outro Nome"}])
+        _, deleted = user_controller.delete_users([True])
+
+        # Assert
+        assert created_user["id"] == 1
+        assert (updated["updated"], [error["index"] for error in updated["errors"]]) == ([], [0])
+        assert (deleted["deleted"], [error["index"] for error in deleted["errors"]]) == ([], [0])
+        assert user_controller.get_by_id(1)[1]["name"] == created_user["name"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])